@@ -1,14 +1,17 @@
 """CrashDataRefiner package."""
 
-from .geo import BoundaryFilterReport, PolygonBoundary
+from .geo import BoundaryFilterReport, MultiPolygonBoundary, PolygonBoundary, PreparedPolygon
 from .normalize import normalize_header
-from .refiner import CrashDataRefiner, RefinementConfig, RefinementReport
+from .refiner import CrashDataRefiner, RefinementConfig, RefinementReport, RefinementStream
 
 __all__ = [
     "BoundaryFilterReport",
     "CrashDataRefiner",
+    "MultiPolygonBoundary",
     "normalize_header",
     "PolygonBoundary",
+    "PreparedPolygon",
     "RefinementConfig",
     "RefinementReport",
+    "RefinementStream",
 ]
@@ -23,7 +23,7 @@ from crash_data_refiner.coordinate_recovery import (
     load_coordinate_review_decisions,
     recover_missing_coordinates,
 )
-from crash_data_refiner.geo import load_kmz_polygon
+from crash_data_refiner.geo import load_kmz_boundary
 from crash_data_refiner.refiner import CrashDataRefiner
 from crash_data_refiner.run_contract import build_refine_response_summary
 from crash_data_refiner.services import resolve_label_order
@@ -144,7 +144,7 @@ async def refine(
 
             boundary_path = Path(temp_dir) / boundary_file.filename
             boundary_path.write_bytes(await boundary_file.read())
-            boundary = load_kmz_polygon(str(boundary_path))
+            boundary = load_kmz_boundary(str(boundary_path))
             prepared_rows, review_rows, recovery_report = recover_missing_coordinates(
                 data.rows,
                 latitude_column=lat_column,
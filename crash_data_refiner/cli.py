@@ -3,8 +3,12 @@ from __future__ import annotations
 
 import argparse
 import json
+from pathlib import Path
 from typing import Any, Dict, Sequence
 
+from .evidence_library import EvidenceLibrary
+from .labeling import VALID_LABEL_ORDERS
+from .pipeline import load_headers_and_guess_columns, run_batch_refinement_pipeline
 from .refiner import CrashDataRefiner, RefinementConfig
 
 
@@ -97,5 +101,70 @@ def main(args: Sequence[str] | None = None) -> int:
     return 0
 
 
+def build_batch_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Refine one crash extract against many project KMZ boundaries in a single pass"
+    )
+    parser.add_argument("data", help="Path to the crash data CSV or Excel file")
+    parser.add_argument("kmz", nargs="+", help="Project boundary KMZ files")
+    parser.add_argument(
+        "--output-dir",
+        required=True,
+        help="Directory that receives one output folder per KMZ, named after the KMZ file",
+    )
+    parser.add_argument("--lat-column", default="", help="Latitude column (guessed from headers when omitted)")
+    parser.add_argument("--lon-column", default="", help="Longitude column (guessed from headers when omitted)")
+    parser.add_argument(
+        "--label-order",
+        choices=sorted(VALID_LABEL_ORDERS),
+        default="auto",
+        help="KMZ label numbering direction applied to every project",
+    )
+    parser.add_argument(
+        "--evidence-library",
+        default="",
+        help="SQLite file of coordinate evidence shared across runs (created if missing)",
+    )
+    return parser
+
+
+def batch_main(args: Sequence[str] | None = None) -> int:
+    parser = build_batch_parser()
+    parsed = parser.parse_args(args=args)
+
+    lat_column = parsed.lat_column
+    lon_column = parsed.lon_column
+    if not lat_column or not lon_column:
+        _headers, lat_guess, lon_guess = load_headers_and_guess_columns(parsed.data)
+        lat_column = lat_column or lat_guess or ""
+        lon_column = lon_column or lon_guess or ""
+    if not lat_column or not lon_column:
+        parser.error("Could not guess the latitude/longitude columns; pass --lat-column and --lon-column.")
+
+    result = run_batch_refinement_pipeline(
+        data_path=Path(parsed.data),
+        kmz_paths=[Path(path) for path in parsed.kmz],
+        output_dir=Path(parsed.output_dir),
+        lat_column=lat_column,
+        lon_column=lon_column,
+        label_order=parsed.label_order,
+        evidence_library=EvidenceLibrary(Path(parsed.evidence_library)) if parsed.evidence_library else None,
+    )
+
+    summary = {
+        name: {
+            "included_rows": project.boundary_report.included_rows,
+            "excluded_rows": project.boundary_report.excluded_rows,
+            "invalid_rows": project.boundary_report.invalid_rows,
+            "coordinate_review_rows": len(project.coordinate_review_rows),
+            "output_path": str(project.output_path),
+            "kmz_path": str(project.kmz_path),
+        }
+        for name, project in result.projects.items()
+    }
+    print(json.dumps({"log": result.log, "projects": summary}, indent=2))
+    return 0
+
+
 if __name__ == "__main__":  # pragma: no cover - CLI entry point
     raise SystemExit(main())
@@ -3,12 +3,28 @@
 from __future__ import annotations
 
 from collections import Counter, defaultdict
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+from functools import partial
 import math
 import re
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
-
-from .geo import PolygonBoundary, is_usable_coordinate_pair, parse_coordinate, point_in_polygon
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .distances import (
+    FEET_PER_DEGREE,
+    LocalProjection,
+    distance_feet,
+    distances_feet,
+    equirectangular_distance_feet,
+    max_pairwise_distance_feet,
+)
+from .evidence_store import EvidenceStore
+from .geo import (
+    Boundary,
+    is_usable_coordinate_pair,
+    parse_coordinate,
+    points_in_polygon,
+    prepare_polygon,
+)
 from .normalize import normalize_header
 from .refiner import _standardize_route
 
@@ -34,6 +50,13 @@ MODE_LABELS: Dict[str, str] = {
     "unique_location_match": "unique location match",
 }
 
+_HULL_SPREAD_MIN_MEMBERS = 16
+# Cheap distance estimates reject a centroid only beyond this multiple of the
+# threshold; anything closer is decided by the scalar haversine.
+_ESTIMATE_REJECT_SLACK = 1.01
+# Cluster candidates at or above this count are prefiltered in one batch call.
+_BATCH_PREFILTER_MIN_CANDIDATES = 32
+
 MODE_CLUSTER_DISTANCE_FEET: Dict[str, float] = {
     "offset_match": 250.0,
     "intersection_match": 100.0,
@@ -172,12 +195,9 @@ class _ProjectRelevanceProfile:
     inside_rows: int
     dominant_locality: str
     inside_locality_counts: Counter[str]
-    inside_route_counts: Counter[str]
-    outside_route_counts: Counter[str]
-    inside_cross_counts: Counter[str]
-    outside_cross_counts: Counter[str]
-    inside_pair_counts: Counter[str]
-    outside_pair_counts: Counter[str]
+    route_scores: Dict[str, "_SignalScore"]
+    cross_scores: Dict[str, "_SignalScore"]
+    pair_scores: Dict[str, "_SignalScore"]
 
 
 @dataclass(frozen=True)
@@ -189,10 +209,87 @@ class _ProjectRelevanceAssessment:
 
 
 @dataclass(frozen=True)
-class _ProjectRelevanceSignal:
+class _SignalRule:
+    """Score ladder for one kind of relevance signal (pair, route or cross street)."""
+
+    evidence_label: str
+    strong_min_inside: int
+    strong_min_ratio: float
+    strong_score: int
+    likely_min_inside: int
+    likely_min_ratio: float
+    likely_score: int
+    possible_min_inside: int
+    possible_min_ratio: float
+    possible_score: int
+    outside_only_min_count: int
+    outside_only_score: int
+    positive_label: str
+    negative_label: str
+
+
+@dataclass(frozen=True, slots=True)
+class _SignalScore:
+    """Precomputed outcome of a :class:`_SignalRule` for one signal key.
+
+    An empty ``reason`` means the signal was seen but too mixed or too small
+    to move the score.
+    """
+
     score: int
     reason: str
-    detail: str
+    inside_count: int
+    outside_count: int
+
+
+_PAIR_SIGNAL_RULE = _SignalRule(
+    evidence_label="Route + cross street",
+    strong_min_inside=2,
+    strong_min_ratio=0.75,
+    strong_score=85,
+    likely_min_inside=1,
+    likely_min_ratio=0.45,
+    likely_score=68,
+    possible_min_inside=2,
+    possible_min_ratio=0.25,
+    possible_score=50,
+    outside_only_min_count=3,
+    outside_only_score=-35,
+    positive_label="Route/intersection pattern matches rows that already fall inside the KMZ",
+    negative_label="Route/intersection pattern appears only outside the KMZ in rows with coordinates",
+)
+_ROUTE_SIGNAL_RULE = _SignalRule(
+    evidence_label="Route only",
+    strong_min_inside=8,
+    strong_min_ratio=0.40,
+    strong_score=42,
+    likely_min_inside=5,
+    likely_min_ratio=0.25,
+    likely_score=32,
+    possible_min_inside=15,
+    possible_min_ratio=0.12,
+    possible_score=18,
+    outside_only_min_count=5,
+    outside_only_score=-35,
+    positive_label="Route frequently appears inside the KMZ",
+    negative_label="Route appears only outside the KMZ in rows with coordinates",
+)
+_CROSS_SIGNAL_RULE = _SignalRule(
+    evidence_label="Cross street only",
+    strong_min_inside=4,
+    strong_min_ratio=0.35,
+    strong_score=18,
+    likely_min_inside=2,
+    likely_min_ratio=0.20,
+    likely_score=10,
+    possible_min_inside=0,
+    possible_min_ratio=1.0,
+    possible_score=0,
+    outside_only_min_count=5,
+    outside_only_score=-12,
+    positive_label="Cross street shows up inside the KMZ corridor",
+    negative_label="Cross street appears only outside the KMZ in rows with coordinates",
+)
 
 
 @dataclass
@@ -211,7 +308,12 @@ class _ClusterBuilder:
     def accepts(self, coord: Coordinate, *, threshold_feet: float) -> bool:
         if not self.members:
             return True
-        return _distance_feet(coord, self.centroid) <= threshold_feet
+        centroid = self.centroid
+        # The equirectangular estimate is within a tiny fraction of the
+        # haversine distance at these scales, so it can safely reject.
+        if equirectangular_distance_feet(coord, centroid) > threshold_feet * _ESTIMATE_REJECT_SLACK:
+            return False
+        return distance_feet(coord, centroid) <= threshold_feet
 
     def add(self, coord: Coordinate, count: int) -> None:
         self.total_count += count
@@ -220,14 +322,115 @@ class _ClusterBuilder:
         self.members.append((coord, count))
 
     def spread_feet(self) -> float:
+        """Largest distance between two members.
+
+        Large clusters take the diameter of their convex hull with rotating
+        calipers (O(n log n) overall); small ones compare every pair.
+        """
         if len(self.members) < 2:
             return 0.0
-        max_distance = 0.0
         points = [coord for coord, _count in self.members]
-        for left_idx in range(len(points)):
-            for right_idx in range(left_idx + 1, len(points)):
-                max_distance = max(max_distance, _distance_feet(points[left_idx], points[right_idx]))
-        return max_distance
+        if len(points) >= _HULL_SPREAD_MIN_MEMBERS:
+            return _hull_diameter_feet(points)
+        return max_pairwise_distance_feet(points)
+
+
+class _ClusterGrid:
+    """First-fit clustering with cluster centroids hashed into a coarse grid.
+
+    Cells are at least one threshold tall and wide everywhere in the data
+    (longitude cells are sized for the highest latitude present), so any
+    centroid within the threshold of a point sits in the point's cell or one
+    of its eight neighbours. Testing only those clusters, oldest first, gives
+    the same assignment as scanning every cluster in creation order.
+    """
+
+    def __init__(self, *, threshold_feet: float, max_abs_lat: float) -> None:
+        self.threshold_feet = threshold_feet
+        # 1% slack covers the small-angle approximations in the cell bounds.
+        self.cell_lat = threshold_feet * 1.01 / FEET_PER_DEGREE
+        self.cell_lon = self.cell_lat / max(math.cos(math.radians(min(max_abs_lat, 89.0))), 0.01)
+        self.clusters: List[_ClusterBuilder] = []
+        self._cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self._cell_of: List[Tuple[int, int]] = []
+
+    def add(self, coord: Coordinate, count: int) -> None:
+        row, column = self._cell(coord)
+        candidates = sorted(
+            index
+            for row_offset in (-1, 0, 1)
+            for column_offset in (-1, 0, 1)
+            for index in self._cells.get((row + row_offset, column + column_offset), ())
+        )
+        if len(candidates) >= _BATCH_PREFILTER_MIN_CANDIDATES:
+            # Crowded neighbourhoods drop far centroids in one batch call; the
+            # verdict still comes from accepts(), so it does not depend on
+            # whether NumPy is installed.
+            estimates = distances_feet(coord, [self.clusters[index].centroid for index in candidates])
+            limit = self.threshold_feet * _ESTIMATE_REJECT_SLACK
+            candidates = [index for index, estimate in zip(candidates, estimates) if estimate <= limit]
+        target = next(
+            (
+                index
+                for index in candidates
+                if self.clusters[index].accepts(coord, threshold_feet=self.threshold_feet)
+            ),
+            None,
+        )
+        if target is None:
+            target = len(self.clusters)
+            self.clusters.append(_ClusterBuilder())
+            self._cell_of.append((row, column))
+            self._cells[(row, column)].append(target)
+        cluster = self.clusters[target]
+        cluster.add(coord, count)
+
+        moved_to = self._cell(cluster.centroid)
+        previous = self._cell_of[target]
+        if moved_to != previous:
+            self._cells[previous].remove(target)
+            self._cells[moved_to].append(target)
+            self._cell_of[target] = moved_to
+
+    def _cell(self, coord: Coordinate) -> Tuple[int, int]:
+        return (math.floor(coord[0] / self.cell_lat), math.floor(coord[1] / self.cell_lon))
+
+
+@dataclass(frozen=True)
+class RecoveryInputs:
+    """Boundary-independent recovery state for one crash dataset.
+
+    Normalized rows, their location signatures and the exact-location evidence
+    index depend only on the crash data, so several projects run against the
+    same extract can share them.
+    """
+
+    lat_key: str
+    lon_key: str
+    rows: List[Dict[str, Any]]
+    signatures: List[_LocationSignature]
+    evidence: EvidenceStore
+    library_evidence: Optional[EvidenceStore] = None
+
+
+def prepare_recovery_inputs(
+    rows: Iterable[Mapping[str, Any]],
+    *,
+    latitude_column: str,
+    longitude_column: str,
+) -> RecoveryInputs:
+    """Normalize *rows* and index their coordinate evidence for recovery."""
+    lat_key = normalize_header(latitude_column)
+    lon_key = normalize_header(longitude_column)
+    normalized_rows = [_normalize_row(row) for row in rows]
+    signatures = [_location_signature(row) for row in normalized_rows]
+    return RecoveryInputs(
+        lat_key=lat_key,
+        lon_key=lon_key,
+        rows=normalized_rows,
+        signatures=signatures,
+        evidence=_build_evidence(normalized_rows, signatures, lat_key=lat_key, lon_key=lon_key),
+    )
 
 
 def recover_missing_coordinates(
@@ -235,7 +438,7 @@ def recover_missing_coordinates(
     *,
     latitude_column: str,
     longitude_column: str,
-    boundary: PolygonBoundary | None = None,
+    boundary: Boundary | None = None,
     review_decisions: Mapping[str, CoordinateReviewDecision] | None = None,
 ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], CoordinateRecoveryReport]:
     """Recover missing coordinates from other rows in the same crash dataset.
@@ -244,19 +447,166 @@ def recover_missing_coordinates(
     patterns found in rows that already have coordinates in the current input
     spreadsheet and adds audit metadata describing any recovery decision.
     """
+    inputs = prepare_recovery_inputs(
+        rows,
+        latitude_column=latitude_column,
+        longitude_column=longitude_column,
+    )
+    return recover_prepared_coordinates(inputs, boundary=boundary, review_decisions=review_decisions)
 
-    lat_key = normalize_header(latitude_column)
-    lon_key = normalize_header(longitude_column)
 
-    normalized_rows = [_normalize_row(row) for row in rows]
-    evidence = _build_evidence(normalized_rows, lat_key=lat_key, lon_key=lon_key)
-    relevance_profile = _build_project_relevance_profile(
-        normalized_rows,
-        lat_key=lat_key,
-        lon_key=lon_key,
+def build_relevance_profile(
+    inputs: RecoveryInputs,
+    *,
+    boundary: Boundary | None,
+    inside_boundary: Sequence[Optional[bool]] | None = None,
+) -> Optional[_ProjectRelevanceProfile]:
+    """Build the inside/outside project profile used to bucket review rows.
+
+    Returns ``None`` without a boundary or when too few located rows fall
+    inside it. The result can be passed back to
+    :func:`recover_prepared_coordinates` to skip rebuilding it.
+    """
+    return _build_project_relevance_profile(
+        inputs.rows,
+        inputs.signatures,
+        lat_key=inputs.lat_key,
+        lon_key=inputs.lon_key,
+        boundary=boundary,
+        inside_boundary=inside_boundary,
+    )
+
+
+_BUILD_PROFILE: Any = object()
+
+
+def recover_prepared_coordinates(
+    inputs: RecoveryInputs,
+    *,
+    boundary: Boundary | None = None,
+    review_decisions: Mapping[str, CoordinateReviewDecision] | None = None,
+    inside_boundary: Sequence[Optional[bool]] | None = None,
+    relevance_profile: Optional[_ProjectRelevanceProfile] = _BUILD_PROFILE,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], CoordinateRecoveryReport]:
+    """Run :func:`recover_missing_coordinates` over prepared inputs.
+
+    *inside_boundary* optionally supplies a precomputed boundary test per
+    input row (``None`` for rows without usable coordinates) so the project
+    relevance profile does not repeat the point-in-polygon work.
+    *relevance_profile* supplies a profile from :func:`build_relevance_profile`
+    for the same inputs and boundary, skipping that step entirely.
+    """
+    state = build_recovery_state(
+        inputs,
         boundary=boundary,
+        review_decisions=review_decisions,
+        inside_boundary=inside_boundary,
+        relevance_profile=relevance_profile,
     )
+    return recovery_results(state)
 
+
+@dataclass(frozen=True)
+class _RowOutcome:
+    row: Dict[str, Any]
+    status: str
+    method: str = ""
+    suggested: bool = False
+
+
+@dataclass(frozen=True)
+class RecoveryState:
+    """Per-row recovery outcomes of one dataset for one set of review decisions.
+
+    ``outcomes`` is aligned with ``inputs.rows`` and is ``None`` for rows that
+    already had coordinates. ``missing_keys`` maps every review row key and
+    group key to the indexes of the missing-coordinate rows it addresses, so
+    :func:`apply_review_decisions` can find the rows a decision change touches.
+    """
+
+    inputs: RecoveryInputs
+    boundary: Boundary | None
+    relevance_profile: Optional[_ProjectRelevanceProfile]
+    decisions: Dict[str, CoordinateReviewDecision]
+    outcomes: List[Optional[_RowOutcome]]
+    missing_keys: Dict[str, List[int]]
+    recomputed_rows: int = 0
+
+
+def build_recovery_state(
+    inputs: RecoveryInputs,
+    *,
+    boundary: Boundary | None = None,
+    review_decisions: Mapping[str, CoordinateReviewDecision] | None = None,
+    inside_boundary: Sequence[Optional[bool]] | None = None,
+    relevance_profile: Optional[_ProjectRelevanceProfile] = _BUILD_PROFILE,
+) -> RecoveryState:
+    """Evaluate every row of *inputs*; see :func:`recover_prepared_coordinates`."""
+    if relevance_profile is _BUILD_PROFILE:
+        relevance_profile = build_relevance_profile(inputs, boundary=boundary, inside_boundary=inside_boundary)
+    decisions = dict(review_decisions or {})
+    outcomes: List[Optional[_RowOutcome]] = []
+    missing_keys: Dict[str, List[int]] = defaultdict(list)
+    for index in range(len(inputs.rows)):
+        outcome = _recover_row(
+            index,
+            inputs=inputs,
+            boundary=boundary,
+            relevance_profile=relevance_profile,
+            decisions=decisions,
+        )
+        outcomes.append(outcome)
+        if outcome is None:
+            continue
+        for key in (outcome.row["coordinate_recovery_row_key"], outcome.row["coordinate_recovery_group"]):
+            if key:
+                missing_keys[key].append(index)
+    return RecoveryState(
+        inputs=inputs,
+        boundary=boundary,
+        relevance_profile=relevance_profile,
+        decisions=decisions,
+        outcomes=outcomes,
+        missing_keys=dict(missing_keys),
+        recomputed_rows=len(inputs.rows),
+    )
+
+
+def apply_review_decisions(
+    state: RecoveryState,
+    review_decisions: Mapping[str, CoordinateReviewDecision] | None,
+) -> RecoveryState:
+    """Return *state* re-evaluated for a new full set of review decisions.
+
+    Only rows whose row key or group key gained, lost or changed a decision
+    are recomputed. Every other outcome, the evidence index and the relevance
+    profile are reused as they are.
+    """
+    decisions = dict(review_decisions or {})
+    previous = state.decisions
+    changed_keys = {
+        key for key in previous.keys() | decisions.keys() if previous.get(key) != decisions.get(key)
+    }
+    indexes = sorted({index for key in changed_keys for index in state.missing_keys.get(key, ())})
+    outcomes = list(state.outcomes)
+    for index in indexes:
+        outcomes[index] = _recover_row(
+            index,
+            inputs=state.inputs,
+            boundary=state.boundary,
+            relevance_profile=state.relevance_profile,
+            decisions=decisions,
+        )
+    return replace(state, decisions=decisions, outcomes=outcomes, recomputed_rows=len(indexes))
+
+
+def recovery_results(
+    state: RecoveryState,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], CoordinateRecoveryReport]:
+    """Return ``(output rows, review rows, report)`` for *state*.
+
+    The rows are fresh dictionaries, so callers may modify them freely.
+    """
     output_rows: List[Dict[str, Any]] = []
     review_rows: List[Dict[str, Any]] = []
     recovered_by_method: Counter[str] = Counter()
@@ -264,104 +614,26 @@ def recover_missing_coordinates(
     approved_rows = 0
     rejected_rows = 0
     suggested_rows = 0
-    decision_map = dict(review_decisions or {})
-
-    for source_row_number, original_row in enumerate(normalized_rows, start=2):
-        row = dict(original_row)
-        lat = parse_coordinate(row.get(lat_key))
-        lon = parse_coordinate(row.get(lon_key))
-        if lat is not None and lon is not None:
+    for original_row, outcome in zip(state.inputs.rows, state.outcomes):
+        if outcome is None:
+            row = dict(original_row)
             row["coordinate_source"] = "original"
             row["coordinate_recovery_status"] = "original"
             output_rows.append(row)
             continue
-
         missing_rows += 1
-        group_key = _review_group_key(row) or ""
-        row_key = _review_row_key(row, source_row_number=source_row_number)
-        row["coordinate_recovery_group"] = group_key
-        row["coordinate_recovery_row_key"] = row_key
-        row["coordinate_recovery_source_row"] = source_row_number
-        manual_decision = decision_map.get(row_key) or decision_map.get(group_key)
-        if manual_decision is not None:
-            decision_action = str(manual_decision.action or "apply").strip().lower()
-            row["coordinate_recovery_method"] = "manual_review"
-            row["coordinate_recovery_match_count"] = 0
-            row["coordinate_recovery_candidate_count"] = 1
-            if decision_action == "reject":
-                row["coordinate_source"] = "review_rejected"
-                row["coordinate_recovery_status"] = "review_rejected"
-                row["coordinate_recovery_confidence"] = "user_rejected"
-                row["coordinate_recovery_note"] = (
-                    manual_decision.note or "Excluded from project in browser review workbench."
-                )
-                output_rows.append(row)
-                rejected_rows += 1
-                continue
-
-            if manual_decision.latitude is None or manual_decision.longitude is None:
-                raise ValueError(
-                    f"Review decision for '{row_key}' is missing latitude/longitude coordinates."
-                )
-
-            row[lat_key] = round(manual_decision.latitude, 6)
-            row[lon_key] = round(manual_decision.longitude, 6)
-            row["coordinate_source"] = "review_approved"
-            row["coordinate_recovery_status"] = "review_applied"
-            row["coordinate_recovery_confidence"] = "user_approved"
-            row["coordinate_recovery_note"] = (
-                manual_decision.note or "Applied from approved coordinate review workflow."
-            )
-            output_rows.append(row)
+        output_rows.append(dict(outcome.row))
+        if outcome.status == "rejected":
+            rejected_rows += 1
+        elif outcome.status == "approved":
             recovered_by_method["manual_review"] += 1
             approved_rows += 1
-            continue
-
-        suggestion = _select_suggestion(row, evidence=evidence, boundary=boundary)
-
-        if suggestion and suggestion.confidence == "high":
-            row[lat_key] = round(suggestion.latitude, 6)
-            row[lon_key] = round(suggestion.longitude, 6)
-            _apply_suggestion_metadata(row, suggestion, status="auto_recovered", group_key=group_key)
-            row["coordinate_source"] = "recovered"
-            output_rows.append(row)
-            recovered_by_method[suggestion.method] += 1
-            continue
-
-        row["coordinate_source"] = "missing"
-        if suggestion:
-            _apply_suggestion_metadata(row, suggestion, status="review_required", group_key=group_key)
-            if _is_surfaceable_review_suggestion(
-                suggestion.latitude,
-                suggestion.longitude,
-                suggestion.inside_boundary,
-            ):
-                row["suggested_latitude"] = round(suggestion.latitude, 6)
-                row["suggested_longitude"] = round(suggestion.longitude, 6)
-                row["suggested_inside_boundary"] = suggestion.inside_boundary
-                suggested_rows += 1
+        elif outcome.status == "recovered":
+            recovered_by_method[outcome.method] += 1
         else:
-            row["coordinate_recovery_status"] = "no_match"
-            row["coordinate_recovery_method"] = ""
-            row["coordinate_recovery_confidence"] = "none"
-            row["coordinate_recovery_match_count"] = 0
-            row["coordinate_recovery_candidate_count"] = 0
-            row["coordinate_recovery_note"] = "No same-project coordinate match found."
-        row.setdefault("approve_for_group", "")
-        row.setdefault("approved_latitude", "")
-        row.setdefault("approved_longitude", "")
-        row.setdefault("review_notes", "")
-        relevance = _assess_project_relevance(
-            row,
-            profile=relevance_profile,
-            suggestion=suggestion,
-        )
-        row["project_relevance_bucket"] = relevance.bucket
-        row["project_relevance_score"] = relevance.score
-        row["project_relevance_reason"] = relevance.reason
-        row["project_relevance_details"] = "\n".join(relevance.details)
-        review_rows.append(dict(row))
-        output_rows.append(row)
+            review_rows.append(dict(outcome.row))
+            if outcome.suggested:
+                suggested_rows += 1
 
     _apply_review_group_sizes(review_rows)
     primary_review_rows = sum(
@@ -398,6 +670,111 @@ def recover_missing_coordinates(
     return output_rows, review_rows, report
 
 
+def _recover_row(
+    index: int,
+    *,
+    inputs: RecoveryInputs,
+    boundary: Boundary | None,
+    relevance_profile: Optional[_ProjectRelevanceProfile],
+    decisions: Mapping[str, CoordinateReviewDecision],
+) -> Optional[_RowOutcome]:
+    """Evaluate input row *index*; ``None`` means it already had coordinates."""
+    original_row = inputs.rows[index]
+    source_row_number = index + 2
+    lat_key = inputs.lat_key
+    lon_key = inputs.lon_key
+    lat = parse_coordinate(original_row.get(lat_key))
+    lon = parse_coordinate(original_row.get(lon_key))
+    if lat is not None and lon is not None:
+        return None
+
+    signature = inputs.signatures[index]
+    row = dict(original_row)
+    group_key = signature.group_key or ""
+    row_key = _review_row_key(row, source_row_number=source_row_number)
+    row["coordinate_recovery_group"] = group_key
+    row["coordinate_recovery_row_key"] = row_key
+    row["coordinate_recovery_source_row"] = source_row_number
+    manual_decision = decisions.get(row_key) or decisions.get(group_key)
+    if manual_decision is not None:
+        decision_action = str(manual_decision.action or "apply").strip().lower()
+        row["coordinate_recovery_method"] = "manual_review"
+        row["coordinate_recovery_match_count"] = 0
+        row["coordinate_recovery_candidate_count"] = 1
+        if decision_action == "reject":
+            row["coordinate_source"] = "review_rejected"
+            row["coordinate_recovery_status"] = "review_rejected"
+            row["coordinate_recovery_confidence"] = "user_rejected"
+            row["coordinate_recovery_note"] = (
+                manual_decision.note or "Excluded from project in browser review workbench."
+            )
+            return _RowOutcome(row=row, status="rejected")
+
+        if manual_decision.latitude is None or manual_decision.longitude is None:
+            raise ValueError(
+                f"Review decision for '{row_key}' is missing latitude/longitude coordinates."
+            )
+
+        row[lat_key] = round(manual_decision.latitude, 6)
+        row[lon_key] = round(manual_decision.longitude, 6)
+        row["coordinate_source"] = "review_approved"
+        row["coordinate_recovery_status"] = "review_applied"
+        row["coordinate_recovery_confidence"] = "user_approved"
+        row["coordinate_recovery_note"] = (
+            manual_decision.note or "Applied from approved coordinate review workflow."
+        )
+        return _RowOutcome(row=row, status="approved", method="manual_review")
+
+    suggestion = _select_suggestion(
+        signature,
+        evidence=inputs.evidence,
+        boundary=boundary,
+        library_evidence=inputs.library_evidence,
+    )
+
+    if suggestion and suggestion.confidence == "high":
+        row[lat_key] = round(suggestion.latitude, 6)
+        row[lon_key] = round(suggestion.longitude, 6)
+        _apply_suggestion_metadata(row, suggestion, status="auto_recovered", group_key=group_key)
+        row["coordinate_source"] = "recovered"
+        return _RowOutcome(row=row, status="recovered", method=suggestion.method)
+
+    suggested = False
+    row["coordinate_source"] = "missing"
+    if suggestion:
+        _apply_suggestion_metadata(row, suggestion, status="review_required", group_key=group_key)
+        if _is_surfaceable_review_suggestion(
+            suggestion.latitude,
+            suggestion.longitude,
+            suggestion.inside_boundary,
+        ):
+            row["suggested_latitude"] = round(suggestion.latitude, 6)
+            row["suggested_longitude"] = round(suggestion.longitude, 6)
+            row["suggested_inside_boundary"] = suggestion.inside_boundary
+            suggested = True
+    else:
+        row["coordinate_recovery_status"] = "no_match"
+        row["coordinate_recovery_method"] = ""
+        row["coordinate_recovery_confidence"] = "none"
+        row["coordinate_recovery_match_count"] = 0
+        row["coordinate_recovery_candidate_count"] = 0
+        row["coordinate_recovery_note"] = "No same-project coordinate match found."
+    row.setdefault("approve_for_group", "")
+    row.setdefault("approved_latitude", "")
+    row.setdefault("approved_longitude", "")
+    row.setdefault("review_notes", "")
+    relevance = _assess_project_relevance(
+        signature,
+        profile=relevance_profile,
+        suggestion=suggestion,
+    )
+    row["project_relevance_bucket"] = relevance.bucket
+    row["project_relevance_score"] = relevance.score
+    row["project_relevance_reason"] = relevance.reason
+    row["project_relevance_details"] = "\n".join(relevance.details)
+    return _RowOutcome(row=row, status="review", suggested=suggested)
+
+
 def load_coordinate_review_decisions(
     rows: Iterable[Mapping[str, Any]],
 ) -> Dict[str, CoordinateReviewDecision]:
@@ -476,12 +853,13 @@ def build_coordinate_review_queue(
     queue: List[Dict[str, Any]] = []
     for group_key, group_rows in grouped.items():
         first = group_rows[0]
-        route = _route_text(first)
-        cross = _cross_text(first)
-        mile_marker = _mile_marker_text(first)
-        direction = _direction_text(first)
-        feet_from = _first_text(first, _FEET_KEYS)
-        locality = _locality_text(first).replace("|", " / ")
+        signature = _location_signature(first)
+        route = signature.route
+        cross = signature.cross
+        mile_marker = signature.mile_marker
+        direction = signature.direction
+        feet_from = signature.feet
+        locality = signature.locality.replace("|", " / ")
         title = route or (mile_marker and f"Mile marker {mile_marker}") or group_key
 
         detail_parts: List[str] = []
@@ -571,12 +949,13 @@ def build_coordinate_review_wizard_steps(
         if not row_key:
             continue
 
-        route = _route_text(row)
-        cross = _cross_text(row)
-        mile_marker = _mile_marker_text(row)
-        direction = _direction_text(row)
-        feet_from = _first_text(row, _FEET_KEYS)
-        locality = _display_locality(row)
+        signature = _location_signature(row)
+        route = signature.route
+        cross = signature.cross
+        mile_marker = signature.mile_marker
+        direction = signature.direction
+        feet_from = signature.feet
+        locality = signature.display_locality
         crash_id = _row_identifier(row) or f"Source row {int(row.get('coordinate_recovery_source_row') or fallback_row_number)}"
         crash_date = _first_text(row, _DATE_KEYS)
         crash_time = _first_text(row, _TIME_KEYS)
@@ -680,32 +1059,33 @@ def _parse_review_boolean(value: Any) -> Optional[bool]:
 
 def _build_evidence(
     rows: Sequence[Mapping[str, Any]],
+    signatures: Sequence[_LocationSignature],
     *,
     lat_key: str,
     lon_key: str,
-) -> Dict[str, Dict[str, Counter[Coordinate]]]:
-    evidence: Dict[str, Dict[str, Counter[Coordinate]]] = {
-        mode: defaultdict(Counter) for mode in MODE_ORDER
-    }
-    for row in rows:
-        lat = parse_coordinate(row.get(lat_key))
-        lon = parse_coordinate(row.get(lon_key))
-        if not is_usable_coordinate_pair(lat, lon):
-            continue
-        coord = (lat, lon)
-        for mode in MODE_ORDER:
-            fingerprint = _fingerprint(row, mode)
-            if fingerprint:
-                evidence[mode][fingerprint][coord] += 1
-    return evidence
+) -> EvidenceStore:
+    def observations() -> Iterable[Tuple[str, str, float, float]]:
+        for row, signature in zip(rows, signatures):
+            lat = parse_coordinate(row.get(lat_key))
+            lon = parse_coordinate(row.get(lon_key))
+            if not is_usable_coordinate_pair(lat, lon):
+                continue
+            for mode in MODE_ORDER:
+                fingerprint = signature.fingerprint(mode)
+                if fingerprint:
+                    yield mode, fingerprint, lat, lon
+
+    return EvidenceStore.build(observations())
 
 
 def _build_project_relevance_profile(
     rows: Sequence[Mapping[str, Any]],
+    signatures: Sequence[_LocationSignature],
     *,
     lat_key: str,
     lon_key: str,
-    boundary: PolygonBoundary | None,
+    boundary: Boundary | None,
+    inside_boundary: Sequence[Optional[bool]] | None = None,
 ) -> Optional[_ProjectRelevanceProfile]:
     if boundary is None:
         return None
@@ -719,16 +1099,30 @@ def _build_project_relevance_profile(
     inside_locality_counts: Counter[str] = Counter()
     inside_rows = 0
 
-    for row in rows:
+    located_signatures: List[_LocationSignature] = []
+    located_inside: List[bool] = []
+    lats: List[float] = []
+    lons: List[float] = []
+    for index, (row, signature) in enumerate(zip(rows, signatures)):
+        if inside_boundary is not None:
+            if inside_boundary[index] is not None:
+                located_signatures.append(signature)
+                located_inside.append(bool(inside_boundary[index]))
+            continue
         lat = parse_coordinate(row.get(lat_key))
         lon = parse_coordinate(row.get(lon_key))
         if not is_usable_coordinate_pair(lat, lon):
             continue
+        located_signatures.append(signature)
+        lats.append(lat)
+        lons.append(lon)
+    if inside_boundary is None:
+        located_inside = points_in_polygon(lons, lats, boundary)
 
-        route_signal = _relevance_route_signal(row)
-        cross_signal = _relevance_cross_signal(row)
-        locality_signal = _relevance_locality_signal(row)
-        is_inside = point_in_polygon(lon, lat, boundary)
+    for signature, is_inside in zip(located_signatures, located_inside):
+        route_signal = signature.route_signal
+        cross_signal = signature.cross_signal
+        locality_signal = signature.locality_signal
 
         if is_inside:
             inside_rows += 1
@@ -756,17 +1150,14 @@ def _build_project_relevance_profile(
         inside_rows=inside_rows,
         dominant_locality=dominant_locality,
         inside_locality_counts=inside_locality_counts,
-        inside_route_counts=inside_route_counts,
-        outside_route_counts=outside_route_counts,
-        inside_cross_counts=inside_cross_counts,
-        outside_cross_counts=outside_cross_counts,
-        inside_pair_counts=inside_pair_counts,
-        outside_pair_counts=outside_pair_counts,
+        route_scores=_score_signal_table(_ROUTE_SIGNAL_RULE, inside_route_counts, outside_route_counts),
+        cross_scores=_score_signal_table(_CROSS_SIGNAL_RULE, inside_cross_counts, outside_cross_counts),
+        pair_scores=_score_signal_table(_PAIR_SIGNAL_RULE, inside_pair_counts, outside_pair_counts),
     )
 
 
 def _assess_project_relevance(
-    row: Mapping[str, Any],
+    signature: _LocationSignature,
     *,
     profile: Optional[_ProjectRelevanceProfile],
     suggestion: Optional[_RecoverySuggestion],
@@ -781,105 +1172,38 @@ def _assess_project_relevance(
             ),
         )
 
-    route_signal = _relevance_route_signal(row)
-    cross_signal = _relevance_cross_signal(row)
-    locality_signal = _relevance_locality_signal(row)
+    route_signal = signature.route_signal
+    cross_signal = signature.cross_signal
+    locality_signal = signature.locality_signal
     pair_signal = f"{route_signal}|{cross_signal}" if route_signal and cross_signal else ""
-    route_display = _route_text(row) or "Unknown route"
-    cross_display = _cross_text(row) or "Unknown cross street"
-    locality_display = _display_locality(row)
+    route_display = signature.route or "Unknown route"
+    cross_display = signature.cross or "Unknown cross street"
+    locality_display = signature.display_locality
 
     score = 0
     reasons: List[str] = []
-    details: List[str] = []
-
-    if pair_signal:
-        pair_result = _score_project_signature(
-            key=pair_signal,
-            signal_label=f"{route_display} at {cross_display}",
-            evidence_label="Route + cross street",
-            inside_counts=profile.inside_pair_counts,
-            outside_counts=profile.outside_pair_counts,
-            strong_min_inside=2,
-            strong_min_ratio=0.75,
-            strong_score=85,
-            likely_min_inside=1,
-            likely_min_ratio=0.45,
-            likely_score=68,
-            possible_min_inside=2,
-            possible_min_ratio=0.25,
-            possible_score=50,
-            outside_only_min_count=3,
-            outside_only_score=-35,
-            positive_label="Route/intersection pattern matches rows that already fall inside the KMZ",
-            negative_label="Route/intersection pattern appears only outside the KMZ in rows with coordinates",
-        )
-        score += pair_result.score
-        if pair_result.reason:
-            reasons.append(pair_result.reason)
-        if pair_result.detail:
-            details.append(pair_result.detail)
-
-    if route_signal:
-        route_result = _score_project_signature(
-            key=route_signal,
-            signal_label=route_display,
-            evidence_label="Route only",
-            inside_counts=profile.inside_route_counts,
-            outside_counts=profile.outside_route_counts,
-            strong_min_inside=8,
-            strong_min_ratio=0.40,
-            strong_score=42,
-            likely_min_inside=5,
-            likely_min_ratio=0.25,
-            likely_score=32,
-            possible_min_inside=15,
-            possible_min_ratio=0.12,
-            possible_score=18,
-            outside_only_min_count=5,
-            outside_only_score=-35,
-            positive_label="Route frequently appears inside the KMZ",
-            negative_label="Route appears only outside the KMZ in rows with coordinates",
-        )
-        score += route_result.score
-        if route_result.reason:
-            reasons.append(route_result.reason)
-        if route_result.detail:
-            details.append(route_result.detail)
-
-    if cross_signal:
-        cross_result = _score_project_signature(
-            key=cross_signal,
-            signal_label=cross_display,
-            evidence_label="Cross street only",
-            inside_counts=profile.inside_cross_counts,
-            outside_counts=profile.outside_cross_counts,
-            strong_min_inside=4,
-            strong_min_ratio=0.35,
-            strong_score=18,
-            likely_min_inside=2,
-            likely_min_ratio=0.20,
-            likely_score=10,
-            possible_min_inside=0,
-            possible_min_ratio=1.0,
-            possible_score=0,
-            outside_only_min_count=5,
-            outside_only_score=-12,
-            positive_label="Cross street shows up inside the KMZ corridor",
-            negative_label="Cross street appears only outside the KMZ in rows with coordinates",
-        )
-        score += cross_result.score
-        if cross_result.reason:
-            reasons.append(cross_result.reason)
-        if cross_result.detail:
-            details.append(cross_result.detail)
+    # Detail lines are formatted only if they make the cut below.
+    details: List[Callable[[], str]] = []
+
+    for key, table, rule, signal_label in (
+        (pair_signal, profile.pair_scores, _PAIR_SIGNAL_RULE, f"{route_display} at {cross_display}"),
+        (route_signal, profile.route_scores, _ROUTE_SIGNAL_RULE, route_display),
+        (cross_signal, profile.cross_scores, _CROSS_SIGNAL_RULE, cross_display),
+    ):
+        entry = table.get(key) if key else None
+        if entry is None:
+            continue
+        score += entry.score
+        if entry.reason:
+            reasons.append(entry.reason)
+        details.append(partial(_signal_detail, rule, signal_label, entry))
 
     if locality_signal and locality_signal == profile.dominant_locality:
         score += 5
         reasons.append("Crash locality matches the dominant inside-the-project locality.")
         inside_locality_count = int(profile.inside_locality_counts[locality_signal])
         details.append(
-            f"Locality: {locality_display} is the dominant inside-boundary locality in "
+            lambda: f"Locality: {locality_display} is the dominant inside-boundary locality in "
             f"{inside_locality_count} known-coordinate crash(es)."
         )
 
@@ -888,13 +1212,13 @@ def _assess_project_relevance(
             score += 18
             reasons.append("Suggested coordinate falls inside the KMZ boundary.")
             details.append(
-                "Suggested point check: the proposed coordinate lands inside the KMZ boundary."
+                lambda: "Suggested point check: the proposed coordinate lands inside the KMZ boundary."
             )
         elif suggestion.inside_boundary is False:
             score -= 18
             reasons.append("Suggested coordinate falls outside the KMZ boundary.")
             details.append(
-                "Suggested point check: the proposed coordinate lands outside the KMZ boundary."
+                lambda: "Suggested point check: the proposed coordinate lands outside the KMZ boundary."
             )
 
     bucket = (
@@ -916,7 +1240,7 @@ def _assess_project_relevance(
         f"{PROJECT_RELEVANCE_PRIMARY_SCORE}."
     )
     detail_lines = [decision_detail]
-    detail_lines.extend(details[:4])
+    detail_lines.extend(detail() for detail in details[:4])
     return _ProjectRelevanceAssessment(
         bucket=bucket,
         score=score,
@@ -925,60 +1249,43 @@ def _assess_project_relevance(
     )
 
 
-def _score_project_signature(
-    *,
-    key: str,
-    signal_label: str,
-    evidence_label: str,
+def _score_signal_table(
+    rule: _SignalRule,
     inside_counts: Counter[str],
     outside_counts: Counter[str],
-    strong_min_inside: int,
-    strong_min_ratio: float,
-    strong_score: int,
-    likely_min_inside: int,
-    likely_min_ratio: float,
-    likely_score: int,
-    possible_min_inside: int,
-    possible_min_ratio: float,
-    possible_score: int,
-    outside_only_min_count: int,
-    outside_only_score: int,
-    positive_label: str,
-    negative_label: str,
-) -> _ProjectRelevanceSignal:
-    inside_count = int(inside_counts[key])
-    outside_count = int(outside_counts[key])
+) -> Dict[str, _SignalScore]:
+    """Score every signal key seen in located rows once, for per-row lookups."""
+    return {
+        key: _score_signal(rule, int(inside_counts[key]), int(outside_counts[key]))
+        for key in inside_counts.keys() | outside_counts.keys()
+    }
+
+
+def _score_signal(rule: _SignalRule, inside_count: int, outside_count: int) -> _SignalScore:
     total = inside_count + outside_count
     inside_ratio = inside_count / total if total else 0.0
+    for min_inside, min_ratio, score in (
+        (rule.strong_min_inside, rule.strong_min_ratio, rule.strong_score),
+        (rule.likely_min_inside, rule.likely_min_ratio, rule.likely_score),
+        (rule.possible_min_inside, rule.possible_min_ratio, rule.possible_score),
+    ):
+        if min_inside and inside_count >= min_inside and inside_ratio >= min_ratio:
+            return _SignalScore(score, rule.positive_label, inside_count, outside_count)
+    if inside_count == 0 and outside_count >= rule.outside_only_min_count:
+        return _SignalScore(rule.outside_only_score, rule.negative_label, inside_count, outside_count)
+    return _SignalScore(0, "", inside_count, outside_count)
+
+
+def _signal_detail(rule: _SignalRule, signal_label: str, entry: _SignalScore) -> str:
     detail = _build_project_signal_detail(
-        evidence_label=evidence_label,
+        evidence_label=rule.evidence_label,
         signal_label=signal_label,
-        inside_count=inside_count,
-        outside_count=outside_count,
+        inside_count=entry.inside_count,
+        outside_count=entry.outside_count,
     )
-
-    if strong_min_inside and inside_count >= strong_min_inside and inside_ratio >= strong_min_ratio:
-        return _ProjectRelevanceSignal(score=strong_score, reason=positive_label, detail=detail)
-    if likely_min_inside and inside_count >= likely_min_inside and inside_ratio >= likely_min_ratio:
-        return _ProjectRelevanceSignal(score=likely_score, reason=positive_label, detail=detail)
-    if possible_min_inside and inside_count >= possible_min_inside and inside_ratio >= possible_min_ratio:
-        return _ProjectRelevanceSignal(score=possible_score, reason=positive_label, detail=detail)
-    if inside_count == 0 and outside_count >= outside_only_min_count:
-        return _ProjectRelevanceSignal(
-            score=outside_only_score,
-            reason=negative_label,
-            detail=detail or (
-                f"{evidence_label}: {signal_label} appears in {outside_count} known-coordinate "
-                "crash(es), all outside the KMZ."
-            ),
-        )
-    if total:
-        return _ProjectRelevanceSignal(
-            score=0,
-            reason="",
-            detail=f"{detail} This signal was too mixed or too small to change the review score.",
-        )
-    return _ProjectRelevanceSignal(score=0, reason="", detail="")
+    if entry.reason:
+        return detail
+    return f"{detail} This signal was too mixed or too small to change the review score."
 
 
 def _build_project_signal_detail(
@@ -1012,19 +1319,11 @@ def _relevance_route_signal(row: Mapping[str, Any]) -> str:
     return ""
 
 
-def _relevance_cross_signal(row: Mapping[str, Any]) -> str:
-    return _compact_signal(_cross_text(row))
-
-
 def _relevance_locality_signal(row: Mapping[str, Any]) -> str:
     parts = [_compact_signal(_first_text(row, ("city", "township"))), _compact_signal(_first_text(row, ("county",)))]
     return "|".join(part for part in parts if part)
 
 
-def _display_locality(row: Mapping[str, Any]) -> str:
-    return _locality_text(row).replace("|", " / ") or "Unknown locality"
-
-
 def _review_row_key(row: Mapping[str, Any], *, source_row_number: int) -> str:
     identifier = _row_identifier(row)
     if identifier:
@@ -1094,27 +1393,38 @@ def _confidence_rank(value: str) -> int:
 
 
 def _select_suggestion(
-    row: Mapping[str, Any],
+    signature: _LocationSignature,
     *,
-    evidence: Dict[str, Dict[str, Counter[Coordinate]]],
-    boundary: PolygonBoundary | None,
+    evidence: EvidenceStore,
+    boundary: Boundary | None,
+    library_evidence: Optional[EvidenceStore] = None,
 ) -> Optional[_RecoverySuggestion]:
+    """Pick the best suggestion across fingerprint modes.
+
+    *library_evidence* (see :mod:`crash_data_refiner.evidence_library`) is
+    only consulted for fingerprints with no evidence in the current rows.
+    """
     best_review_suggestion: Optional[_RecoverySuggestion] = None
 
     for priority, mode in enumerate(MODE_ORDER):
-        fingerprint = _fingerprint(row, mode)
+        fingerprint = signature.fingerprint(mode)
         if not fingerprint:
             continue
-        counter = evidence[mode].get(fingerprint)
-        if not counter:
+        ranked = evidence.ranked(mode, fingerprint)
+        from_library = False
+        if not ranked and library_evidence is not None:
+            ranked = library_evidence.ranked(mode, fingerprint)
+            from_library = True
+        if not ranked:
             continue
 
         suggestion = _build_suggestion(
             mode,
             fingerprint=fingerprint,
-            counter=counter,
+            ranked=ranked,
             boundary=boundary,
             priority=priority,
+            from_library=from_library,
         )
         if suggestion.confidence == "high":
             return suggestion
@@ -1144,12 +1454,13 @@ def _build_suggestion(
     mode: str,
     *,
     fingerprint: str,
-    counter: Counter[Coordinate],
-    boundary: PolygonBoundary | None,
+    ranked: Sequence[Tuple[Coordinate, int]],
+    boundary: Boundary | None,
     priority: int,
+    from_library: bool = False,
 ) -> _RecoverySuggestion:
     clusters = _build_clusters(
-        counter,
+        ranked,
         threshold_feet=MODE_CLUSTER_DISTANCE_FEET[mode],
         boundary=boundary,
     )
@@ -1187,6 +1498,8 @@ def _build_suggestion(
         note += " Top candidate is inside the KMZ boundary."
     elif top_cluster.inside_boundary is False:
         note += " Top candidate is outside the KMZ boundary."
+    if from_library:
+        note += " Matched rows come from earlier runs in the evidence library."
 
     return _RecoverySuggestion(
         method=mode,
@@ -1203,22 +1516,19 @@ def _build_suggestion(
 
 
 def _build_clusters(
-    counter: Counter[Coordinate],
+    ranked: Sequence[Tuple[Coordinate, int]],
     *,
     threshold_feet: float,
-    boundary: PolygonBoundary | None,
+    boundary: Boundary | None,
 ) -> List["_ClusterSnapshot"]:
-    clusters: List[_ClusterBuilder] = []
-    for coord, count in counter.most_common():
-        target = None
-        for cluster in clusters:
-            if cluster.accepts(coord, threshold_feet=threshold_feet):
-                target = cluster
-                break
-        if target is None:
-            target = _ClusterBuilder()
-            clusters.append(target)
-        target.add(coord, count)
+    """Cluster ``(coordinate, count)`` pairs given most-reported first."""
+    grid = _ClusterGrid(
+        threshold_feet=threshold_feet,
+        max_abs_lat=max((abs(coord[0]) for coord, _count in ranked), default=0.0),
+    )
+    for coord, count in ranked:
+        grid.add(coord, count)
+    clusters = grid.clusters
 
     snapshots = [
         _ClusterSnapshot.from_builder(cluster, boundary=boundary)
@@ -1247,12 +1557,12 @@ class _ClusterSnapshot:
         cls,
         cluster: _ClusterBuilder,
         *,
-        boundary: PolygonBoundary | None,
+        boundary: Boundary | None,
     ) -> "_ClusterSnapshot":
         lat, lon = cluster.centroid
         inside_boundary = None
         if boundary is not None:
-            inside_boundary = point_in_polygon(lon, lat, boundary)
+            inside_boundary = prepare_polygon(boundary).contains(lon, lat)
         return cls(
             latitude=lat,
             longitude=lon,
@@ -1295,49 +1605,88 @@ def _apply_review_group_sizes(review_rows: List[Dict[str, Any]]) -> None:
         row["coordinate_recovery_group_size"] = group_sizes[str(row.get("coordinate_recovery_group") or "")]
 
 
-def _review_group_key(row: Mapping[str, Any]) -> Optional[str]:
-    for mode in MODE_ORDER:
-        fingerprint = _fingerprint(row, mode)
-        if fingerprint:
-            return fingerprint
-    route = _route_text(row)
-    locality = _locality_text(row)
-    if route and locality:
-        return f"{route}|{locality}"
-    if route:
-        return route
-    return None
-
+@dataclass(frozen=True, slots=True)
+class _LocationSignature:
+    """Cleaned location fields and recovery fingerprints of one crash row.
 
-def _fingerprint(row: Mapping[str, Any], mode: str) -> Optional[str]:
-    route = _route_text(row)
-    locality = _locality_text(row)
+    Built once per row by :func:`_location_signature` and shared by evidence
+    indexing, suggestion selection, review grouping and relevance scoring.
+    """
 
-    if mode == "offset_match":
-        reference = _cross_text(row) or _mile_marker_text(row)
-        feet = _first_text(row, _FEET_KEYS)
-        direction = _direction_text(row)
-        if route and reference and feet and direction:
-            return "|".join(part for part in (route, reference, feet, direction, locality) if part)
-        return None
+    route: str
+    cross: str
+    mile_marker: str
+    feet: str
+    direction: str
+    locality: str
+    route_signal: str
+    cross_signal: str
+    locality_signal: str
+    offset_fingerprint: Optional[str]
+    intersection_fingerprint: Optional[str]
+    mile_marker_fingerprint: Optional[str]
+    unique_location_fingerprint: Optional[str]
+
+    def fingerprint(self, mode: str) -> Optional[str]:
+        if mode == "offset_match":
+            return self.offset_fingerprint
+        if mode == "intersection_match":
+            return self.intersection_fingerprint
+        if mode == "mile_marker_match":
+            return self.mile_marker_fingerprint
+        if mode == "unique_location_match":
+            return self.unique_location_fingerprint
+        raise ValueError(f"Unsupported recovery mode: {mode}")
 
-    if mode == "intersection_match":
-        cross = _cross_text(row)
-        if route and cross:
-            return "|".join(part for part in (route, cross, locality) if part)
-        return None
+    @property
+    def group_key(self) -> Optional[str]:
+        for fingerprint in (
+            self.offset_fingerprint,
+            self.intersection_fingerprint,
+            self.mile_marker_fingerprint,
+            self.unique_location_fingerprint,
+        ):
+            if fingerprint:
+                return fingerprint
+        if self.route and self.locality:
+            return f"{self.route}|{self.locality}"
+        return self.route or None
 
-    if mode == "mile_marker_match":
-        mile_marker = _mile_marker_text(row)
-        if route and mile_marker:
-            return "|".join(part for part in (route, mile_marker, locality) if part)
-        return None
+    @property
+    def display_locality(self) -> str:
+        return self.locality.replace("|", " / ") or "Unknown locality"
 
-    if mode == "unique_location_match":
-        unique_id = _first_text(row, ("unique_location_id",))
-        return unique_id or None
 
-    raise ValueError(f"Unsupported recovery mode: {mode}")
+def _location_signature(row: Mapping[str, Any]) -> _LocationSignature:
+    route = _route_text(row)
+    cross = _cross_text(row)
+    mile_marker = _mile_marker_text(row)
+    feet = _first_text(row, _FEET_KEYS)
+    direction = _direction_text(row)
+    locality = _locality_text(row)
+    unique_id = _first_text(row, ("unique_location_id",))
+
+    reference = cross or mile_marker
+    offset = None
+    if route and reference and feet and direction:
+        offset = "|".join(part for part in (route, reference, feet, direction, locality) if part)
+    intersection = "|".join(part for part in (route, cross, locality) if part) if route and cross else None
+    mile = "|".join(part for part in (route, mile_marker, locality) if part) if route and mile_marker else None
+    return _LocationSignature(
+        route=route,
+        cross=cross,
+        mile_marker=mile_marker,
+        feet=feet,
+        direction=direction,
+        locality=locality,
+        route_signal=_relevance_route_signal(row),
+        cross_signal=_compact_signal(cross),
+        locality_signal=_relevance_locality_signal(row),
+        offset_fingerprint=offset,
+        intersection_fingerprint=intersection,
+        mile_marker_fingerprint=mile,
+        unique_location_fingerprint=unique_id or None,
+    )
 
 
 def _route_text(row: Mapping[str, Any]) -> str:
@@ -1412,19 +1761,63 @@ def _clean_text(value: Any, *, route: bool = False) -> str:
     return text.upper()
 
 
-def _distance_feet(left: Coordinate, right: Coordinate) -> float:
-    if left == right:
-        return 0.0
-    lat1, lon1 = left
-    lat2, lon2 = right
-    radius_m = 6_371_000.0
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    delta_phi = math.radians(lat2 - lat1)
-    delta_lambda = math.radians(lon2 - lon1)
-    a = (
-        math.sin(delta_phi / 2.0) ** 2
-        + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2.0) ** 2
-    )
-    c = 2.0 * math.atan2(math.sqrt(a), math.sqrt(1.0 - a))
-    return radius_m * c * 3.28084
+def _hull_diameter_feet(points: Sequence[Coordinate]) -> float:
+    """Largest distance between *points*, via rotating calipers over their hull.
+
+    The calipers visit each antipodal vertex pair of the projected hull once;
+    the farthest pair is among them, so only those pairs get a haversine.
+    """
+    projection = LocalProjection.around(points)
+    hull = _convex_hull(points, projection=projection)
+    if len(hull) < 3:
+        return max_pairwise_distance_feet(hull)
+    projected = [projection.project(point) for point in hull]
+    size = len(hull)
+
+    def area(a: int, b: int, c: int) -> float:
+        (ax, ay), (bx, by), (cx, cy) = projected[a], projected[b], projected[c]
+        return abs((bx - ax) * (cy - ay) - (by - ay) * (cx - ax))
+
+    farthest = 0.0
+    opposite = 1
+    for index in range(size):
+        following = (index + 1) % size
+        while area(index, following, (opposite + 1) % size) > area(index, following, opposite):
+            opposite = (opposite + 1) % size
+        farthest = max(
+            farthest,
+            distance_feet(hull[index], hull[opposite]),
+            distance_feet(hull[following], hull[opposite]),
+        )
+    return farthest
+
+
+def _convex_hull(
+    points: Sequence[Coordinate],
+    *,
+    projection: Optional[LocalProjection] = None,
+) -> List[Coordinate]:
+    """Counter-clockwise hull vertices of *points* (Andrew's monotone chain), in a local projection."""
+    projection = projection or LocalProjection.around(points)
+    lookup = {projection.project(point): point for point in points}
+    projected = sorted(lookup)
+    if len(projected) <= 2:
+        return [lookup[point] for point in projected]
+
+    def cross(o: Tuple[float, float], a: Tuple[float, float], b: Tuple[float, float]) -> float:
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower: List[Tuple[float, float]] = []
+    for point in projected:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], point) <= 0:
+            lower.pop()
+        lower.append(point)
+    upper: List[Tuple[float, float]] = []
+    for point in reversed(projected):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], point) <= 0:
+            upper.pop()
+        upper.append(point)
+    hull = lower[:-1] + upper[:-1]
+    return [lookup[point] for point in hull]
+
+
@@ -0,0 +1,156 @@
+"""Great-circle distances in feet, one pair at a time or in batches.
+
+Coordinates are ``(lat, lon)`` pairs in degrees, as in coordinate recovery.
+Batch helpers use NumPy when it is installed and the batch is large enough to
+pay for building the arrays; otherwise they loop over :func:`distance_feet`.
+Passing a :class:`LocalProjection` replaces haversine with a flat cos(lat)
+approximation, which stays within a few parts per million of the great-circle
+distance over corridor-sized extents.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import math
+from typing import List, Optional, Sequence, Tuple
+
+try:  # NumPy is optional; batches fall back to the scalar kernel.
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the installed extras
+    np = None  # type: ignore[assignment]
+
+LatLon = Tuple[float, float]  # (lat, lon)
+
+EARTH_RADIUS_M = 6_371_000.0
+FEET_PER_METER = 3.28084
+FEET_PER_DEGREE = math.radians(1.0) * EARTH_RADIUS_M * FEET_PER_METER
+
+# Below this many distances a Python loop beats converting to arrays.
+_NUMPY_MIN_BATCH = 32
+
+
+@dataclass(frozen=True)
+class LocalProjection:
+    """Flat projection with a fixed cos(lat) scale for a small area."""
+
+    cos_lat: float
+
+    @classmethod
+    def around(cls, points: Sequence[LatLon]) -> "LocalProjection":
+        """Projection centred on the mean latitude of *points*."""
+        if not points:
+            return cls(cos_lat=1.0)
+        mean_lat = sum(lat for lat, _lon in points) / len(points)
+        return cls(cos_lat=math.cos(math.radians(mean_lat)))
+
+    def project(self, point: LatLon) -> Tuple[float, float]:
+        """Return ``(x, y)`` in feet."""
+        return (point[1] * self.cos_lat * FEET_PER_DEGREE, point[0] * FEET_PER_DEGREE)
+
+    def distance_feet(self, left: LatLon, right: LatLon) -> float:
+        return math.hypot(left[0] - right[0], (left[1] - right[1]) * self.cos_lat) * FEET_PER_DEGREE
+
+
+def distance_feet(left: LatLon, right: LatLon) -> float:
+    """Haversine distance between two points, in feet."""
+    if left == right:
+        return 0.0
+    lat1, lon1 = left
+    lat2, lon2 = right
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    delta_phi = math.radians(lat2 - lat1)
+    delta_lambda = math.radians(lon2 - lon1)
+    a = (
+        math.sin(delta_phi / 2.0) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2.0) ** 2
+    )
+    c = 2.0 * math.atan2(math.sqrt(a), math.sqrt(1.0 - a))
+    return EARTH_RADIUS_M * c * FEET_PER_METER
+
+
+def equirectangular_distance_feet(left: LatLon, right: LatLon) -> float:
+    """Flat-earth estimate scaled by the pair's mean latitude; close to haversine for nearby points."""
+    cos_lat = math.cos(math.radians((left[0] + right[0]) / 2.0))
+    return math.hypot(left[0] - right[0], (left[1] - right[1]) * cos_lat) * FEET_PER_DEGREE
+
+
+def distances_feet(
+    origin: LatLon,
+    points: Sequence[LatLon],
+    *,
+    projection: Optional[LocalProjection] = None,
+) -> List[float]:
+    """Distance from *origin* to each of *points*, in order."""
+    if np is None or len(points) < _NUMPY_MIN_BATCH:
+        measure = projection.distance_feet if projection is not None else distance_feet
+        return [measure(origin, point) for point in points]
+    lats, lons = _as_arrays(points)
+    return _array_distances(origin[0], origin[1], lats, lons, projection).tolist()
+
+
+def pairwise_distances_feet(
+    points: Sequence[LatLon],
+    *,
+    projection: Optional[LocalProjection] = None,
+) -> List[List[float]]:
+    """Symmetric matrix of distances between every pair of *points*."""
+    count = len(points)
+    if np is None or count * count < _NUMPY_MIN_BATCH:
+        measure = projection.distance_feet if projection is not None else distance_feet
+        matrix = [[0.0] * count for _ in range(count)]
+        for left_idx in range(count):
+            for right_idx in range(left_idx + 1, count):
+                distance = measure(points[left_idx], points[right_idx])
+                matrix[left_idx][right_idx] = distance
+                matrix[right_idx][left_idx] = distance
+        return matrix
+    return _pairwise_array(points, projection).tolist()
+
+
+def max_pairwise_distance_feet(
+    points: Sequence[LatLon],
+    *,
+    projection: Optional[LocalProjection] = None,
+) -> float:
+    """Largest distance between any two of *points* (0 for fewer than two)."""
+    count = len(points)
+    if count < 2:
+        return 0.0
+    if np is None or count * count < _NUMPY_MIN_BATCH:
+        measure = projection.distance_feet if projection is not None else distance_feet
+        return max(
+            measure(points[left_idx], points[right_idx])
+            for left_idx in range(count)
+            for right_idx in range(left_idx + 1, count)
+        )
+    return float(_pairwise_array(points, projection).max())
+
+
+def _as_arrays(points: Sequence[LatLon]) -> Tuple["np.ndarray", "np.ndarray"]:
+    coords = np.asarray(points, dtype=float).reshape(-1, 2)
+    return coords[:, 0], coords[:, 1]
+
+
+def _pairwise_array(points: Sequence[LatLon], projection: Optional[LocalProjection]) -> "np.ndarray":
+    lats, lons = _as_arrays(points)
+    return _array_distances(lats[:, None], lons[:, None], lats[None, :], lons[None, :], projection)
+
+
+def _array_distances(
+    lat1: "np.ndarray | float",
+    lon1: "np.ndarray | float",
+    lat2: "np.ndarray",
+    lon2: "np.ndarray",
+    projection: Optional[LocalProjection],
+) -> "np.ndarray":
+    if projection is not None:
+        return np.hypot(lat1 - lat2, (lon1 - lon2) * projection.cos_lat) * FEET_PER_DEGREE
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    a = (
+        np.sin(np.radians(lat2 - lat1) / 2.0) ** 2
+        + np.cos(phi1) * np.cos(phi2) * np.sin(np.radians(lon2 - lon1) / 2.0) ** 2
+    )
+    a = np.clip(a, 0.0, 1.0)
+    c = 2.0 * np.arctan2(np.sqrt(a), np.sqrt(1.0 - a))
+    return EARTH_RADIUS_M * c * FEET_PER_METER
@@ -0,0 +1,138 @@
+"""Coordinate evidence shared across refinement runs.
+
+Coordinate recovery normally learns fingerprint -> coordinate patterns only
+from located rows in the spreadsheet being refined. The evidence library is a
+local SQLite file that keeps those observations from every run, keyed by
+locality (city and county), so a crash that has no located neighbour in this
+month's extract can still be placed from last month's.
+
+Each observation is stored once per source row: rows are identified by a hash
+of their normalized contents, so refining overlapping extracts does not
+inflate the counts. Only rows with a known locality are recorded or looked
+up, because a route and cross street alone are ambiguous across counties.
+"""
+from __future__ import annotations
+
+from contextlib import closing, contextmanager
+from dataclasses import replace
+from datetime import datetime, timezone
+import hashlib
+import json
+from pathlib import Path
+import sqlite3
+from typing import Dict, Iterator, List, Tuple
+
+from .coordinate_recovery import MODE_ORDER, RecoveryInputs
+from .evidence_store import EvidenceKey, EvidenceStore, RankedCoordinates
+from .geo import is_usable_coordinate_pair, parse_coordinate
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS coordinate_evidence (
+    locality TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    row_hash TEXT NOT NULL,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    recorded_at TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS coordinate_evidence_key
+    ON coordinate_evidence (locality, mode, fingerprint, row_hash);
+"""
+
+
+class EvidenceLibrary:
+    """Fingerprint -> coordinate observations from past runs, in one SQLite file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+
+    def record(self, inputs: RecoveryInputs) -> int:
+        """Add the located rows of *inputs*; returns how many observations were new."""
+        recorded_at = datetime.now(timezone.utc).isoformat()
+        observations: List[Tuple[str, str, str, str, float, float, str]] = []
+        for row, signature in zip(inputs.rows, inputs.signatures):
+            if not signature.locality:
+                continue
+            lat = parse_coordinate(row.get(inputs.lat_key))
+            lon = parse_coordinate(row.get(inputs.lon_key))
+            if not is_usable_coordinate_pair(lat, lon):
+                continue
+            row_hash = _row_hash(row)
+            for mode in MODE_ORDER:
+                fingerprint = signature.fingerprint(mode)
+                if fingerprint:
+                    observations.append((signature.locality, mode, fingerprint, row_hash, lat, lon, recorded_at))
+        with self._connect() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                "INSERT OR IGNORE INTO coordinate_evidence "
+                "(locality, mode, fingerprint, row_hash, latitude, longitude, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                observations,
+            )
+            return connection.total_changes - before
+
+    def lookup(self, locality: str, mode: str, fingerprint: str) -> RankedCoordinates:
+        """Past coordinates for one key, most reported first (ties by first recorded)."""
+        with self._connect() as connection:
+            return self._lookup(connection, locality, mode, fingerprint)
+
+    def attach(self, inputs: RecoveryInputs) -> RecoveryInputs:
+        """Return *inputs* with library evidence for fingerprints they cannot resolve.
+
+        Only missing-coordinate rows with a locality are considered, and only
+        for fingerprints that have no evidence in *inputs* itself. The result
+        is a snapshot, so later recordings do not change a parsed dataset.
+        """
+        wanted: Dict[EvidenceKey, str] = {}
+        for row, signature in zip(inputs.rows, inputs.signatures):
+            if not signature.locality:
+                continue
+            lat = parse_coordinate(row.get(inputs.lat_key))
+            lon = parse_coordinate(row.get(inputs.lon_key))
+            if lat is not None and lon is not None:
+                continue
+            for mode in MODE_ORDER:
+                fingerprint = signature.fingerprint(mode)
+                if fingerprint and not inputs.evidence.ranked(mode, fingerprint):
+                    wanted.setdefault((mode, fingerprint), signature.locality)
+        groups: Dict[EvidenceKey, RankedCoordinates] = {}
+        if wanted:
+            with self._connect() as connection:
+                for (mode, fingerprint), locality in wanted.items():
+                    groups[(mode, fingerprint)] = self._lookup(connection, locality, mode, fingerprint)
+        return replace(inputs, library_evidence=EvidenceStore.from_ranked(groups))
+
+    def _lookup(
+        self,
+        connection: sqlite3.Connection,
+        locality: str,
+        mode: str,
+        fingerprint: str,
+    ) -> RankedCoordinates:
+        rows = connection.execute(
+            "SELECT latitude, longitude, COUNT(*) AS row_count FROM coordinate_evidence "
+            "WHERE locality = ? AND mode = ? AND fingerprint = ? "
+            "GROUP BY latitude, longitude ORDER BY row_count DESC, MIN(rowid)",
+            (locality, mode, fingerprint),
+        ).fetchall()
+        return [((row["latitude"], row["longitude"]), row["row_count"]) for row in rows]
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Short-lived connection committed on success, like the run store's."""
+        with closing(sqlite3.connect(self.path, timeout=30)) as connection:
+            connection.row_factory = sqlite3.Row
+            with connection:
+                yield connection
+
+
+def _row_hash(row: object) -> str:
+    payload = json.dumps(row, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
@@ -0,0 +1,180 @@
+"""Compact index of known coordinates per location fingerprint.
+
+Coordinate recovery looks up, for a ``(mode, fingerprint)`` key, every
+distinct coordinate seen with that fingerprint and how many rows reported it.
+Instead of nested dicts of ``Counter`` objects, :class:`EvidenceStore` interns
+each key to an integer id and keeps the coordinates in parallel flat buffers
+grouped by id, with an offset table so a lookup is two array reads. Within a
+group, coordinates are stored in ``Counter.most_common()`` order (most rows
+first, ties in first-seen order), which is the order clustering consumes them.
+
+A store can be written to disk and mapped back with :mod:`mmap`, so a later
+run reads only the pages it touches instead of rebuilding the index.
+"""
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+import json
+import mmap
+import os
+from pathlib import Path
+import struct
+import sys
+import tempfile
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .distances import LatLon
+
+EvidenceKey = Tuple[str, str]  # (mode, fingerprint)
+RankedCoordinates = List[Tuple[LatLon, int]]
+
+_MAGIC = b"CDREVID1"
+# key count, entry count, key-table byte length, byte order (0 little, 1 big)
+_HEADER = struct.Struct("<qqqq")
+_ALIGNMENT = 8
+
+
+class EvidenceStore:
+    """Read-only ``(mode, fingerprint) -> ranked coordinates`` index."""
+
+    def __init__(
+        self,
+        keys: Sequence[EvidenceKey],
+        offsets: Sequence[int],
+        lats: Sequence[float],
+        lons: Sequence[float],
+        counts: Sequence[int],
+        *,
+        path: Optional[str] = None,
+    ) -> None:
+        if len(offsets) != len(keys) + 1 or not (len(lats) == len(lons) == len(counts) == offsets[-1]):
+            raise ValueError("Evidence store buffers are inconsistent.")
+        self._keys = list(keys)
+        self._ids: Dict[EvidenceKey, int] = {key: index for index, key in enumerate(self._keys)}
+        self._offsets = offsets
+        self._lats = lats
+        self._lons = lons
+        self._counts = counts
+        self.path = path
+
+    @classmethod
+    def build(cls, observations: Iterable[Tuple[str, str, float, float]]) -> "EvidenceStore":
+        """Index ``(mode, fingerprint, lat, lon)`` observations, one per row and mode."""
+        ids: Dict[EvidenceKey, int] = {}
+        key_ids = array("q")
+        raw_lats = array("d")
+        raw_lons = array("d")
+        for mode, fingerprint, lat, lon in observations:
+            key_ids.append(ids.setdefault((mode, fingerprint), len(ids)))
+            raw_lats.append(lat)
+            raw_lons.append(lon)
+
+        # Stable counting sort by key id keeps each group in row order, so the
+        # per-group Counter sees coordinates in first-seen order.
+        starts = array("q", bytes(8 * (len(ids) + 1)))
+        for key_id in key_ids:
+            starts[key_id + 1] += 1
+        for key_id in range(len(ids)):
+            starts[key_id + 1] += starts[key_id]
+        cursor = array("q", starts)
+        order = array("q", bytes(8 * len(key_ids)))
+        for index, key_id in enumerate(key_ids):
+            order[cursor[key_id]] = index
+            cursor[key_id] += 1
+
+        offsets = array("q", [0])
+        lats = array("d")
+        lons = array("d")
+        counts = array("q")
+        for key_id in range(len(ids)):
+            group = order[starts[key_id]:starts[key_id + 1]]
+            for (lat, lon), count in Counter((raw_lats[i], raw_lons[i]) for i in group).most_common():
+                lats.append(lat)
+                lons.append(lon)
+                counts.append(count)
+            offsets.append(len(counts))
+        return cls(list(ids), offsets, lats, lons, counts)
+
+    @classmethod
+    def from_ranked(cls, groups: Mapping[EvidenceKey, RankedCoordinates]) -> "EvidenceStore":
+        """Store already-ranked coordinates per key; empty groups are skipped."""
+        keys: List[EvidenceKey] = []
+        offsets = array("q", [0])
+        lats = array("d")
+        lons = array("d")
+        counts = array("q")
+        for key, ranked in groups.items():
+            if not ranked:
+                continue
+            keys.append(key)
+            for (lat, lon), count in ranked:
+                lats.append(lat)
+                lons.append(lon)
+                counts.append(count)
+            offsets.append(len(counts))
+        return cls(keys, offsets, lats, lons, counts)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "EvidenceStore":
+        """Map a file written by :meth:`save`; buffers are read lazily from disk."""
+        with open(path, "rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[: len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"{path} is not an evidence store.")
+        key_count, entry_count, table_length, big_endian = _HEADER.unpack_from(mapped, len(_MAGIC))
+        if bool(big_endian) != (sys.byteorder == "big"):
+            raise ValueError(f"{path} was written on a machine with a different byte order.")
+        position = len(_MAGIC) + _HEADER.size
+        keys = [tuple(key) for key in json.loads(mapped[position:position + table_length].decode("utf-8"))]
+        position = _aligned(position + table_length)
+
+        view = memoryview(mapped)
+        buffers = []
+        for typecode, length in (("q", key_count + 1), ("d", entry_count), ("d", entry_count), ("q", entry_count)):
+            end = position + 8 * length
+            buffers.append(view[position:end].cast(typecode))
+            position = end
+        return cls(keys, *buffers, path=str(Path(path).resolve()))
+
+    def save(self, path: Union[str, Path]) -> "EvidenceStore":
+        """Write the store atomically to *path* and return a copy mapped from it."""
+        path = Path(path)
+        table = json.dumps(self._keys, separators=(",", ":")).encode("utf-8")
+        header = _MAGIC + _HEADER.pack(len(self._keys), len(self._counts), len(table), int(sys.byteorder == "big"))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as handle:
+            handle.write(header)
+            handle.write(table)
+            handle.write(bytes(_aligned(len(header) + len(table)) - len(header) - len(table)))
+            for typecode, values in (
+                ("q", self._offsets),
+                ("d", self._lats),
+                ("d", self._lons),
+                ("q", self._counts),
+            ):
+                handle.write(array(typecode, values).tobytes())
+        os.replace(handle.name, path)
+        return EvidenceStore.load(path)
+
+    def ranked(self, mode: str, fingerprint: str) -> RankedCoordinates:
+        """Coordinates recorded for the key, most reported first; empty if unknown."""
+        key_id = self._ids.get((mode, fingerprint))
+        if key_id is None:
+            return []
+        start, end = self._offsets[key_id], self._offsets[key_id + 1]
+        lats, lons, counts = self._lats, self._lons, self._counts
+        return [((lats[i], lons[i]), counts[i]) for i in range(start, end)]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __reduce__(self):
+        # Mapped stores pickle as their path; the file is mapped again on load.
+        if self.path is not None:
+            return (EvidenceStore.load, (self.path,))
+        return (EvidenceStore, (self._keys, self._offsets, self._lats, self._lons, self._counts))
+
+
+def _aligned(position: int) -> int:
+    return -(-position // _ALIGNMENT) * _ALIGNMENT
@@ -2,14 +2,28 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from functools import cached_property
 import math
 import re
-from typing import Any, Iterable, List, Sequence, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 import xml.etree.ElementTree as ET
 import zipfile
 
+try:  # NumPy is optional; batch boundary tests fall back to pure Python.
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the installed extras
+    np = None  # type: ignore[assignment]
 
 Coordinate = Tuple[float, float]  # (lon, lat)
+BoundingBox = Tuple[float, float, float, float]  # (min_lon, min_lat, max_lon, max_lat)
+Edge = Tuple[float, float, float, float]  # (x1, y1, x2, y2)
+
+# Average number of edges per latitude band in a prepared ring. Bands are capped
+# so a pathological ring cannot allocate an unbounded index.
+_PREPARED_EDGES_PER_BAND = 8
+_PREPARED_MAX_BANDS = 4096
+# Fan-out of the packed bbox index over multi-polygon parts.
+_BBOX_INDEX_NODE_SIZE = 8
 
 
 @dataclass(frozen=True)
@@ -18,12 +32,324 @@ class PolygonBoundary:
 
     outer: List[Coordinate]
     holes: List[List[Coordinate]] = field(default_factory=list)
+    name: str = ""
+
+    @cached_property
+    def bbox(self) -> BoundingBox:
+        return _ring_bbox(self.outer)
+
+    @cached_property
+    def prepared(self) -> "PreparedPolygon":
+        """Return the indexed form of this boundary, built once on first use."""
+        return PreparedPolygon(self)
+
+
+class _PreparedRing:
+    """Ring edges bucketed into equal-height latitude bands.
+
+    A horizontal ray cast at latitude ``lat`` can only cross edges whose
+    latitude span contains ``lat``, so only the band containing the point is
+    scanned. Edges spanning several bands are stored in each of them.
+    """
+
+    __slots__ = ("bbox", "_min_lat", "_band_height", "_bands", "_band_arrays")
+
+    def __init__(self, ring: Sequence[Coordinate]) -> None:
+        self.bbox = _ring_bbox(ring) if ring else (0.0, 0.0, 0.0, 0.0)
+        self._min_lat = self.bbox[1]
+        self._bands: List[List[Edge]] = []
+        self._band_arrays: List[Any] = []
+        self._band_height = 0.0
+        if len(ring) < 3:
+            return
+
+        edges = [(*ring[idx], *ring[idx + 1]) for idx in range(len(ring) - 1)]
+        band_count = max(1, min(len(edges) // _PREPARED_EDGES_PER_BAND, _PREPARED_MAX_BANDS))
+        lat_span = self.bbox[3] - self._min_lat
+        if lat_span <= 0:
+            band_count = 1
+        self._band_height = lat_span / band_count if band_count > 1 else 0.0
+        self._bands = [[] for _ in range(band_count)]
+        for edge in edges:
+            low = self._band_index(min(edge[1], edge[3]))
+            high = self._band_index(max(edge[1], edge[3]))
+            for band in range(low, high + 1):
+                self._bands[band].append(edge)
+        self._band_arrays = [None] * band_count
+
+    def _band_index(self, lat: float) -> int:
+        if self._band_height <= 0:
+            return 0
+        index = int((lat - self._min_lat) / self._band_height)
+        return min(max(index, 0), len(self._bands) - 1)
+
+    def contains(self, lon: float, lat: float) -> bool:
+        if not self._bands:
+            return False
+        min_lon, min_lat, max_lon, max_lat = self.bbox
+        if lon < min_lon or lon > max_lon or lat < min_lat or lat > max_lat:
+            return False
+        inside = False
+        for x1, y1, x2, y2 in self._bands[self._band_index(lat)]:
+            intersects = ((y1 > lat) != (y2 > lat)) and (
+                lon < (x2 - x1) * (lat - y1) / (y2 - y1 + 1e-12) + x1
+            )
+            if intersects:
+                inside = not inside
+        return inside
+
+    def contains_many(self, lons: Any, lats: Any) -> Any:
+        """Vectorized :meth:`contains` over NumPy coordinate arrays."""
+        result = np.zeros(lons.shape, dtype=bool)
+        if not self._bands:
+            return result
+        min_lon, min_lat, max_lon, max_lat = self.bbox
+        candidates = np.flatnonzero(
+            (lons >= min_lon) & (lons <= max_lon) & (lats >= min_lat) & (lats <= max_lat)
+        )
+        if not candidates.size:
+            return result
+        cand_lons = lons[candidates]
+        cand_lats = lats[candidates]
+        if self._band_height > 0:
+            bands = ((cand_lats - self._min_lat) / self._band_height).astype(np.int64)
+            np.clip(bands, 0, len(self._bands) - 1, out=bands)
+        else:
+            bands = np.zeros(candidates.size, dtype=np.int64)
+
+        order = np.argsort(bands, kind="stable")
+        splits = np.flatnonzero(np.diff(bands[order])) + 1
+        for group in np.split(order, splits):
+            edges = self._band_edges(int(bands[group[0]]))
+            if not edges.size:
+                continue
+            x1, y1, x2, y2 = edges.T
+            lon = cand_lons[group][:, None]
+            lat = cand_lats[group][:, None]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                crossings = ((y1 > lat) != (y2 > lat)) & (
+                    lon < (x2 - x1) * (lat - y1) / (y2 - y1 + 1e-12) + x1
+                )
+            result[candidates[group]] = (np.count_nonzero(crossings, axis=1) % 2).astype(bool)
+        return result
+
+    def _band_edges(self, band: int) -> Any:
+        edges = self._band_arrays[band]
+        if edges is None:
+            edges = np.array(self._bands[band], dtype=float).reshape(-1, 4)
+            self._band_arrays[band] = edges
+        return edges
+
+
+class PreparedPolygon:
+    """Point-in-polygon index over a :class:`PolygonBoundary`.
+
+    Caches the outer and hole bounding boxes and buckets ring edges by latitude
+    so each test only scans the edges near the point. Results match
+    a linear ray cast over every edge of the outer ring and holes.
+    """
+
+    __slots__ = ("boundary", "bbox", "_outer", "_holes")
+
+    def __init__(self, boundary: PolygonBoundary) -> None:
+        self.boundary = boundary
+        self.bbox = boundary.bbox
+        self._outer = _PreparedRing(boundary.outer)
+        self._holes = [_PreparedRing(hole) for hole in boundary.holes]
+
+    def contains(self, lon: float, lat: float) -> bool:
+        min_lon, min_lat, max_lon, max_lat = self.bbox
+        if lon < min_lon or lon > max_lon or lat < min_lat or lat > max_lat:
+            return False
+        if not self._outer.contains(lon, lat):
+            return False
+        for hole in self._holes:
+            if hole.contains(lon, lat):
+                return False
+        return True
+
+    def contains_many(self, lons: Any, lats: Any) -> Any:
+        """Vectorized :meth:`contains` over NumPy coordinate arrays."""
+        inside = self._outer.contains_many(lons, lats)
+        for hole in self._holes:
+            inside &= ~hole.contains_many(lons, lats)
+        return inside
+
+    def locate(self, lon: float, lat: float) -> Optional[int]:
+        return 0 if self.contains(lon, lat) else None
+
+    def locate_many(self, lons: Any, lats: Any) -> Any:
+        return np.where(self.contains_many(lons, lats), 0, -1)
+
+
+@dataclass(frozen=True)
+class MultiPolygonBoundary:
+    """Boundary made of several disjoint polygons, e.g. project segments."""
+
+    parts: List[PolygonBoundary]
+
+    @cached_property
+    def bbox(self) -> BoundingBox:
+        return _union_bbox([part.bbox for part in self.parts])
+
+    @cached_property
+    def prepared(self) -> "PreparedMultiPolygon":
+        """Return the indexed form of this boundary, built once on first use."""
+        return PreparedMultiPolygon(self)
 
     @property
-    def bbox(self) -> Tuple[float, float, float, float]:
-        lons = [coord[0] for coord in self.outer]
-        lats = [coord[1] for coord in self.outer]
-        return min(lons), min(lats), max(lons), max(lats)
+    def part_names(self) -> List[str]:
+        """Placemark name of each part, numbered when the KML leaves it blank."""
+        return [part.name or f"Polygon {index}" for index, part in enumerate(self.parts, start=1)]
+
+
+Boundary = Union[PolygonBoundary, MultiPolygonBoundary]
+
+
+class _BBoxIndex:
+    """Static R-tree over bounding boxes, bulk-loaded with sort-tile-recursive packing."""
+
+    __slots__ = ("_root",)
+
+    def __init__(self, boxes: Sequence[BoundingBox]) -> None:
+        level: List[Tuple[BoundingBox, Any]] = [(box, index) for index, box in enumerate(boxes)]
+        self._root: Optional[Tuple[BoundingBox, Any]] = None
+        if not level:
+            return
+        leaf = True
+        while True:
+            level = [
+                (_union_bbox([box for box, _entry in chunk]), (leaf, chunk))
+                for chunk in _str_chunks(level, _BBOX_INDEX_NODE_SIZE)
+            ]
+            leaf = False
+            if len(level) == 1:
+                break
+        self._root = level[0]
+
+    def query(self, lon: float, lat: float) -> List[int]:
+        """Return the indexes of boxes containing the point, in insertion order."""
+        matches: List[int] = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            box, (leaf, chunk) = stack.pop()
+            if not _bbox_contains(box, lon, lat):
+                continue
+            if leaf:
+                matches.extend(index for entry_box, index in chunk if _bbox_contains(entry_box, lon, lat))
+            else:
+                stack.extend(chunk)
+        matches.sort()
+        return matches
+
+    def query_many(self, lons: Any, lats: Any) -> Dict[int, Any]:
+        """Vectorized :meth:`query`: box index -> indexes of the points inside that box.
+
+        Each node only tests the points that fell inside its parent, so a
+        point is compared with the boxes along its own root-to-leaf paths.
+        """
+        candidates: Dict[int, Any] = {}
+        stack = [(self._root, np.arange(lons.shape[0]))] if self._root is not None else []
+        while stack:
+            (box, (leaf, chunk)), points = stack.pop()
+            points = points[_bbox_mask(box, lons[points], lats[points])]
+            if not points.size:
+                continue
+            if leaf:
+                for entry_box, index in chunk:
+                    hits = points[_bbox_mask(entry_box, lons[points], lats[points])]
+                    if hits.size:
+                        candidates[index] = hits
+            else:
+                stack.extend((child, points) for child in chunk)
+        return candidates
+
+
+class PreparedMultiPolygon:
+    """Point-in-polygon index over the parts of a :class:`MultiPolygonBoundary`.
+
+    A packed bbox index narrows each point to the candidate parts whose bbox
+    contains it; only those parts run the banded ray cast. When parts overlap
+    the first one in document order wins.
+    """
+
+    __slots__ = ("boundary", "bbox", "_parts", "_index")
+
+    def __init__(self, boundary: MultiPolygonBoundary) -> None:
+        self.boundary = boundary
+        self.bbox = boundary.bbox
+        self._parts = [part.prepared for part in boundary.parts]
+        self._index = _BBoxIndex([part.bbox for part in self._parts])
+
+    def contains(self, lon: float, lat: float) -> bool:
+        return self.locate(lon, lat) is not None
+
+    def contains_many(self, lons: Any, lats: Any) -> Any:
+        """Vectorized :meth:`contains` over NumPy coordinate arrays."""
+        return self.locate_many(lons, lats) >= 0
+
+    def locate(self, lon: float, lat: float) -> Optional[int]:
+        """Return the index of the part containing the point, if any."""
+        for index in self._index.query(lon, lat):
+            if self._parts[index].contains(lon, lat):
+                return index
+        return None
+
+    def locate_many(self, lons: Any, lats: Any) -> Any:
+        """Vectorized :meth:`locate`; points outside every part map to ``-1``."""
+        located = np.full(lons.shape, -1, dtype=np.int64)
+        candidates = self._index.query_many(lons, lats)
+        for index in sorted(candidates):
+            points = candidates[index]
+            points = points[located[points] < 0]
+            if not points.size:
+                continue
+            hits = self._parts[index].contains_many(lons[points], lats[points])
+            located[points[hits]] = index
+        return located
+
+
+def prepare_polygon(
+    boundary: Boundary | PreparedPolygon | PreparedMultiPolygon,
+) -> PreparedPolygon | PreparedMultiPolygon:
+    """Return the cached prepared index for *boundary*."""
+    if isinstance(boundary, (PreparedPolygon, PreparedMultiPolygon)):
+        return boundary
+    return boundary.prepared
+
+
+def _ring_bbox(ring: Sequence[Coordinate]) -> BoundingBox:
+    lons = [coord[0] for coord in ring]
+    lats = [coord[1] for coord in ring]
+    return min(lons), min(lats), max(lons), max(lats)
+
+
+def _union_bbox(boxes: Sequence[BoundingBox]) -> BoundingBox:
+    return (
+        min(box[0] for box in boxes),
+        min(box[1] for box in boxes),
+        max(box[2] for box in boxes),
+        max(box[3] for box in boxes),
+    )
+
+
+def _bbox_contains(box: BoundingBox, lon: float, lat: float) -> bool:
+    return box[0] <= lon <= box[2] and box[1] <= lat <= box[3]
+
+
+def _bbox_mask(box: BoundingBox, lons: Any, lats: Any) -> Any:
+    return (lons >= box[0]) & (lons <= box[2]) & (lats >= box[1]) & (lats <= box[3])
+
+
+def _str_chunks(entries: List[Tuple[BoundingBox, Any]], node_size: int) -> List[List[Tuple[BoundingBox, Any]]]:
+    node_count = math.ceil(len(entries) / node_size)
+    slice_size = node_size * math.ceil(math.sqrt(node_count))
+    by_lon = sorted(entries, key=lambda entry: entry[0][0] + entry[0][2])
+    chunks: List[List[Tuple[BoundingBox, Any]]] = []
+    for start in range(0, len(by_lon), slice_size):
+        vertical_slice = sorted(by_lon[start:start + slice_size], key=lambda entry: entry[0][1] + entry[0][3])
+        chunks.extend(vertical_slice[offset:offset + node_size] for offset in range(0, len(vertical_slice), node_size))
+    return chunks
 
 
 @dataclass(frozen=True)
@@ -45,6 +371,21 @@ def load_kmz_polygon(path: str) -> PolygonBoundary:
     return polygons[0]
 
 
+def load_kmz_boundary(path: str) -> Boundary:
+    """Load every Polygon (including MultiGeometry members) from a KMZ file.
+
+    A KMZ with one polygon yields a :class:`PolygonBoundary`; several polygons
+    yield a :class:`MultiPolygonBoundary` whose parts keep their placemark names.
+    """
+    kml_text = _read_kml_from_kmz(path)
+    polygons = _parse_kml_polygons(kml_text)
+    if not polygons:
+        raise ValueError("No polygon found in KMZ.")
+    if len(polygons) == 1:
+        return polygons[0]
+    return MultiPolygonBoundary(parts=polygons)
+
+
 def _read_kml_from_kmz(path: str) -> str:
     with zipfile.ZipFile(path, "r") as archive:
         candidates = [name for name in archive.namelist() if name.lower().endswith(".kml")]
@@ -65,13 +406,20 @@ def _parse_kml_polygons(kml_text: str) -> List[PolygonBoundary]:
             return element.findall(f".//{{{ns}}}{tag}")
         return element.findall(f".//{tag}")
 
+    placemark_names: Dict[ET.Element, str] = {}
+    name_tag = f"{{{ns}}}name" if ns else "name"
+    for placemark in _findall(root, "Placemark"):
+        name = (placemark.findtext(name_tag) or "").strip()
+        for polygon in _findall(placemark, "Polygon"):
+            placemark_names[polygon] = name
+
     boundaries: List[PolygonBoundary] = []
     for polygon in _findall(root, "Polygon"):
         outer = _parse_ring(polygon, "outerBoundaryIs", ns)
         if not outer:
             continue
         holes = [_ring for _ring in _parse_holes(polygon, ns) if _ring]
-        boundaries.append(PolygonBoundary(outer=outer, holes=holes))
+        boundaries.append(PolygonBoundary(outer=outer, holes=holes, name=placemark_names.get(polygon, "")))
     return boundaries
 
 
@@ -142,28 +490,93 @@ def is_usable_coordinate_pair(latitude: float | None, longitude: float | None) -
     return True
 
 
-def point_in_polygon(lon: float, lat: float, polygon: PolygonBoundary) -> bool:
-    min_lon, min_lat, max_lon, max_lat = polygon.bbox
-    if lon < min_lon or lon > max_lon or lat < min_lat or lat > max_lat:
-        return False
-    if not _point_in_ring(lon, lat, polygon.outer):
-        return False
-    for hole in polygon.holes:
-        if _point_in_ring(lon, lat, hole):
-            return False
-    return True
+def point_in_polygon(lon: float, lat: float, polygon: Boundary | PreparedPolygon | PreparedMultiPolygon) -> bool:
+    return prepare_polygon(polygon).contains(lon, lat)
 
 
-def _point_in_ring(lon: float, lat: float, ring: Sequence[Coordinate]) -> bool:
-    inside = False
-    if len(ring) < 3:
-        return False
-    for idx in range(len(ring) - 1):
-        x1, y1 = ring[idx]
-        x2, y2 = ring[idx + 1]
-        intersects = ((y1 > lat) != (y2 > lat)) and (
-            lon < (x2 - x1) * (lat - y1) / (y2 - y1 + 1e-12) + x1
-        )
-        if intersects:
-            inside = not inside
-    return inside
+def points_in_polygon(
+    lons: Sequence[float],
+    lats: Sequence[float],
+    boundary: Boundary | PreparedPolygon | PreparedMultiPolygon,
+) -> List[bool]:
+    """Test whole coordinate columns against *boundary* at once.
+
+    Uses NumPy for the bbox prefilter and edge-crossing test when it is
+    installed and falls back to one :meth:`PreparedPolygon.contains` call per
+    point otherwise. Both paths return the same results.
+    """
+    if len(lons) != len(lats):
+        raise ValueError("Longitude and latitude sequences must have the same length.")
+    prepared = prepare_polygon(boundary)
+    if np is None or not len(lons):
+        return [prepared.contains(lon, lat) for lon, lat in zip(lons, lats)]
+    inside = prepared.contains_many(np.asarray(lons, dtype=float), np.asarray(lats, dtype=float))
+    return inside.tolist()
+
+
+def locate_points(
+    lons: Sequence[float],
+    lats: Sequence[float],
+    boundary: Boundary | PreparedPolygon | PreparedMultiPolygon,
+) -> List[Optional[int]]:
+    """Return the index of the boundary part containing each point.
+
+    A single :class:`PolygonBoundary` has one part, index ``0``. Points outside
+    the boundary map to ``None``.
+    """
+    if len(lons) != len(lats):
+        raise ValueError("Longitude and latitude sequences must have the same length.")
+    prepared = prepare_polygon(boundary)
+    if np is None or not len(lons):
+        return [prepared.locate(lon, lat) for lon, lat in zip(lons, lats)]
+    located = prepared.locate_many(np.asarray(lons, dtype=float), np.asarray(lats, dtype=float))
+    return [index if index >= 0 else None for index in located.tolist()]
+
+
+def assign_points_to_boundaries(
+    lons: Sequence[float],
+    lats: Sequence[float],
+    boundaries: Sequence[Boundary],
+) -> List[List[int]]:
+    """Return, per point, the indexes of every boundary that contains it.
+
+    The parts of all boundaries share one packed bbox index, so each point is
+    only ray-cast against parts whose bbox contains it. With NumPy installed
+    the index is queried for the whole point array at once and each part tests
+    its candidate points in one vectorized call.
+    """
+    if len(lons) != len(lats):
+        raise ValueError("Longitude and latitude sequences must have the same length.")
+    parts: List[PreparedPolygon] = []
+    owners: List[int] = []
+    for owner, boundary in enumerate(boundaries):
+        members = boundary.parts if isinstance(boundary, MultiPolygonBoundary) else [boundary]
+        for member in members:
+            parts.append(member.prepared)
+            owners.append(owner)
+
+    assignments: List[List[int]] = [[] for _ in range(len(lons))]
+    index = _BBoxIndex([part.bbox for part in parts])
+    if np is not None and len(lons):
+        lon_array = np.asarray(lons, dtype=float)
+        lat_array = np.asarray(lats, dtype=float)
+        candidates = index.query_many(lon_array, lat_array)
+        # Ascending part order keeps each point's owners in boundary order.
+        for part_index in sorted(candidates):
+            points = candidates[part_index]
+            owner = owners[part_index]
+            hits = points[parts[part_index].contains_many(lon_array[points], lat_array[points])]
+            for point in hits.tolist():
+                if not assignments[point] or assignments[point][-1] != owner:
+                    assignments[point].append(owner)
+        return assignments
+
+    for point, (lon, lat) in enumerate(zip(lons, lats)):
+        assigned = assignments[point]
+        for part_index in index.query(lon, lat):
+            owner = owners[part_index]
+            if assigned and assigned[-1] == owner:
+                continue
+            if parts[part_index].contains(lon, lat):
+                assigned.append(owner)
+    return assignments
@@ -0,0 +1,140 @@
+"""Binary cache of parsed refinement inputs, keyed by input content.
+
+Review re-runs refine the same crash data and KMZ as the run they came from,
+with only a few coordinate decisions changed. The first run pickles the
+boundary and a decision-free :class:`RecoveryState` (normalized rows,
+project relevance profile and every row's recovery outcome). The coordinate
+evidence index is written next to it as an :class:`EvidenceStore` file, which
+the pickle references by path and later runs map instead of unpickling. Later
+runs over byte-identical inputs load that instead of parsing the spreadsheet
+and KMZ again, and recompute only the rows their review decisions touch.
+Evidence from the cross-run library is snapshotted at first parse, so review
+re-runs see the same suggestions as the run being reviewed.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Tuple
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+from .coordinate_recovery import RecoveryState, build_recovery_state, prepare_recovery_inputs
+from .evidence_library import EvidenceLibrary
+from .geo import Boundary, load_kmz_boundary
+from .output_manifest import file_sha256
+from .spreadsheets import read_spreadsheet
+
+
+# Bump when the cached structures or the parsing that produces them change.
+_CACHE_FORMAT = 6
+_CACHE_SUFFIX = ".parsed.pickle"
+_EVIDENCE_SUFFIX = ".evidence"
+
+
+@dataclass(frozen=True)
+class ParsedInputs:
+    boundary: Boundary
+    recovery_state: RecoveryState
+
+
+def input_cache_key(
+    data_path: Path,
+    kmz_path: Path,
+    *,
+    lat_column: str,
+    lon_column: str,
+    evidence_library: EvidenceLibrary | None = None,
+) -> str:
+    digest = hashlib.sha256(f"parsed-inputs:{_CACHE_FORMAT}".encode("utf-8"))
+    digest.update(file_sha256(data_path).encode("ascii"))
+    digest.update(file_sha256(kmz_path).encode("ascii"))
+    library = str(evidence_library.path) if evidence_library is not None else None
+    digest.update(json.dumps([lat_column, lon_column, library]).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def parse_inputs(
+    data_path: Path,
+    kmz_path: Path,
+    *,
+    lat_column: str,
+    lon_column: str,
+    evidence_library: EvidenceLibrary | None = None,
+) -> ParsedInputs:
+    boundary = load_kmz_boundary(str(kmz_path))
+    data = read_spreadsheet(str(data_path))
+    recovery_inputs = prepare_recovery_inputs(data.rows, latitude_column=lat_column, longitude_column=lon_column)
+    if evidence_library is not None:
+        recovery_inputs = evidence_library.attach(recovery_inputs)
+    return ParsedInputs(boundary=boundary, recovery_state=build_recovery_state(recovery_inputs, boundary=boundary))
+
+
+def load_parsed_inputs(
+    data_path: Path,
+    kmz_path: Path,
+    *,
+    lat_column: str,
+    lon_column: str,
+    cache_dir: Path | None = None,
+    evidence_library: EvidenceLibrary | None = None,
+) -> Tuple[ParsedInputs, bool]:
+    """Return ``(parsed inputs, loaded_from_cache)``.
+
+    Without *cache_dir* the inputs are always parsed. Otherwise a cache entry
+    for identical file contents and coordinate columns is reused, and a fresh
+    parse is stored for the next run. Unreadable entries are parsed again.
+    Fresh parses take a snapshot of *evidence_library* (see
+    :meth:`EvidenceLibrary.attach`).
+    """
+    options = {"lat_column": lat_column, "lon_column": lon_column, "evidence_library": evidence_library}
+    if cache_dir is None:
+        return parse_inputs(data_path, kmz_path, **options), False
+
+    key = input_cache_key(data_path, kmz_path, **options)
+    cache_path = cache_dir / f"{key}{_CACHE_SUFFIX}"
+    evidence_path = cache_dir / f"{key}{_EVIDENCE_SUFFIX}"
+    try:
+        with cache_path.open("rb") as handle:
+            cached = pickle.load(handle)
+    except FileNotFoundError:
+        cached = None
+    except Exception:
+        # Truncated or written by an incompatible version; replace it below.
+        cached = None
+    if isinstance(cached, ParsedInputs):
+        os.utime(cache_path)
+        os.utime(evidence_path)
+        return cached, True
+
+    parsed = parse_inputs(data_path, kmz_path, **options)
+    state = parsed.recovery_state
+    evidence = state.inputs.evidence.save(evidence_path)
+    parsed = replace(parsed, recovery_state=replace(state, inputs=replace(state.inputs, evidence=evidence)))
+    with tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".tmp", delete=False) as handle:
+        pickle.dump(parsed, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(handle.name, cache_path)
+    return parsed, False
+
+
+def prune_input_cache(cache_dir: Path, *, max_age: timedelta) -> int:
+    """Delete cache entries not used within *max_age*; returns how many were removed."""
+    if not cache_dir.is_dir():
+        return 0
+    cutoff = (datetime.now(timezone.utc) - max_age).timestamp()
+    removed = 0
+    for path in cache_dir.iterdir():
+        if not path.name.endswith((_CACHE_SUFFIX, _EVIDENCE_SUFFIX, ".tmp")):
+            continue
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            continue
+    return removed
@@ -3,15 +3,15 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Iterable, Sequence, Tuple
+from typing import Any, Iterable, Sequence, Tuple
 
-from .geo import PolygonBoundary
+from .geo import Boundary, MultiPolygonBoundary
 
 
 def write_map_report(
     path: str,
     *,
-    polygon: PolygonBoundary,
+    polygon: Boundary,
     points: Iterable[Tuple[float, float]],
     included_count: int,
     excluded_count: int,
@@ -34,7 +34,9 @@ def write_map_report(
     Path(path).write_text(html, encoding="utf-8")
 
 
-def _polygon_to_leaflet(polygon: PolygonBoundary) -> Sequence[Sequence[Sequence[float]]]:
+def _polygon_to_leaflet(polygon: Boundary) -> Sequence[Any]:
+    if isinstance(polygon, MultiPolygonBoundary):
+        return [_polygon_to_leaflet(part) for part in polygon.parts]
     outer = [[lat, lon] for lon, lat in polygon.outer]
     holes = [[[lat, lon] for lon, lat in ring] for ring in polygon.holes]
     if holes:
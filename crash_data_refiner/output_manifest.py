@@ -0,0 +1,102 @@
+"""Sidecar manifests recorded next to written output files.
+
+Each manifest captures the row count, byte size and SHA-256 of one output at
+the moment it was written, so validation and status views can report counts
+without parsing the file again.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Optional
+
+import hashlib
+import io
+import json
+
+from .output_paths import output_manifest_path
+
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+@dataclass(frozen=True)
+class OutputManifest:
+    rows: int
+    bytes: int
+    sha256: str
+    mtime_ns: int
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class HashingWriter(io.RawIOBase):
+    """Write-only stream that hashes every byte on its way to *handle*.
+
+    It is deliberately not seekable, so writers such as :mod:`zipfile` emit
+    the file strictly in order and :attr:`sha256` ends up equal to
+    :func:`file_sha256` of the finished file without reading it back.
+    """
+
+    def __init__(self, handle: BinaryIO) -> None:
+        super().__init__()
+        self._handle = handle
+        self._digest = hashlib.sha256()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self._digest.update(data)
+        self._handle.write(data)
+        return len(data)
+
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
+
+def write_output_manifest(path: Path, *, rows: int, sha256: str | None = None) -> OutputManifest:
+    """Record *rows* for the freshly written *path* in its sidecar manifest."""
+    stat = path.stat()
+    manifest = OutputManifest(
+        rows=rows,
+        bytes=stat.st_size,
+        sha256=sha256 or file_sha256(path),
+        mtime_ns=stat.st_mtime_ns,
+    )
+    output_manifest_path(path).write_text(json.dumps(asdict(manifest)), encoding="utf-8")
+    return manifest
+
+
+def read_output_manifest(path: Path) -> Optional[OutputManifest]:
+    """Return the manifest for *path*, or ``None`` when it is missing or stale.
+
+    A manifest is stale when the file's size or modification time no longer
+    matches what was recorded.
+    """
+    manifest_path = output_manifest_path(path)
+    try:
+        payload = json.loads(manifest_path.read_text(encoding="utf-8"))
+        manifest = OutputManifest(
+            rows=int(payload["rows"]),
+            bytes=int(payload["bytes"]),
+            sha256=str(payload["sha256"]),
+            mtime_ns=int(payload["mtime_ns"]),
+        )
+        stat = path.stat()
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if stat.st_size != manifest.bytes or stat.st_mtime_ns != manifest.mtime_ns:
+        return None
+    return manifest
+
+
+def remove_output_manifest(path: Path) -> None:
+    output_manifest_path(path).unlink(missing_ok=True)
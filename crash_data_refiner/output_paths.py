@@ -40,3 +40,8 @@ def kmz_output_path(output_path: Path) -> Path:
     if base_name.lower().endswith("_refined"):
         base_name = base_name[:-8]
     return output_path.with_name(f"{base_name}_Crash Data.kmz")
+
+
+def output_manifest_path(output_path: Path) -> Path:
+    """Return the hidden sidecar manifest path recorded for *output_path*."""
+    return output_path.with_name(f".{output_path.name}.manifest.json")
@@ -1,19 +1,38 @@
 """Shared refinement and relabel orchestration helpers."""
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field, replace
+from multiprocessing import get_context
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple
 
 from .coordinate_recovery import (
     CoordinateReviewDecision,
     CoordinateRecoveryReport,
+    RecoveryInputs,
+    apply_review_decisions,
     load_coordinate_review_decisions,
-    recover_missing_coordinates,
+    prepare_recovery_inputs,
+    recover_prepared_coordinates,
+    recovery_results,
 )
-from .geo import BoundaryFilterReport, load_kmz_polygon
+from .evidence_library import EvidenceLibrary
+from .geo import (
+    Boundary,
+    BoundaryFilterReport,
+    MultiPolygonBoundary,
+    assign_points_to_boundaries,
+    is_usable_coordinate_pair,
+    load_kmz_boundary,
+    parse_coordinate,
+)
+from .input_cache import load_parsed_inputs
 from .kmz_report import write_kmz_report
 from .labeling import order_and_number_rows, resolve_label_order
+from .output_manifest import remove_output_manifest, write_output_manifest
 from .output_paths import (
     coordinate_review_output_path,
     invalid_output_path,
@@ -22,8 +41,13 @@ from .output_paths import (
     rejected_review_output_path,
 )
 from .normalize import guess_lat_lon_columns
-from .refiner import CrashDataRefiner, RefinementReport
-from .spreadsheets import read_spreadsheet, read_spreadsheet_headers, write_spreadsheet
+from .refiner import (
+    CrashDataRefiner,
+    RefinementReport,
+    StandardizationCacheStats,
+    standardization_cache_stats,
+)
+from .spreadsheets import open_spreadsheet, read_spreadsheet, read_spreadsheet_headers, write_spreadsheet
 
 
 @dataclass
@@ -48,6 +72,14 @@ class RefinementResult:
     log: List[str] = field(default_factory=list)
 
 
+@dataclass
+class BatchRefinementResult:
+    """Collects the per-project results produced by :func:`run_batch_refinement_pipeline`."""
+
+    projects: Dict[str, RefinementResult]
+    log: List[str] = field(default_factory=list)
+
+
 @dataclass
 class RelabelResult:
     """Collect the outputs produced by relabeling an existing refined output."""
@@ -73,10 +105,100 @@ def build_output_headers(rows: List[Dict[str, Any]]) -> List[str]:
 
 
 def _count_rows(path: Path) -> int:
+    """Count the rows actually in *path*; manifests are not trusted for validation."""
     if not path.exists():
         return 0
-    data = read_spreadsheet(str(path))
-    return len(data.rows)
+    return open_spreadsheet(str(path)).count()
+
+
+# Outputs at least this large are written in worker processes; smaller ones
+# are cheaper to write on a thread than to pickle across a process boundary.
+_PROCESS_WRITER_MIN_ROWS = 20000
+_OUTPUT_WRITER_MAX_WORKERS = 4
+
+
+@dataclass(frozen=True)
+class _OutputJob:
+    """One independent output file written by the pipeline's writer stage."""
+
+    label: str
+    path: Path
+    write: Callable[..., Any]
+    args: Tuple[Any, ...]
+    rows: int
+    count_label: str = ""
+
+
+def _write_spreadsheet_output(path: str, rows: Sequence[Mapping[str, Any]], headers: Optional[List[str]]) -> None:
+    write_spreadsheet(path, rows, headers=headers, manifest=True)
+
+
+def _write_kmz_output(
+    path: str,
+    rows: Sequence[Mapping[str, Any]],
+    lat_column: str,
+    lon_column: str,
+    label_order: str,
+) -> int:
+    kmz_count = write_kmz_report(
+        path,
+        rows=rows,
+        latitude_column=lat_column,
+        longitude_column=lon_column,
+        label_order=label_order,
+    )
+    write_output_manifest(Path(path), rows=kmz_count)
+    return kmz_count
+
+
+def _timed_write(write: Callable[..., Any], args: Tuple[Any, ...]) -> Tuple[Any, float]:
+    started = time.perf_counter()
+    result = write(*args)
+    return result, time.perf_counter() - started
+
+
+def _write_outputs(jobs: Sequence[_OutputJob], log: List[str]) -> Dict[Path, Any]:
+    """Write independent outputs concurrently and log each one's timing.
+
+    Small outputs share a bounded thread pool. Outputs with at least
+    ``_PROCESS_WRITER_MIN_ROWS`` rows go to spawned worker processes so XLSX
+    serialization is not serialized on the GIL. Results are keyed by path.
+    """
+    large_jobs = sum(1 for job in jobs if job.rows >= _PROCESS_WRITER_MIN_ROWS)
+    started = time.perf_counter()
+    with ExitStack() as stack:
+        threads = stack.enter_context(
+            ThreadPoolExecutor(
+                max_workers=max(1, min(len(jobs), _OUTPUT_WRITER_MAX_WORKERS)),
+                thread_name_prefix="cdr-output",
+            )
+        )
+        processes = None
+        if large_jobs:
+            processes = stack.enter_context(
+                ProcessPoolExecutor(
+                    max_workers=min(large_jobs, _OUTPUT_WRITER_MAX_WORKERS),
+                    mp_context=get_context("spawn"),
+                )
+            )
+        futures = [
+            (
+                job,
+                (processes if processes is not None and job.rows >= _PROCESS_WRITER_MIN_ROWS else threads).submit(
+                    _timed_write, job.write, job.args
+                ),
+            )
+            for job in jobs
+        ]
+        timed_results = [(job, future.result()) for job, future in futures]
+
+    results: Dict[Path, Any] = {}
+    for job, (result, elapsed) in timed_results:
+        results[job.path] = result
+        detail = f"{result} {job.count_label}, " if job.count_label else ""
+        log.append(f"{job.label}: {job.path.name} ({detail}{elapsed:.2f}s)")
+    log.append(f"Output writer stage finished in {time.perf_counter() - started:.2f}s.")
+    return results
 
 
 def _validate_pipeline_outputs(
@@ -130,15 +252,40 @@ def run_refinement_pipeline(
     label_order: str = "auto",
     coordinate_review_path: Path | None = None,
     review_decisions: Mapping[str, CoordinateReviewDecision] | None = None,
+    input_cache_dir: Path | None = None,
+    evidence_library: EvidenceLibrary | None = None,
 ) -> RefinementResult:
-    """Execute the full crash-data refinement pipeline."""
-    log: List[str] = []
+    """Execute the full crash-data refinement pipeline.
 
-    boundary = load_kmz_polygon(str(kmz_path))
-    log.append("Loaded KMZ boundary polygon.")
+    With *input_cache_dir*, the parsed crash data, evidence index, relevance
+    profile, boundary and decision-free recovery outcomes are reused from an
+    earlier run over identical inputs (see :mod:`crash_data_refiner.input_cache`),
+    and only rows addressed by review decisions are recovered again.
 
-    data = read_spreadsheet(str(data_path))
-    log.append(f"Loaded {len(data.rows)} crash rows.")
+    With *evidence_library*, recovery also draws on coordinates recorded by
+    earlier runs, and this run's located rows are added to the library.
+    """
+    log: List[str] = []
+    cache_baseline = standardization_cache_stats()
+
+    parsed, from_cache = load_parsed_inputs(
+        data_path,
+        kmz_path,
+        lat_column=lat_column,
+        lon_column=lon_column,
+        cache_dir=input_cache_dir,
+        evidence_library=evidence_library,
+    )
+    boundary = parsed.boundary
+    log.append(_describe_boundary(boundary))
+    source = " from the parsed-input cache" if from_cache else ""
+    log.append(f"Loaded {len(parsed.recovery_state.inputs.rows)} crash rows{source}.")
+    if evidence_library is not None:
+        _log_evidence_library(
+            log,
+            parsed.recovery_state.inputs,
+            added=None if from_cache else evidence_library.record(parsed.recovery_state.inputs),
+        )
 
     resolved_review_decisions: Dict[str, CoordinateReviewDecision] = dict(review_decisions or {})
     if coordinate_review_path is not None:
@@ -151,13 +298,152 @@ def run_refinement_pipeline(
     elif resolved_review_decisions:
         log.append(f"Loaded {len(resolved_review_decisions)} browser review decision(s).")
 
-    prepared_rows, coordinate_review_rows, recovery_report = recover_missing_coordinates(
-        data.rows,
-        latitude_column=lat_column,
-        longitude_column=lon_column,
+    recovery_state = apply_review_decisions(parsed.recovery_state, resolved_review_decisions)
+    if resolved_review_decisions:
+        log.append(f"Re-evaluated {recovery_state.recomputed_rows} row(s) addressed by review decisions.")
+    prepared_rows, coordinate_review_rows, recovery_report = recovery_results(recovery_state)
+    return _refine_recovered_rows(
+        prepared_rows,
+        coordinate_review_rows=coordinate_review_rows,
+        recovery_report=recovery_report,
         boundary=boundary,
-        review_decisions=resolved_review_decisions,
+        data_name=data_path.name,
+        run_dir=run_dir,
+        lat_column=lat_column,
+        lon_column=lon_column,
+        label_order=label_order,
+        log=log,
+        cache_baseline=cache_baseline,
     )
+
+
+def run_batch_refinement_pipeline(
+    *,
+    data_path: Path,
+    kmz_paths: Sequence[Path],
+    output_dir: Path,
+    lat_column: str,
+    lon_column: str,
+    label_order: str = "auto",
+    evidence_library: EvidenceLibrary | None = None,
+) -> BatchRefinementResult:
+    """Refine one crash extract against many project boundaries in a single pass.
+
+    The crash data is read, normalized and indexed for coordinate recovery once.
+    Rows with usable coordinates are assigned to every containing project through
+    a shared spatial index of all boundaries. Each project then refines only its
+    own rows plus the rows that still need coordinate recovery, and writes the
+    usual outputs under ``output_dir / <kmz stem>``. Each project's reports
+    equal those of :func:`run_refinement_pipeline` on the same KMZ.
+    """
+    if not kmz_paths:
+        raise ValueError("At least one KMZ boundary is required for a batch run.")
+    log: List[str] = []
+    project_names = _batch_project_names(kmz_paths)
+    boundaries = [load_kmz_boundary(str(path)) for path in kmz_paths]
+    log.append(f"Loaded {len(boundaries)} project boundaries.")
+
+    data = read_spreadsheet(str(data_path))
+    log.append(f"Loaded {len(data.rows)} crash rows.")
+    inputs = prepare_recovery_inputs(data.rows, latitude_column=lat_column, longitude_column=lon_column)
+    if evidence_library is not None:
+        inputs = evidence_library.attach(inputs)
+        _log_evidence_library(log, inputs, added=evidence_library.record(inputs))
+
+    located_indexes: List[int] = []
+    lons: List[float] = []
+    lats: List[float] = []
+    for index, row in enumerate(inputs.rows):
+        lat = parse_coordinate(row.get(inputs.lat_key))
+        lon = parse_coordinate(row.get(inputs.lon_key))
+        if is_usable_coordinate_pair(lat, lon):
+            located_indexes.append(index)
+            lons.append(lon)
+            lats.append(lat)
+    assignments = assign_points_to_boundaries(lons, lats, boundaries)
+    log.append(
+        f"Assigned {sum(1 for owners in assignments if owners)} of {len(located_indexes)} located "
+        f"crash rows to at least one of {len(boundaries)} projects."
+    )
+
+    projects: Dict[str, RefinementResult] = {}
+    for owner, (name, boundary) in enumerate(zip(project_names, boundaries)):
+        cache_baseline = standardization_cache_stats()
+        inside_boundary: List[Optional[bool]] = [None] * len(inputs.rows)
+        for row_index, owners in zip(located_indexes, assignments):
+            inside_boundary[row_index] = owner in owners
+        prepared_rows, coordinate_review_rows, recovery_report = recover_prepared_coordinates(
+            inputs,
+            boundary=boundary,
+            inside_boundary=inside_boundary,
+        )
+        project_rows = [row for row, inside in zip(prepared_rows, inside_boundary) if inside is not False]
+        result = _refine_recovered_rows(
+            project_rows,
+            coordinate_review_rows=coordinate_review_rows,
+            recovery_report=recovery_report,
+            boundary=boundary,
+            data_name=data_path.name,
+            run_dir=output_dir / name,
+            lat_column=lat_column,
+            lon_column=lon_column,
+            label_order=label_order,
+            log=[f"Batch project {name}: {_describe_boundary(boundary)}"],
+            cache_baseline=cache_baseline,
+            outside_rows=len(prepared_rows) - len(project_rows),
+        )
+        projects[name] = result
+        log.append(
+            f"{name}: {result.boundary_report.included_rows} included, "
+            f"{len(result.coordinate_review_rows)} queued for review."
+        )
+
+    return BatchRefinementResult(projects=projects, log=log)
+
+
+def _log_evidence_library(log: List[str], inputs: RecoveryInputs, *, added: Optional[int]) -> None:
+    supplied = len(inputs.library_evidence) if inputs.library_evidence is not None else 0
+    log.append(f"Evidence library supplied past-run coordinates for {supplied} location fingerprint(s).")
+    if added is not None:
+        log.append(f"Recorded {added} new coordinate observation(s) in the evidence library.")
+
+
+def _batch_project_names(kmz_paths: Sequence[Path]) -> List[str]:
+    names: List[str] = []
+    used: Set[str] = set()
+    for path in kmz_paths:
+        stem = Path(path).stem or "project"
+        name, suffix = stem, 1
+        # A literal stem such as "a_2" may already hold the next suffixed name.
+        while name in used:
+            suffix += 1
+            name = f"{stem}_{suffix}"
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def _describe_boundary(boundary: Boundary) -> str:
+    if isinstance(boundary, MultiPolygonBoundary):
+        return f"Loaded KMZ boundary with {len(boundary.parts)} polygons."
+    return "Loaded KMZ boundary polygon."
+
+
+def _refine_recovered_rows(
+    prepared_rows: List[Dict[str, Any]],
+    *,
+    coordinate_review_rows: List[Dict[str, Any]],
+    recovery_report: CoordinateRecoveryReport,
+    boundary: Boundary,
+    data_name: str,
+    run_dir: Path,
+    lat_column: str,
+    lon_column: str,
+    label_order: str,
+    log: List[str],
+    cache_baseline: Mapping[str, StandardizationCacheStats],
+    outside_rows: int = 0,
+) -> RefinementResult:
     if recovery_report.missing_rows:
         auto_recovered = max(recovery_report.recovered_rows - recovery_report.approved_rows, 0)
         log.append(
@@ -181,6 +467,16 @@ def run_refinement_pipeline(
         latitude_column=lat_column,
         longitude_column=lon_column,
     )
+    if outside_rows:
+        # Batch runs drop rows the shared index already placed outside this
+        # project, so add them back as excluded to match a single-KMZ run. The
+        # refinement report needs no patch: in both runs it covers only the
+        # rows inside the boundary.
+        boundary_report = replace(
+            boundary_report,
+            total_rows=boundary_report.total_rows + outside_rows,
+            excluded_rows=boundary_report.excluded_rows + outside_rows,
+        )
     rejected_review_rows = [
         row for row in invalid_rows
         if str(row.get("coordinate_recovery_status") or "") == "review_rejected"
@@ -213,34 +509,42 @@ def run_refinement_pipeline(
         f"{boundary_report.excluded_rows} excluded, "
         f"{boundary_report.invalid_rows} invalid."
     )
+    for column, date_format in report.date_formats.items():
+        log.append(f"Date column {column} parsed as {date_format}.")
 
-    out_path = refined_output_path(run_dir, data_path.name)
+    out_path = refined_output_path(run_dir, data_name)
     run_dir.mkdir(parents=True, exist_ok=True)
     output_headers = build_output_headers(refined_rows)
-    write_spreadsheet(str(out_path), refined_rows, headers=output_headers)
-    log.append(f"Refined output saved: {out_path.name}")
-
     inv_path = invalid_output_path(out_path)
-    write_spreadsheet(str(inv_path), invalid_rows)
-    log.append(f"Invalid coordinate output saved: {inv_path.name}")
-
     rejected_path = rejected_review_output_path(out_path)
-    write_spreadsheet(str(rejected_path), rejected_review_rows)
-    log.append(f"Excluded crash review output saved: {rejected_path.name}")
-
     review_path = coordinate_review_output_path(out_path)
-    write_spreadsheet(str(review_path), coordinate_review_rows)
-    log.append(f"Coordinate review output saved: {review_path.name}")
-
     kmz_out = kmz_output_path(out_path)
-    kmz_count = write_kmz_report(
-        str(kmz_out),
-        rows=refined_rows,
-        latitude_column=lat_column,
-        longitude_column=lon_column,
-        label_order=resolved_label_order,
-    )
-    log.append(f"KMZ report generated: {kmz_out.name} ({kmz_count} placemarks)")
+    kmz_count = _write_outputs(
+        [
+            _OutputJob(
+                "Refined output saved", out_path, _write_spreadsheet_output,
+                (str(out_path), refined_rows, output_headers), len(refined_rows),
+            ),
+            _OutputJob(
+                "Invalid coordinate output saved", inv_path, _write_spreadsheet_output,
+                (str(inv_path), invalid_rows, None), len(invalid_rows),
+            ),
+            _OutputJob(
+                "Excluded crash review output saved", rejected_path, _write_spreadsheet_output,
+                (str(rejected_path), rejected_review_rows, None), len(rejected_review_rows),
+            ),
+            _OutputJob(
+                "Coordinate review output saved", review_path, _write_spreadsheet_output,
+                (str(review_path), coordinate_review_rows, None), len(coordinate_review_rows),
+            ),
+            _OutputJob(
+                "KMZ report generated", kmz_out, _write_kmz_output,
+                (str(kmz_out), refined_rows, lat_column, lon_column, resolved_label_order), len(refined_rows),
+                count_label="placemarks",
+            ),
+        ],
+        log,
+    )[kmz_out]
 
     _validate_pipeline_outputs(
         refined_path=out_path,
@@ -254,6 +558,8 @@ def run_refinement_pipeline(
         kmz_count=kmz_count,
     )
     log.append("Output invariants validated against the written files.")
+    for name, stats in standardization_cache_stats().items():
+        log.append(stats.since(cache_baseline[name]).describe())
 
     return RefinementResult(
         refined_rows=refined_rows,
@@ -300,7 +606,7 @@ def relabel_refined_outputs(
         label_order=resolved_label_order,
     )
     headers = build_output_headers(relabeled_rows)
-    write_spreadsheet(str(refined_path), relabeled_rows, headers=headers)
+    write_spreadsheet(str(refined_path), relabeled_rows, headers=headers, manifest=True)
     kmz_count = write_kmz_report(
         str(kmz_path),
         rows=relabeled_rows,
@@ -308,6 +614,7 @@ def relabel_refined_outputs(
         longitude_column=lon_column,
         label_order=resolved_label_order,
     )
+    write_output_manifest(kmz_path, rows=kmz_count)
 
     actual_refined_rows = _count_rows(refined_path)
     if actual_refined_rows != len(relabeled_rows):
@@ -323,6 +630,7 @@ def relabel_refined_outputs(
     for path in remove_output_paths or []:
         if path.exists():
             path.unlink()
+            remove_output_manifest(path)
             removed_outputs.append(path)
 
     return RelabelResult(
@@ -343,6 +651,7 @@ def load_headers_and_guess_columns(
     lat_guess, lon_guess = guess_lat_lon_columns(headers)
     return headers, lat_guess, lon_guess
 __all__ = [
+    "BatchRefinementResult",
     "RefinementResult",
     "RelabelResult",
     "build_output_headers",
@@ -353,5 +662,6 @@ __all__ = [
     "refined_output_path",
     "rejected_review_output_path",
     "relabel_refined_outputs",
+    "run_batch_refinement_pipeline",
     "run_refinement_pipeline",
 ]
@@ -6,12 +6,14 @@ transforming crash data sets into a consistent, analysis-friendly format.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import date, datetime, time
 from collections import Counter
+from functools import lru_cache
+import json
 import re
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
 
-from .geo import BoundaryFilterReport, PolygonBoundary, parse_coordinate, point_in_polygon
+from .geo import Boundary, BoundaryFilterReport, MultiPolygonBoundary, locate_points, parse_coordinate
 from .normalize import is_blank_row, normalize_header
 
 
@@ -24,6 +26,15 @@ _DATE_FORMATS: Sequence[str] = (
     "%m/%d/%Y %H:%M:%S",
     "%d-%b-%Y",
 )
+# Real datasets only carry a few thousand distinct route and crash-type strings,
+# so a bounded memo in front of the regex-heavy standardizers pays for itself.
+_STANDARDIZATION_CACHE_SIZE = 16384
+
+
+_ISO_DATE_FORMAT = "ISO-8601"
+_NATIVE_DATE_FORMAT = "native datetime"
+_DATE_ONLY_FORMATS = {"%Y-%m-%d", "%m/%d/%Y", "%d-%b-%Y"}
+_DATE_FORMAT_SAMPLE_SIZE = 20
 
 
 def _parse_date(value: str) -> Optional[str]:
@@ -38,12 +49,16 @@ def _parse_date(value: str) -> Optional[str]:
     text = value.strip()
     if not text:
         return None
+    return _parse_date_text(text)[0]
+
 
+def _parse_date_text(text: str) -> Tuple[str, Optional[str]]:
+    """Parse stripped *text* and return ``(result, matched_format)``."""
     # If the string is already ISO-8601-ish we accept it as-is to avoid
     # unnecessary parsing failures.
     iso_match = re.fullmatch(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2})?)?", text)
     if iso_match:
-        return text.replace("T", " ")
+        return text.replace("T", " "), _ISO_DATE_FORMAT
 
     for fmt in _DATE_FORMATS:
         try:
@@ -51,11 +66,148 @@ def _parse_date(value: str) -> Optional[str]:
         except ValueError:
             continue
         else:
-            # When only a date is provided we emit the canonical YYYY-MM-DD form.
-            if fmt == "%Y-%m-%d" or fmt == "%m/%d/%Y" or fmt == "%d-%b-%Y":
-                return parsed.strftime("%Y-%m-%d")
-            return parsed.strftime("%Y-%m-%d %H:%M:%S")
-    return text
+            return _format_parsed_date(parsed, fmt), fmt
+    return text, None
+
+
+def _format_parsed_date(parsed: datetime, fmt: str) -> str:
+    # When only a date is provided we emit the canonical YYYY-MM-DD form.
+    if fmt in _DATE_ONLY_FORMATS:
+        return parsed.strftime("%Y-%m-%d")
+    return parsed.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _format_native_date(value: date) -> str:
+    if not isinstance(value, datetime):
+        return value.isoformat()
+    if value.tzinfo is None and value.time() == time.min:
+        return value.date().isoformat()
+    return value.isoformat(sep=" ", timespec="seconds")
+
+
+def _fast_parse_iso_date(text: str) -> Optional[str]:
+    length = len(text)
+    if length not in (10, 16, 19) or text[4] != "-" or text[7] != "-":
+        return None
+    digits = text[0:4] + text[5:7] + text[8:10]
+    if length > 10:
+        if text[10] not in "T " or text[13] != ":":
+            return None
+        digits += text[11:13] + text[14:16]
+        if length == 19:
+            if text[16] != ":":
+                return None
+            digits += text[17:19]
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+    return text.replace("T", " ")
+
+
+def _fast_parse_us_date(text: str) -> Optional[str]:
+    date_part, _separator, time_part = text.partition(" ")
+    date_fields = date_part.split("/")
+    if len(date_fields) != 3:
+        return None
+    month, day, year = date_fields
+    if not (1 <= len(month) <= 2 and 1 <= len(day) <= 2 and len(year) == 4):
+        return None
+    time_fields = time_part.split(":") if time_part else []
+    if time_part and len(time_fields) not in (2, 3):
+        return None
+    if any(not 1 <= len(item) <= 2 for item in time_fields):
+        return None
+    digits = month + day + year + "".join(time_fields)
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+    try:
+        parsed = datetime(int(year), int(month), int(day), *(int(item) for item in time_fields))
+    except ValueError:
+        return None
+    if parsed.year < 1000:
+        return None
+    if not time_fields:
+        return f"{parsed.year:04d}-{parsed.month:02d}-{parsed.day:02d}"
+    return (
+        f"{parsed.year:04d}-{parsed.month:02d}-{parsed.day:02d} "
+        f"{parsed.hour:02d}:{parsed.minute:02d}:{parsed.second:02d}"
+    )
+
+
+def _locked_strptime_parser(fmt: str) -> Callable[[str], Optional[str]]:
+    def _parse(text: str) -> Optional[str]:
+        try:
+            parsed = datetime.strptime(text, fmt)
+        except ValueError:
+            return None
+        return _format_parsed_date(parsed, fmt)
+
+    return _parse
+
+
+_FAST_DATE_PARSERS: Dict[str, Callable[[str], Optional[str]]] = {
+    _ISO_DATE_FORMAT: _fast_parse_iso_date,
+    "%m/%d/%Y": _fast_parse_us_date,
+    "%m/%d/%Y %H:%M": _fast_parse_us_date,
+    "%m/%d/%Y %H:%M:%S": _fast_parse_us_date,
+}
+
+
+class _DateColumnParser:
+    """Parse one date column, locking onto its dominant format after sampling.
+
+    The first parseable values go through the full format loop and vote for the
+    format they matched. Once the sample is complete the parser switches to a
+    fast path for the winning format and only falls back to the full loop for
+    outliers the fast path rejects. Spreadsheet ``datetime`` cells bypass
+    string parsing entirely.
+    """
+
+    def __init__(self) -> None:
+        self.votes: Counter[str] = Counter()
+        self.locked_format: Optional[str] = None
+        self._fast_parse: Optional[Callable[[str], Optional[str]]] = None
+
+    @property
+    def chosen_format(self) -> Optional[str]:
+        if self.locked_format is not None:
+            return self.locked_format
+        if self.votes:
+            return self.votes.most_common(1)[0][0]
+        return None
+
+    def parse(self, value: Any) -> Optional[str]:
+        if value is None:
+            return None
+        if isinstance(value, date):
+            self._vote(_NATIVE_DATE_FORMAT)
+            return _format_native_date(value)
+        text = str(value).strip()
+        if not text:
+            return None
+        if self.locked_format is not None:
+            if self._fast_parse is not None:
+                parsed = self._fast_parse(text)
+                if parsed is not None:
+                    return parsed
+            return _parse_date_text(text)[0]
+        parsed, fmt = _parse_date_text(text)
+        if fmt is not None:
+            self._vote(fmt)
+        return parsed
+
+    def _vote(self, fmt: str) -> None:
+        if self.locked_format is not None:
+            return
+        self.votes[fmt] += 1
+        if sum(self.votes.values()) < _DATE_FORMAT_SAMPLE_SIZE:
+            return
+        self.locked_format = self.votes.most_common(1)[0][0]
+        if self.locked_format == _NATIVE_DATE_FORMAT:
+            self._fast_parse = None
+        else:
+            self._fast_parse = _FAST_DATE_PARSERS.get(self.locked_format) or _locked_strptime_parser(
+                self.locked_format
+            )
 
 
 def _coerce_numeric(value: str, numeric_type: type) -> Optional[float]:
@@ -222,22 +374,23 @@ def _is_route_number(tokens: List[str]) -> bool:
     return any(_is_numeric_token(token) for token in tokens)
 
 
-def _preferred_route_suffixes(rows: Iterable[Dict[str, Any]]) -> Dict[str, str]:
-    suffix_counts: Dict[str, Counter[str]] = {}
-    for row in rows:
-        for column in _ROUTE_COLUMNS:
-            value = row.get(column)
-            if value is None or not isinstance(value, str):
-                continue
-            tokens = value.split()
-            if not tokens or _is_route_number(tokens):
-                continue
-            if tokens[-1] not in _ROUTE_SUFFIX_TOKENS:
-                continue
-            base = " ".join(tokens[:-1]).strip()
-            if not base:
-                continue
-            suffix_counts.setdefault(base, Counter())[tokens[-1]] += 1
+def _count_route_suffixes(row: Mapping[str, Any], suffix_counts: Dict[str, Counter[str]]) -> None:
+    for column in _ROUTE_COLUMNS:
+        value = row.get(column)
+        if value is None or not isinstance(value, str):
+            continue
+        tokens = value.split()
+        if not tokens or _is_route_number(tokens):
+            continue
+        if tokens[-1] not in _ROUTE_SUFFIX_TOKENS:
+            continue
+        base = " ".join(tokens[:-1]).strip()
+        if not base:
+            continue
+        suffix_counts.setdefault(base, Counter())[tokens[-1]] += 1
+
+
+def _select_preferred_suffixes(suffix_counts: Mapping[str, Counter[str]]) -> Dict[str, str]:
     preferred: Dict[str, str] = {}
     for base, counts in suffix_counts.items():
         if len(counts) == 1:
@@ -245,28 +398,59 @@ def _preferred_route_suffixes(rows: Iterable[Dict[str, Any]]) -> Dict[str, str]:
     return preferred
 
 
+def _preferred_route_suffixes(rows: Iterable[Dict[str, Any]]) -> Dict[str, str]:
+    suffix_counts: Dict[str, Counter[str]] = {}
+    for row in rows:
+        _count_route_suffixes(row, suffix_counts)
+    return _select_preferred_suffixes(suffix_counts)
+
+
+def _apply_preferred_suffixes(row: Dict[str, Any], preferred: Mapping[str, str]) -> None:
+    for column in _ROUTE_COLUMNS:
+        value = row.get(column)
+        if value is None or not isinstance(value, str):
+            continue
+        tokens = value.split()
+        if not tokens or _is_route_number(tokens):
+            continue
+        if tokens[-1] in _ROUTE_SUFFIX_TOKENS:
+            continue
+        base = " ".join(tokens).strip()
+        suffix = preferred.get(base)
+        if suffix:
+            row[column] = f"{base} {suffix}"
+
+
 def _apply_route_suffixes(rows: List[Dict[str, Any]]) -> None:
     preferred = _preferred_route_suffixes(rows)
     if not preferred:
         return
     for row in rows:
-        for column in _ROUTE_COLUMNS:
-            value = row.get(column)
-            if value is None or not isinstance(value, str):
-                continue
-            tokens = value.split()
-            if not tokens or _is_route_number(tokens):
-                continue
-            if tokens[-1] in _ROUTE_SUFFIX_TOKENS:
-                continue
-            base = " ".join(tokens).strip()
-            suffix = preferred.get(base)
-            if suffix:
-                row[column] = f"{base} {suffix}"
+        _apply_preferred_suffixes(row, preferred)
+
+
+def load_route_suffixes(path: str) -> Dict[str, str]:
+    """Load a persisted route-suffix dictionary written by :func:`save_route_suffixes`."""
+    with open(path, "r", encoding="utf-8") as handle:
+        payload = json.load(handle)
+    if not isinstance(payload, dict):
+        raise ValueError("Route suffix dictionary must be a JSON object.")
+    return {str(base): str(suffix) for base, suffix in payload.items()}
+
+
+def save_route_suffixes(path: str, suffixes: Mapping[str, str]) -> None:
+    """Persist a route-suffix dictionary so later streaming runs can reuse it."""
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(dict(sorted(suffixes.items())), handle, indent=2)
 
 def _standardize_crash_type(value: Any) -> Any:
     if value is None or not isinstance(value, str):
         return value
+    return _standardize_crash_type_text(value)
+
+
+@lru_cache(maxsize=_STANDARDIZATION_CACHE_SIZE)
+def _standardize_crash_type_text(value: str) -> str:
     text = value.strip()
     if not text:
         return value
@@ -283,6 +467,11 @@ def _standardize_crash_type(value: Any) -> Any:
 def _standardize_route(value: Any) -> Any:
     if value is None or not isinstance(value, str):
         return value
+    return _standardize_route_text(value)
+
+
+@lru_cache(maxsize=_STANDARDIZATION_CACHE_SIZE)
+def _standardize_route_text(value: str) -> str:
     text = value.strip()
     if not text:
         return value
@@ -320,6 +509,75 @@ def _standardize_route(value: Any) -> Any:
     return " ".join(normalized)
 
 
+@dataclass(frozen=True)
+class StandardizationCacheStats:
+    """Hit/miss counters for one of the shared standardization memo caches."""
+
+    name: str
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def since(self, earlier: "StandardizationCacheStats") -> "StandardizationCacheStats":
+        """Return the lookups recorded after *earlier* was captured."""
+        return StandardizationCacheStats(
+            name=self.name,
+            hits=max(self.hits - earlier.hits, 0),
+            misses=max(self.misses - earlier.misses, 0),
+            size=self.size,
+            max_size=self.max_size,
+        )
+
+    def describe(self) -> str:
+        return (
+            f"{self.name} standardization cache: {self.hits} hit(s), {self.misses} miss(es) "
+            f"({self.hit_rate:.0%} hit rate, {self.size}/{self.max_size} entries)."
+        )
+
+
+def standardization_cache_stats() -> Dict[str, StandardizationCacheStats]:
+    """Return the current statistics of the shared route/crash-type memo caches.
+
+    The caches are process-wide and shared by the refiner and coordinate
+    recovery, so callers that want per-run numbers should capture a snapshot
+    before the run and report :meth:`StandardizationCacheStats.since`.
+    """
+    stats: Dict[str, StandardizationCacheStats] = {}
+    for name, cached in (("route", _standardize_route_text), ("crash type", _standardize_crash_type_text)):
+        info = cached.cache_info()
+        stats[name] = StandardizationCacheStats(
+            name=name,
+            hits=info.hits,
+            misses=info.misses,
+            size=info.currsize,
+            max_size=info.maxsize or 0,
+        )
+    return stats
+
+
+def clear_standardization_caches() -> None:
+    """Drop every memoized route and crash-type standardization."""
+    _standardize_route_text.cache_clear()
+    _standardize_crash_type_text.cache_clear()
+
+
+_MAX_COLUMN_PLANS = 256
+
+# Column added to included rows when the boundary has several polygons.
+BOUNDARY_POLYGON_COLUMN = "boundary_polygon"
+
+
+@lru_cache(maxsize=4096)
+def _cached_normalize_header(header: str) -> str:
+    return normalize_header(header)
+
+
 @dataclass
 class RefinementConfig:
     """Configuration describing how a crash dataset should be cleaned."""
@@ -353,12 +611,151 @@ class RefinementReport:
     coerced_dates: int
     coerced_numbers: int
     coerced_booleans: int
+    date_formats: Dict[str, str] = field(default_factory=dict)
 
     @property
     def output_rows(self) -> int:
         return self.kept_rows
 
 
+@dataclass
+class _RefinementState:
+    total_rows: int = 0
+    kept_rows: int = 0
+    dropped_missing_required: int = 0
+    dropped_duplicates: int = 0
+    coerced_dates: int = 0
+    coerced_numbers: int = 0
+    coerced_booleans: int = 0
+    date_parsers: Dict[str, _DateColumnParser] = field(default_factory=dict)
+
+    def report(self) -> RefinementReport:
+        date_formats = {
+            column: parser.chosen_format
+            for column, parser in self.date_parsers.items()
+            if parser.chosen_format
+        }
+        return RefinementReport(
+            total_rows=self.total_rows,
+            kept_rows=self.kept_rows,
+            dropped_missing_required=self.dropped_missing_required,
+            dropped_duplicates=self.dropped_duplicates,
+            coerced_dates=self.coerced_dates,
+            coerced_numbers=self.coerced_numbers,
+            coerced_booleans=self.coerced_booleans,
+            date_formats=date_formats,
+        )
+
+
+_ColumnOperation = Callable[[Dict[str, Any], str, _RefinementState], None]
+
+
+def _coerce_date_column(row: Dict[str, Any], column: str, state: _RefinementState) -> None:
+    parser = state.date_parsers.get(column)
+    if parser is None:
+        parser = state.date_parsers[column] = _DateColumnParser()
+    original = row.get(column)
+    parsed = parser.parse(original) if original is not None else None
+    if parsed != original and parsed is not None:
+        row[column] = parsed
+        state.coerced_dates += 1
+    elif parsed is None:
+        row[column] = None
+
+
+def _coerce_integer_column(row: Dict[str, Any], column: str, state: _RefinementState) -> None:
+    original = row.get(column)
+    coerced = _coerce_numeric(original, int)
+    if coerced is not None:
+        row[column] = int(coerced)
+        if coerced != original:
+            state.coerced_numbers += 1
+    else:
+        row[column] = None
+
+
+def _coerce_float_column(row: Dict[str, Any], column: str, state: _RefinementState) -> None:
+    original = row.get(column)
+    coerced = _coerce_numeric(original, float)
+    if coerced is not None:
+        row[column] = float(coerced)
+        if coerced != original:
+            state.coerced_numbers += 1
+    else:
+        row[column] = None
+
+
+def _coerce_boolean_column(row: Dict[str, Any], column: str, state: _RefinementState) -> None:
+    original = row.get(column)
+    coerced = _coerce_boolean(original)
+    if coerced is not None:
+        row[column] = coerced
+        if coerced != original:
+            state.coerced_booleans += 1
+    else:
+        row[column] = None
+
+
+def _standardize_crash_type_column(row: Dict[str, Any], column: str, state: _RefinementState) -> None:
+    row[column] = _standardize_crash_type(row.get(column))
+
+
+def _standardize_route_column(row: Dict[str, Any], column: str, state: _RefinementState) -> None:
+    row[column] = _standardize_route(row.get(column))
+
+
+def compile_column_plan(
+    config: RefinementConfig,
+    headers: Iterable[str],
+) -> List[Tuple[str, _ColumnOperation]]:
+    """Flatten a normalized *config* and a dataset's *headers* into per-column ops.
+
+    The plan preserves the refinement order (dates, integers, floats, booleans,
+    then crash-type and route standardization) and resolves column presence
+    once, so each row only runs the operations that actually apply to it.
+    Configured coercion columns always run because they set missing values to
+    ``None``; standardization only runs for columns present after fill defaults
+    and coercion.
+    """
+    present = set(headers)
+    present.update(config.fill_defaults)
+    plan: List[Tuple[str, _ColumnOperation]] = []
+    for columns, operation in (
+        (config.date_columns, _coerce_date_column),
+        (config.integer_columns, _coerce_integer_column),
+        (config.float_columns, _coerce_float_column),
+        (config.boolean_columns, _coerce_boolean_column),
+    ):
+        for column in columns:
+            plan.append((column, operation))
+            present.add(column)
+    plan.extend((column, _standardize_crash_type_column) for column in sorted(_CRASH_TYPE_COLUMNS & present))
+    plan.extend((column, _standardize_route_column) for column in sorted(_ROUTE_COLUMNS & present))
+    return plan
+
+
+class RefinementStream:
+    """Lazily refined rows plus a report that reflects every row consumed so far.
+
+    Iterate the stream to pull refined rows one at a time; read :attr:`report`
+    once iteration finishes to get the totals for the whole dataset.
+    """
+
+    def __init__(self, rows: Iterator[Dict[str, Any]], state: _RefinementState):
+        self._rows = rows
+        self._state = state
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self._rows
+
+    def __next__(self) -> Dict[str, Any]:
+        return next(self._rows)
+
+    @property
+    def report(self) -> RefinementReport:
+        return self._state.report()
+
+
 class CrashDataRefiner:
     """Perform configurable refinement of crash datasets.
 
@@ -368,6 +765,7 @@ class CrashDataRefiner:
 
     def __init__(self, config: RefinementConfig | None = None):
         self.config = (config or RefinementConfig()).normalized()
+        self._column_plans: Dict[Tuple[str, ...], List[Tuple[str, _ColumnOperation]]] = {}
 
     def refine_rows(
         self,
@@ -375,112 +773,152 @@ class CrashDataRefiner:
         *,
         normalize_headers: bool = True,
     ) -> Tuple[List[Dict[str, Any]], RefinementReport]:
-        total_rows = 0
-        kept_rows = 0
-        dropped_missing_required = 0
-        dropped_duplicates = 0
-        coerced_dates = 0
-        coerced_numbers = 0
-        coerced_booleans = 0
-
+        state = _RefinementState()
         dedupe_index: set[Tuple[Any, ...]] = set()
         refined_rows: List[Dict[str, Any]] = []
 
         for raw_row in rows:
-            row = self._normalize_row(raw_row) if normalize_headers else dict(raw_row)
-            if is_blank_row(row):
-                continue
-            total_rows += 1
+            row = self._refine_row(
+                raw_row,
+                normalize_headers=normalize_headers,
+                state=state,
+                dedupe_index=dedupe_index,
+            )
+            if row is not None:
+                refined_rows.append(row)
 
-            if not self._has_required_columns(row):
-                dropped_missing_required += 1
-                continue
-
-            if self.config.dedupe_on:
-                dedupe_key = tuple(row.get(column) for column in self.config.dedupe_on)
-                if dedupe_key in dedupe_index:
-                    dropped_duplicates += 1
-                    continue
-                dedupe_index.add(dedupe_key)
+        _apply_route_suffixes(refined_rows)
+        return refined_rows, state.report()
 
-            # Apply default values before coercion so they also get converted.
-            for column, value in self.config.fill_defaults.items():
-                current = row.get(column)
-                if current is None:
-                    row[column] = value
-                    continue
-                if isinstance(current, str) and not current.strip():
-                    row[column] = value
+    def stream_rows(
+        self,
+        rows: Iterable[Mapping[str, Any]],
+        *,
+        route_suffixes: Mapping[str, str] | None = None,
+        normalize_headers: bool = True,
+    ) -> RefinementStream:
+        """Refine *rows* lazily, yielding each kept row as soon as it is produced.
+
+        Unlike :meth:`refine_rows` the stream never holds the refined dataset in
+        memory, so the route-suffix preferences that :meth:`refine_rows` derives
+        from the full output must be supplied up front. Build them with
+        :meth:`collect_route_suffixes` over a second pass of the source rows, or
+        load a persisted dictionary with :func:`load_route_suffixes`. When
+        *route_suffixes* is ``None`` no suffix completion is applied.
+        """
+        state = _RefinementState()
+        preferred = dict(route_suffixes or {})
+
+        def _generate() -> Iterator[Dict[str, Any]]:
+            dedupe_index: set[Tuple[Any, ...]] = set()
+            for raw_row in rows:
+                row = self._refine_row(
+                    raw_row,
+                    normalize_headers=normalize_headers,
+                    state=state,
+                    dedupe_index=dedupe_index,
+                )
+                if row is None:
                     continue
+                if preferred:
+                    _apply_preferred_suffixes(row, preferred)
+                yield row
 
-            for column in self.config.date_columns:
-                original = row.get(column)
-                parsed = _parse_date(original) if original is not None else None
-                if parsed != original and parsed is not None:
-                    row[column] = parsed
-                    coerced_dates += 1
-                elif parsed is None:
-                    row[column] = None
-
-            for column in self.config.integer_columns:
-                original = row.get(column)
-                coerced = _coerce_numeric(original, int)
-                if coerced is not None:
-                    row[column] = int(coerced)
-                    if coerced != original:
-                        coerced_numbers += 1
-                else:
-                    row[column] = None
-
-            for column in self.config.float_columns:
-                original = row.get(column)
-                coerced = _coerce_numeric(original, float)
-                if coerced is not None:
-                    row[column] = float(coerced)
-                    if coerced != original:
-                        coerced_numbers += 1
-                else:
-                    row[column] = None
-
-            for column in self.config.boolean_columns:
-                original = row.get(column)
-                coerced = _coerce_boolean(original)
-                if coerced is not None:
-                    row[column] = coerced
-                    if coerced != original:
-                        coerced_booleans += 1
-                else:
-                    row[column] = None
-
-            for column in _CRASH_TYPE_COLUMNS:
-                if column in row:
-                    row[column] = _standardize_crash_type(row.get(column))
-
-            for column in _ROUTE_COLUMNS:
-                if column in row:
-                    row[column] = _standardize_route(row.get(column))
-
-            refined_rows.append(row)
-            kept_rows += 1
+        return RefinementStream(_generate(), state)
 
-        _apply_route_suffixes(refined_rows)
+    def collect_route_suffixes(
+        self,
+        rows: Iterable[Mapping[str, Any]],
+        *,
+        normalize_headers: bool = True,
+    ) -> Dict[str, str]:
+        """Return the preferred route suffixes :meth:`refine_rows` would apply.
+
+        This is the cheap first pass for :meth:`stream_rows`: it applies the same
+        blank/required/duplicate filtering and fill defaults, but only
+        standardizes the route columns and keeps nothing but suffix tallies.
+        """
+        suffix_counts: Dict[str, Counter[str]] = {}
+        dedupe_index: set[Tuple[Any, ...]] = set()
+        for raw_row in rows:
+            row = self._normalize_row(raw_row) if normalize_headers else dict(raw_row)
+            if is_blank_row(row):
+                continue
+            if self._admit_row(row, dedupe_index) is not None:
+                continue
+            self._apply_fill_defaults(row)
+            routes = {
+                column: _standardize_route(row.get(column))
+                for column in _ROUTE_COLUMNS
+                if column in row
+            }
+            _count_route_suffixes(routes, suffix_counts)
+        return _select_preferred_suffixes(suffix_counts)
+
+    def _refine_row(
+        self,
+        raw_row: Mapping[str, Any],
+        *,
+        normalize_headers: bool,
+        state: _RefinementState,
+        dedupe_index: set[Tuple[Any, ...]],
+    ) -> Optional[Dict[str, Any]]:
+        row = self._normalize_row(raw_row) if normalize_headers else dict(raw_row)
+        if is_blank_row(row):
+            return None
+        state.total_rows += 1
+
+        rejection = self._admit_row(row, dedupe_index)
+        if rejection == "missing_required":
+            state.dropped_missing_required += 1
+            return None
+        if rejection == "duplicate":
+            state.dropped_duplicates += 1
+            return None
+
+        plan = self._column_plan(row)
+        # Apply default values before coercion so they also get converted.
+        self._apply_fill_defaults(row)
+        for column, operation in plan:
+            operation(row, column, state)
+
+        state.kept_rows += 1
+        return row
+
+    def _column_plan(self, row: Mapping[str, Any]) -> List[Tuple[str, _ColumnOperation]]:
+        header_key = tuple(row)
+        plan = self._column_plans.get(header_key)
+        if plan is None:
+            if len(self._column_plans) >= _MAX_COLUMN_PLANS:
+                self._column_plans.clear()
+            plan = compile_column_plan(self.config, header_key)
+            self._column_plans[header_key] = plan
+        return plan
+
+    def _admit_row(self, row: Mapping[str, Any], dedupe_index: set[Tuple[Any, ...]]) -> Optional[str]:
+        if not self._has_required_columns(row):
+            return "missing_required"
+        if self.config.dedupe_on:
+            dedupe_key = tuple(row.get(column) for column in self.config.dedupe_on)
+            if dedupe_key in dedupe_index:
+                return "duplicate"
+            dedupe_index.add(dedupe_key)
+        return None
 
-        report = RefinementReport(
-            total_rows=total_rows,
-            kept_rows=kept_rows,
-            dropped_missing_required=dropped_missing_required,
-            dropped_duplicates=dropped_duplicates,
-            coerced_dates=coerced_dates,
-            coerced_numbers=coerced_numbers,
-            coerced_booleans=coerced_booleans,
-        )
-        return refined_rows, report
+    def _apply_fill_defaults(self, row: Dict[str, Any]) -> None:
+        for column, value in self.config.fill_defaults.items():
+            current = row.get(column)
+            if current is None:
+                row[column] = value
+                continue
+            if isinstance(current, str) and not current.strip():
+                row[column] = value
 
     def filter_rows_by_boundary(
         self,
         rows: Iterable[Mapping[str, Any]],
         *,
-        boundary: PolygonBoundary,
+        boundary: Boundary,
         latitude_column: str,
         longitude_column: str,
         normalize_headers: bool = True,
@@ -492,6 +930,9 @@ class CrashDataRefiner:
         excluded: List[Dict[str, Any]] = []
         invalid: List[Dict[str, Any]] = []
         total_rows = 0
+        located: List[Dict[str, Any]] = []
+        lons: List[float] = []
+        lats: List[float] = []
 
         for raw_row in rows:
             row = self._normalize_row(raw_row) if normalize_headers else dict(raw_row)
@@ -505,11 +946,18 @@ class CrashDataRefiner:
             if lat is None or lon is None:
                 invalid.append(row)
                 continue
+            located.append(row)
+            lons.append(lon)
+            lats.append(lat)
 
-            if point_in_polygon(lon, lat, boundary):
-                included.append(row)
-            else:
+        part_names = boundary.part_names if isinstance(boundary, MultiPolygonBoundary) else None
+        for row, part in zip(located, locate_points(lons, lats, boundary)):
+            if part is None:
                 excluded.append(row)
+                continue
+            if part_names is not None:
+                row[BOUNDARY_POLYGON_COLUMN] = part_names[part]
+            included.append(row)
 
         report = BoundaryFilterReport(
             total_rows=total_rows,
@@ -523,7 +971,7 @@ class CrashDataRefiner:
         self,
         rows: Iterable[Mapping[str, Any]],
         *,
-        boundary: PolygonBoundary,
+        boundary: Boundary,
         latitude_column: str,
         longitude_column: str,
     ) -> Tuple[List[Dict[str, Any]], RefinementReport, BoundaryFilterReport, List[Dict[str, Any]]]:
@@ -540,7 +988,7 @@ class CrashDataRefiner:
     def _normalize_row(self, row: Mapping[str, Any]) -> Dict[str, Any]:
         normalized: Dict[str, Any] = {}
         for key, value in row.items():
-            normalized[normalize_header(key)] = value
+            normalized[_cached_normalize_header(key)] = value
         return normalized
 
     def _has_required_columns(self, row: Mapping[str, Any]) -> bool:
@@ -13,7 +13,7 @@ from .output_paths import (
     rejected_review_output_path,
 )
 from .refiner import RefinementReport
-from .spreadsheets import read_spreadsheet
+from .spreadsheets import count_spreadsheet_rows
 
 
 @dataclass(frozen=True)
@@ -59,11 +59,15 @@ class RunSummaryContract:
 def _count_rows(path: Path) -> int:
     if not path.exists():
         return 0
-    return len(read_spreadsheet(str(path)).rows)
+    return count_spreadsheet_rows(str(path))
 
 
 def load_output_counts_from_refined_path(refined_path: Path) -> RunOutputCounts:
-    """Read the written outputs for *refined_path* and return authoritative counts."""
+    """Return authoritative counts for the outputs written next to *refined_path*.
+
+    Counts come from the writers' sidecar manifests when they are current and
+    from a streaming row count otherwise.
+    """
     return RunOutputCounts(
         refined_rows=_count_rows(refined_path),
         invalid_rows=_count_rows(invalid_output_path(refined_path)),
@@ -253,6 +257,7 @@ def build_refine_response_summary(
             "coerced_dates": report.coerced_dates,
             "coerced_numbers": report.coerced_numbers,
             "coerced_booleans": report.coerced_booleans,
+            "date_formats": dict(report.date_formats),
         }
     )
     return payload
@@ -19,16 +19,19 @@ from .output_paths import (
     rejected_review_output_path,
 )
 from .pipeline import (
+    BatchRefinementResult,
     RelabelResult,
     RefinementResult,
     build_output_headers,
     load_headers_and_guess_columns,
     relabel_refined_outputs,
+    run_batch_refinement_pipeline,
     run_refinement_pipeline,
 )
 
 __all__ = [
     "VALID_LABEL_ORDERS",
+    "BatchRefinementResult",
     "RelabelResult",
     "RefinementResult",
     "build_output_headers",
@@ -42,5 +45,6 @@ __all__ = [
     "rejected_review_output_path",
     "relabel_refined_outputs",
     "resolve_label_order",
+    "run_batch_refinement_pipeline",
     "run_refinement_pipeline",
 ]
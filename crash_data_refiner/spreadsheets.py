@@ -3,15 +3,24 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
 
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from xml.sax.saxutils import escape, quoteattr
 import csv
+import io
+import math
 import posixpath
+import re
+import shutil
+import tempfile
 import xml.etree.ElementTree as ET
 import zipfile
 
-from .geo import PolygonBoundary, parse_coordinate, point_in_polygon
+from .geo import Boundary, parse_coordinate, points_in_polygon
 from .normalize import guess_lat_lon_columns, is_blank_row, normalize_header
+from .output_manifest import HashingWriter, read_output_manifest, write_output_manifest
 
 
 _XLSX_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
@@ -25,12 +34,69 @@ class SpreadsheetData:
     rows: List[Dict[str, Any]]
 
 
+class LazySpreadsheetData:
+    """Read-on-demand view of a spreadsheet.
+
+    Nothing is loaded until a method is called, and each call streams the file
+    again. ``iter_rows`` yields the same rows as :func:`read_spreadsheet`;
+    ``iter_columns`` and ``count`` skip building row dicts entirely, so callers
+    that only need a few fields or a row count stay cheap on large inputs.
+    """
+
+    def __init__(self, path: str) -> None:
+        ext = Path(path).suffix.lower()
+        if ext not in {".csv", ".xlsx", ".xlsm"}:
+            raise ValueError(f"Unsupported file type: {ext}")
+        self.path = path
+        self._is_csv = ext == ".csv"
+        self._headers: Optional[List[str]] = None
+
+    @property
+    def headers(self) -> List[str]:
+        if self._headers is None:
+            if self._is_csv:
+                with open(self.path, "r", newline="", encoding="utf-8-sig") as handle:
+                    self._headers = list(csv.DictReader(handle).fieldnames or [])
+            else:
+                self._headers = read_spreadsheet_headers(self.path)
+        return self._headers
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        return iter_spreadsheet_rows(self.path)
+
+    def iter_columns(self, names: Sequence[str]) -> Iterator[Tuple[Any, ...]]:
+        """Yield a tuple of the requested column values for every non-blank row.
+
+        Names are matched exactly first and then by normalized header; a name
+        that matches no header yields ``None`` in its slot.
+        """
+        if self._is_csv:
+            return _iter_csv_columns(self.path, names)
+        return _iter_xlsx_columns(self.path, names)
+
+    def count(self) -> int:
+        """Return the number of non-blank data rows."""
+        return sum(1 for _values in self.iter_columns(()))
+
+    def load(self) -> SpreadsheetData:
+        return read_spreadsheet(self.path)
+
+
 @dataclass(frozen=True)
 class _XlsxSheetInfo:
     member: str
     headers: List[str]
 
 
+@dataclass(frozen=True)
+class _XlsxNumberStyles:
+    """Cell style indexes whose number format turns serial numbers into dates."""
+
+    date_styles: Set[int]
+    timedelta_styles: Set[int]
+    epoch: Any
+
+
 def read_spreadsheet(path: str) -> SpreadsheetData:
     ext = Path(path).suffix.lower()
     if ext in {".csv"}:
@@ -40,6 +106,41 @@ def read_spreadsheet(path: str) -> SpreadsheetData:
     raise ValueError(f"Unsupported file type: {ext}")
 
 
+def iter_spreadsheet_rows(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the non-blank rows of *path* one at a time.
+
+    CSV files and workbooks readable by the streaming XLSX parser are read in
+    constant memory. Workbooks the streaming parser cannot open fall back to a
+    full openpyxl read.
+    """
+    ext = Path(path).suffix.lower()
+    if ext in {".csv"}:
+        with open(path, "r", newline="", encoding="utf-8-sig") as handle:
+            for row in csv.DictReader(handle):
+                if not is_blank_row(row):
+                    yield dict(row)
+        return
+    if ext in {".xlsx", ".xlsm"}:
+        try:
+            archive = zipfile.ZipFile(path)
+        except Exception:
+            yield from _read_xlsx_openpyxl(path).rows
+            return
+        with archive:
+            try:
+                _headers, rows = _xlsx_rows(archive)
+            except Exception:
+                rows = iter(_read_xlsx_openpyxl(path).rows)
+            yield from rows
+        return
+    raise ValueError(f"Unsupported file type: {ext}")
+
+
+def open_spreadsheet(path: str) -> LazySpreadsheetData:
+    """Return a lazy handle on *path* without reading any rows."""
+    return LazySpreadsheetData(path)
+
+
 def read_spreadsheet_headers(path: str) -> List[str]:
     ext = Path(path).suffix.lower()
     if ext in {".csv"}:
@@ -63,7 +164,7 @@ def read_spreadsheet_preview_points(
     *,
     lat_column: str,
     lon_column: str,
-    boundary: PolygonBoundary,
+    boundary: Boundary,
 ) -> Tuple[List[Tuple[float, float]], int, int, int]:
     ext = Path(path).suffix.lower()
     if ext in {".csv"}:
@@ -73,7 +174,7 @@ def read_spreadsheet_preview_points(
             return _read_xlsx_preview_points_fast(path, lat_column=lat_column, lon_column=lon_column, boundary=boundary)
         except Exception:
             return _read_preview_points_from_rows(
-                read_spreadsheet(path).rows,
+                iter_spreadsheet_rows(path),
                 lat_column=lat_column,
                 lon_column=lon_column,
                 boundary=boundary,
@@ -81,15 +182,45 @@ def read_spreadsheet_preview_points(
     raise ValueError(f"Unsupported file type: {ext}")
 
 
-def write_spreadsheet(path: str, rows: Sequence[Mapping[str, Any]], headers: Sequence[str] | None = None) -> None:
+def write_spreadsheet(
+    path: str,
+    rows: Sequence[Mapping[str, Any]],
+    headers: Sequence[str] | None = None,
+    *,
+    manifest: bool = False,
+) -> None:
+    """Write *rows* to *path*.
+
+    With *manifest* a sidecar recording the readable row count, byte size and
+    content hash is written next to the file (see :mod:`.output_manifest`).
+    The hash is taken from the bytes as they are written.
+    """
     ext = Path(path).suffix.lower()
     if ext in {".csv"}:
-        _write_csv(path, rows, headers=headers)
-        return
-    if ext in {".xlsx", ".xlsm"}:
-        _write_xlsx(path, rows, headers=headers)
-        return
-    raise ValueError(f"Unsupported file type: {ext}")
+        sha256 = _write_csv(path, rows, headers=headers)
+    elif ext in {".xlsx", ".xlsm"}:
+        sha256 = _write_xlsx(path, rows, headers=headers)
+    else:
+        raise ValueError(f"Unsupported file type: {ext}")
+    if manifest:
+        header_list = _resolve_headers(rows, headers)
+        readable_rows = sum(
+            1 for row in rows if not is_blank_row({header: row.get(header) for header in header_list})
+        )
+        write_output_manifest(Path(path), rows=readable_rows, sha256=sha256)
+
+
+def count_spreadsheet_rows(path: str) -> int:
+    """Return the non-blank row count of *path*.
+
+    A current sidecar manifest answers without opening the file; otherwise
+    the rows are counted by streaming the file without building row dicts.
+    Use :meth:`LazySpreadsheetData.count` to verify a file's contents instead.
+    """
+    manifest = read_output_manifest(Path(path))
+    if manifest is not None:
+        return manifest.rows
+    return open_spreadsheet(path).count()
 
 
 def _read_csv(path: str) -> SpreadsheetData:
@@ -100,16 +231,83 @@ def _read_csv(path: str) -> SpreadsheetData:
     return SpreadsheetData(headers=headers, rows=rows)
 
 
-def _write_csv(path: str, rows: Sequence[Mapping[str, Any]], headers: Sequence[str] | None = None) -> None:
+def _iter_csv_columns(path: str, names: Sequence[str]) -> Iterator[Tuple[Any, ...]]:
+    with open(path, "r", newline="", encoding="utf-8-sig") as handle:
+        reader = csv.reader(handle)
+        headers = next(reader, None)
+        if headers is None:
+            return
+        # Later duplicates win, matching csv.DictReader.
+        positions = {header: idx for idx, header in enumerate(headers)}
+        indexes = [positions.get(_resolve_requested_header(headers, name), -1) for name in names]
+        for values in reader:
+            if not any(value.strip() for value in values):
+                continue
+            width = len(values)
+            yield tuple(values[idx] if 0 <= idx < width else None for idx in indexes)
+
+
+def _write_csv(path: str, rows: Sequence[Mapping[str, Any]], headers: Sequence[str] | None = None) -> str:
+    """Write *rows* as UTF-8 CSV and return the file's SHA-256."""
     header_list = _resolve_headers(rows, headers)
-    with open(path, "w", newline="", encoding="utf-8") as handle:
-        writer = csv.DictWriter(handle, fieldnames=header_list)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow({header: row.get(header) for header in header_list})
+    with open(path, "wb") as raw, HashingWriter(raw) as hashed:
+        with io.TextIOWrapper(hashed, encoding="utf-8", newline="") as handle:
+            writer = csv.DictWriter(handle, fieldnames=header_list)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({header: row.get(header) for header in header_list})
+        return hashed.sha256
 
 
 def _read_xlsx(path: str) -> SpreadsheetData:
+    try:
+        with zipfile.ZipFile(path) as archive:
+            headers, rows = _xlsx_rows(archive)
+            return SpreadsheetData(headers=headers, rows=list(rows))
+    except Exception:
+        return _read_xlsx_openpyxl(path)
+
+
+def _iter_xlsx_columns(path: str, names: Sequence[str]) -> Iterator[Tuple[Any, ...]]:
+    try:
+        archive = zipfile.ZipFile(path)
+    except Exception:
+        yield from _project_rows(_read_xlsx_openpyxl(path), names)
+        return
+    with archive:
+        try:
+            shared_strings = _xlsx_shared_strings(archive)
+            sheet_info = _xlsx_select_sheet_info(archive, shared_strings)
+            styles = _xlsx_number_styles(archive) if names and sheet_info.member else None
+        except Exception:
+            yield from _project_rows(_read_xlsx_openpyxl(path), names)
+            return
+        if not sheet_info.member:
+            return
+        headers = sheet_info.headers
+        positions = {header: idx for idx, header in enumerate(headers) if header}
+        indexes = [positions.get(_resolve_requested_header(headers, name), -1) for name in names]
+        scanner = _XlsxColumnScanner(list(positions.values()), indexes, shared_strings, styles)
+        parser = ET.XMLParser(target=scanner)
+        with archive.open(sheet_info.member) as handle:
+            while True:
+                chunk = handle.read(_XLSX_READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                parser.feed(chunk)
+                yield from scanner.rows
+                scanner.rows.clear()
+        parser.close()
+        yield from scanner.rows
+
+
+def _project_rows(data: SpreadsheetData, names: Sequence[str]) -> Iterator[Tuple[Any, ...]]:
+    keys = [_resolve_requested_header(data.headers, name) for name in names]
+    for row in data.rows:
+        yield tuple(row.get(key) for key in keys)
+
+
+def _read_xlsx_openpyxl(path: str) -> SpreadsheetData:
     from openpyxl import load_workbook
 
     workbook = load_workbook(path, read_only=True, data_only=True, keep_links=False)
@@ -163,51 +361,266 @@ def _sheet_headers(sheet: Any) -> List[str]:
     return [str(item).strip() if item is not None else "" for item in row]
 
 
-def _write_xlsx(path: str, rows: Sequence[Mapping[str, Any]], headers: Sequence[str] | None = None) -> None:
-    from openpyxl.utils import get_column_letter
-    from openpyxl.worksheet.table import Table, TableStyleInfo
-    from openpyxl import Workbook
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '<Override PartName="/xl/sharedStrings.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    "{table_override}"
+    "</Types>"
+)
+_XLSX_TABLE_CONTENT_TYPE = (
+    '<Override PartName="/xl/tables/table1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.table+xml"/>'
+)
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<Relationships xmlns="{_XLSX_PACKAGE_REL_NS}">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<workbook xmlns="{_XLSX_MAIN_NS}" xmlns:r="{_XLSX_REL_NS}">'
+    '<workbookPr/><bookViews><workbookView activeTab="0"/></bookViews>'
+    '<sheets><sheet name="Sheet" sheetId="1" r:id="rId1"/></sheets>'
+    '<calcPr calcId="124519" fullCalcOnLoad="1"/>'
+    "</workbook>"
+)
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<Relationships xmlns="{_XLSX_PACKAGE_REL_NS}">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '<Relationship Id="rId3" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" '
+    'Target="sharedStrings.xml"/>'
+    "</Relationships>"
+)
+_XLSX_SHEET_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<Relationships xmlns="{_XLSX_PACKAGE_REL_NS}">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/table" '
+    'Target="../tables/table1.xml"/>'
+    "</Relationships>"
+)
+# Cell style ids 1-4 carry the same number formats openpyxl assigns to
+# datetime, date, time and timedelta values.
+_XLSX_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<styleSheet xmlns="{_XLSX_MAIN_NS}">'
+    '<numFmts count="4">'
+    '<numFmt numFmtId="164" formatCode="yyyy-mm-dd h:mm:ss"/>'
+    '<numFmt numFmtId="165" formatCode="yyyy-mm-dd"/>'
+    '<numFmt numFmtId="166" formatCode="h:mm:ss"/>'
+    '<numFmt numFmtId="167" formatCode="[hh]:mm:ss"/>'
+    "</numFmts>"
+    '<fonts count="1"><font><sz val="11"/><color theme="1"/><name val="Calibri"/>'
+    '<family val="2"/><scheme val="minor"/></font></fonts>'
+    '<fills count="2"><fill><patternFill/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="5">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="166" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="167" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    "</cellXfs>"
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    "</styleSheet>"
+)
+_XLSX_DATETIME_STYLE = 1
+_XLSX_DATE_STYLE = 2
+_XLSX_TIME_STYLE = 3
+_XLSX_TIMEDELTA_STYLE = 4
+_XLSX_ILLEGAL_CHARACTERS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_XLSX_MIN_COLUMN_WIDTH = 10
+_XLSX_MAX_COLUMN_WIDTH = 60
+
+
+class _SharedStringTable:
+    """Shared-string table built incrementally while cells are written."""
+
+    __slots__ = ("indexes", "references")
+
+    def __init__(self) -> None:
+        self.indexes: Dict[str, int] = {}
+        self.references = 0
+
+    def index(self, text: str) -> int:
+        self.references += 1
+        index = self.indexes.get(text)
+        if index is None:
+            index = self.indexes[text] = len(self.indexes)
+        return index
+
+    def write(self, handle: Any) -> None:
+        handle.write(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<sst xmlns="{_XLSX_MAIN_NS}" count="{self.references}" uniqueCount="{len(self.indexes)}">'.encode("utf-8")
+        )
+        for text in self.indexes:
+            handle.write(f"<si>{_xlsx_text_element(text)}</si>".encode("utf-8"))
+        handle.write(b"</sst>")
+
+
+def _write_xlsx(path: str, rows: Sequence[Mapping[str, Any]], headers: Sequence[str] | None = None) -> str:
+    """Stream *rows* into a single-sheet workbook with a styled Excel table.
 
+    Sheet XML goes to a temporary file while column widths are tracked, so
+    the ``<cols>`` block can precede it in the archive. Memory stays bounded
+    by the unique-string table rather than a full openpyxl workbook. Returns
+    the workbook's SHA-256, hashed as the archive is written.
+    """
     header_list = _resolve_headers(rows, headers)
-    workbook = Workbook()
-    sheet = workbook.active
-    sheet.append(list(header_list))
-    for row in rows:
-        sheet.append([row.get(header) for header in header_list])
-
-    if header_list:
-        max_row = sheet.max_row
-        max_col = len(header_list)
-        end_cell = f"{get_column_letter(max_col)}{max_row}"
-        table = Table(displayName="Table1", ref=f"A1:{end_cell}")
-        table_style = TableStyleInfo(
-            name="TableStyleMedium2",
-            showFirstColumn=False,
-            showLastColumn=False,
-            showRowStripes=True,
-            showColumnStripes=False,
-        )
-        table.tableStyleInfo = table_style
-        sheet.add_table(table)
-        _autosize_columns(sheet, max_col)
+    column_count = len(header_list)
+    letters = [_xlsx_column_letter(idx) for idx in range(column_count)]
+    widths = [0] * column_count
+    strings = _SharedStringTable()
+    row_count = 0
+
+    string_indexes = strings.indexes
+    with tempfile.TemporaryFile() as sheet_data:
+        if header_list:
+            for values in ([*header_list], *([row.get(header) for header in header_list] for row in rows)):
+                row_count += 1
+                row_number = str(row_count)
+                cells: List[str] = [f'<row r="{row_number}">']
+                for col_idx, value in enumerate(values):
+                    if value is None:
+                        continue
+                    if type(value) is str:
+                        # Plain strings dominate refined outputs; keep them off the generic path.
+                        text = value
+                        index = string_indexes.get(text)
+                        if index is None:
+                            index = string_indexes[text] = len(string_indexes)
+                        strings.references += 1
+                        cells.append(f'<c r="{letters[col_idx]}{row_number}" t="s"><v>{index}</v></c>')
+                    else:
+                        text = str(value)
+                        cells.append(_xlsx_cell_xml(f"{letters[col_idx]}{row_number}", value, strings))
+                    if len(text) > widths[col_idx]:
+                        widths[col_idx] = len(text)
+                cells.append("</row>")
+                sheet_data.write("".join(cells).encode("utf-8"))
+        sheet_data.seek(0)
+
+        with open(path, "wb") as raw, HashingWriter(raw) as hashed:
+            with zipfile.ZipFile(hashed, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                archive.writestr(
+                    "[Content_Types].xml",
+                    _XLSX_CONTENT_TYPES.format(table_override=_XLSX_TABLE_CONTENT_TYPE if header_list else ""),
+                )
+                archive.writestr("_rels/.rels", _XLSX_ROOT_RELS)
+                archive.writestr("xl/workbook.xml", _XLSX_WORKBOOK)
+                archive.writestr("xl/_rels/workbook.xml.rels", _XLSX_WORKBOOK_RELS)
+                archive.writestr("xl/styles.xml", _XLSX_STYLES)
+                ref = f"A1:{letters[-1]}{row_count}" if header_list else "A1"
+                with archive.open("xl/worksheets/sheet1.xml", "w") as handle:
+                    handle.write(_xlsx_sheet_prefix(ref, widths).encode("utf-8"))
+                    shutil.copyfileobj(sheet_data, handle)
+                    suffix = "</sheetData>"
+                    if header_list:
+                        suffix += '<tableParts count="1"><tablePart r:id="rId1"/></tableParts>'
+                    handle.write(f"{suffix}</worksheet>".encode("utf-8"))
+                with archive.open("xl/sharedStrings.xml", "w") as handle:
+                    strings.write(handle)
+                if header_list:
+                    archive.writestr("xl/worksheets/_rels/sheet1.xml.rels", _XLSX_SHEET_RELS)
+                    archive.writestr("xl/tables/table1.xml", _xlsx_table_xml(ref, header_list))
+    return hashed.sha256
+
+
+def _xlsx_sheet_prefix(ref: str, widths: Sequence[int]) -> str:
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n',
+        f'<worksheet xmlns="{_XLSX_MAIN_NS}" xmlns:r="{_XLSX_REL_NS}">',
+        f'<dimension ref="{ref}"/>',
+        '<sheetViews><sheetView workbookViewId="0"/></sheetViews>',
+        '<sheetFormatPr baseColWidth="8" defaultRowHeight="15"/>',
+    ]
+    if widths:
+        parts.append("<cols>")
+        for col_idx, length in enumerate(widths, start=1):
+            width = min(max(length + 2, _XLSX_MIN_COLUMN_WIDTH), _XLSX_MAX_COLUMN_WIDTH)
+            parts.append(f'<col min="{col_idx}" max="{col_idx}" width="{width}" customWidth="1"/>')
+        parts.append("</cols>")
+    parts.append("<sheetData>")
+    return "".join(parts)
+
+
+def _xlsx_table_xml(ref: str, headers: Sequence[str]) -> str:
+    columns = "".join(
+        f'<tableColumn id="{idx}" name={quoteattr(str(header))}/>' for idx, header in enumerate(headers, start=1)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<table xmlns="{_XLSX_MAIN_NS}" id="1" name="Table1" displayName="Table1" ref="{ref}" headerRowCount="1">'
+        f'<autoFilter ref="{ref}"/>'
+        f'<tableColumns count="{len(headers)}">{columns}</tableColumns>'
+        '<tableStyleInfo name="TableStyleMedium2" showFirstColumn="0" showLastColumn="0" '
+        'showRowStripes="1" showColumnStripes="0"/>'
+        "</table>"
+    )
+
+
+def _xlsx_cell_xml(ref: str, value: Any, strings: _SharedStringTable) -> str:
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, int):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    if isinstance(value, float):
+        if math.isfinite(value):
+            return f'<c r="{ref}"><v>{value!r}</v></c>'
+    elif isinstance(value, Decimal):
+        if value.is_finite():
+            return f'<c r="{ref}"><v>{value}</v></c>'
+    elif isinstance(value, (datetime, date, time, timedelta)):
+        from openpyxl.utils.datetime import to_excel
+
+        if isinstance(value, datetime):
+            style = _XLSX_DATETIME_STYLE
+        elif isinstance(value, date):
+            style = _XLSX_DATE_STYLE
+        elif isinstance(value, time):
+            style = _XLSX_TIME_STYLE
+        else:
+            style = _XLSX_TIMEDELTA_STYLE
+        return f'<c r="{ref}" s="{style}"><v>{to_excel(value)!r}</v></c>'
+    return f'<c r="{ref}" t="s"><v>{strings.index(str(value))}</v></c>'
 
-    workbook.save(path)
 
+def _xlsx_text_element(text: str) -> str:
+    text = _XLSX_ILLEGAL_CHARACTERS.sub("", text)
+    if text != text.strip():
+        return f'<t xml:space="preserve">{escape(text)}</t>'
+    return f"<t>{escape(text)}</t>"
 
-def _autosize_columns(sheet: Any, max_col: int) -> None:
-    from openpyxl.utils import get_column_letter
 
-    for col_idx in range(1, max_col + 1):
-        max_length = 0
-        for cell in sheet.iter_rows(min_row=1, max_row=sheet.max_row, min_col=col_idx, max_col=col_idx):
-            value = cell[0].value
-            if value is None:
-                continue
-            text = str(value)
-            if len(text) > max_length:
-                max_length = len(text)
-        width = min(max(max_length + 2, 10), 60)
-        sheet.column_dimensions[get_column_letter(col_idx)].width = width
+def _xlsx_column_letter(col_idx: int) -> str:
+    letters = ""
+    col_idx += 1
+    while col_idx:
+        col_idx, remainder = divmod(col_idx - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
 
 
 def _resolve_headers(rows: Sequence[Mapping[str, Any]], headers: Sequence[str] | None) -> List[str]:
@@ -224,17 +637,16 @@ def _resolve_headers(rows: Sequence[Mapping[str, Any]], headers: Sequence[str] |
 
 
 def _read_preview_points_from_rows(
-    rows: Sequence[Mapping[str, Any]],
+    rows: Iterable[Mapping[str, Any]],
     *,
     lat_column: str,
     lon_column: str,
-    boundary: PolygonBoundary,
+    boundary: Boundary,
 ) -> Tuple[List[Tuple[float, float]], int, int, int]:
     lat_key = normalize_header(lat_column)
     lon_key = normalize_header(lon_column)
-    points: List[Tuple[float, float]] = []
-    included = 0
-    excluded = 0
+    lats: List[float] = []
+    lons: List[float] = []
     invalid = 0
 
     for raw_row in rows:
@@ -246,13 +658,22 @@ def _read_preview_points_from_rows(
         if lat is None or lon is None:
             invalid += 1
             continue
-        if point_in_polygon(lon, lat, boundary):
-            points.append((lat, lon))
-            included += 1
-        else:
-            excluded += 1
+        lats.append(lat)
+        lons.append(lon)
 
-    return points, included, excluded, invalid
+    return _classify_preview_points(lats, lons, boundary, invalid=invalid)
+
+
+def _classify_preview_points(
+    lats: Sequence[float],
+    lons: Sequence[float],
+    boundary: Boundary,
+    *,
+    invalid: int,
+) -> Tuple[List[Tuple[float, float]], int, int, int]:
+    inside = points_in_polygon(lons, lats, boundary)
+    points = [(lat, lon) for lat, lon, keep in zip(lats, lons, inside) if keep]
+    return points, len(points), len(inside) - len(points), invalid
 
 
 def _read_csv_preview_points(
@@ -260,16 +681,15 @@ def _read_csv_preview_points(
     *,
     lat_column: str,
     lon_column: str,
-    boundary: PolygonBoundary,
+    boundary: Boundary,
 ) -> Tuple[List[Tuple[float, float]], int, int, int]:
     with open(path, "r", newline="", encoding="utf-8-sig") as handle:
         reader = csv.DictReader(handle)
         headers = list(reader.fieldnames or [])
         lat_name = _resolve_requested_header(headers, lat_column)
         lon_name = _resolve_requested_header(headers, lon_column)
-        points: List[Tuple[float, float]] = []
-        included = 0
-        excluded = 0
+        lats: List[float] = []
+        lons: List[float] = []
         invalid = 0
 
         for row in reader:
@@ -280,13 +700,10 @@ def _read_csv_preview_points(
             if lat is None or lon is None:
                 invalid += 1
                 continue
-            if point_in_polygon(lon, lat, boundary):
-                points.append((lat, lon))
-                included += 1
-            else:
-                excluded += 1
+            lats.append(lat)
+            lons.append(lon)
 
-    return points, included, excluded, invalid
+    return _classify_preview_points(lats, lons, boundary, invalid=invalid)
 
 
 def _read_xlsx_headers_fast(path: str) -> List[str]:
@@ -300,7 +717,7 @@ def _read_xlsx_preview_points_fast(
     *,
     lat_column: str,
     lon_column: str,
-    boundary: PolygonBoundary,
+    boundary: Boundary,
 ) -> Tuple[List[Tuple[float, float]], int, int, int]:
     with zipfile.ZipFile(path) as archive:
         shared_strings = _xlsx_shared_strings(archive)
@@ -310,9 +727,8 @@ def _read_xlsx_preview_points_fast(
         lon_name = _resolve_requested_header(headers, lon_column)
         lat_idx = headers.index(lat_name) if lat_name in headers else -1
         lon_idx = headers.index(lon_name) if lon_name in headers else -1
-        points: List[Tuple[float, float]] = []
-        included = 0
-        excluded = 0
+        lats: List[float] = []
+        lons: List[float] = []
         invalid = 0
         saw_header = False
 
@@ -345,13 +761,10 @@ def _read_xlsx_preview_points_fast(
                 if lat is None or lon is None:
                     invalid += 1
                     continue
-                if point_in_polygon(lon, lat, boundary):
-                    points.append((lat, lon))
-                    included += 1
-                else:
-                    excluded += 1
+                lats.append(lat)
+                lons.append(lon)
 
-    return points, included, excluded, invalid
+    return _classify_preview_points(lats, lons, boundary, invalid=invalid)
 
 
 def _resolve_requested_header(headers: Sequence[str], requested: str) -> str:
@@ -364,6 +777,283 @@ def _resolve_requested_header(headers: Sequence[str], requested: str) -> str:
     return requested
 
 
+def _xlsx_rows(archive: zipfile.ZipFile) -> Tuple[List[str], Iterator[Dict[str, Any]]]:
+    """Return the selected sheet's headers and a lazy iterator over its rows.
+
+    Cell values are typed the way openpyxl's ``data_only`` reader types them:
+    numbers become ``int``/``float``, date-formatted numbers become
+    ``datetime`` values, booleans become ``bool`` and strings stay ``str``.
+    """
+    shared_strings = _xlsx_shared_strings(archive)
+    sheet_info = _xlsx_select_sheet_info(archive, shared_strings)
+    if not sheet_info.member:
+        return sheet_info.headers, iter(())
+    styles = _xlsx_number_styles(archive)
+    return sheet_info.headers, _iter_xlsx_sheet_rows(archive, sheet_info, shared_strings, styles)
+
+
+def _iter_xlsx_sheet_rows(
+    archive: zipfile.ZipFile,
+    sheet_info: _XlsxSheetInfo,
+    shared_strings: Sequence[str],
+    styles: _XlsxNumberStyles,
+) -> Iterator[Dict[str, Any]]:
+    keyed_headers = [(idx, header) for idx, header in enumerate(sheet_info.headers) if header]
+    row_tag = _xlsx_tag("row")
+    sheet_data_tag = _xlsx_tag("sheetData")
+    column_indexes: Dict[str, int] = {}
+    sheet_data: Optional[ET.Element] = None
+    saw_header = False
+
+    with archive.open(sheet_info.member) as handle:
+        for event, elem in ET.iterparse(handle, events=("start", "end")):
+            if event == "start":
+                if sheet_data is None and elem.tag == sheet_data_tag:
+                    sheet_data = elem
+                continue
+            if elem.tag != row_tag:
+                continue
+            if not saw_header:
+                saw_header = True
+            else:
+                values: Dict[int, Any] = {}
+                next_col = 0
+                for cell in elem:
+                    cell_ref = cell.get("r")
+                    if cell_ref:
+                        letters = cell_ref.rstrip("0123456789")
+                        col_idx = column_indexes.get(letters)
+                        if col_idx is None:
+                            col_idx = column_indexes[letters] = _xlsx_column_index(letters)
+                    else:
+                        col_idx = next_col
+                    next_col = col_idx + 1
+                    values[col_idx] = _xlsx_cell_value(cell, shared_strings, styles)
+                row = {header: values.get(idx) for idx, header in keyed_headers}
+                if row and not is_blank_row(row):
+                    yield row
+            # Drop finished rows so memory stays flat on very large sheets.
+            elem.clear()
+            if sheet_data is not None:
+                sheet_data.clear()
+
+
+class _XlsxColumnScanner:
+    """Parser target that pulls selected columns out of sheet XML.
+
+    Expat calls ``start``/``end``/``data`` directly, so no element tree is
+    built. Only the cells needed for the blank-row check and the requested
+    columns are decoded; finished rows collect in ``rows`` as tuples.
+    """
+
+    def __init__(
+        self,
+        keyed_indexes: Sequence[int],
+        indexes: Sequence[int],
+        shared_strings: Sequence[str],
+        styles: Optional[_XlsxNumberStyles],
+    ) -> None:
+        self.rows: List[Tuple[Any, ...]] = []
+        self._keyed = set(keyed_indexes)
+        self._wanted = {idx for idx in indexes if idx >= 0}
+        self._relevant = self._keyed | self._wanted
+        self._indexes = list(indexes)
+        self._shared_strings = shared_strings
+        self._styles = styles
+        self._column_indexes: Dict[str, int] = {}
+        self._saw_header = False
+        self._next_col = 0
+        self._values: Dict[int, Any] = {}
+        self._nonblank = False
+        self._cell_col = -1
+        self._cell_type = "n"
+        self._cell_style = 0
+        self._text: Optional[List[str]] = None
+        self._inline: Optional[List[str]] = None
+        self._capture: Optional[List[str]] = None
+        self._phonetic = False
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        if tag == _XLSX_CELL_TAG:
+            cell_ref = attrib.get("r")
+            if cell_ref:
+                letters = cell_ref.rstrip("0123456789")
+                col_idx = self._column_indexes.get(letters)
+                if col_idx is None:
+                    col_idx = self._column_indexes[letters] = _xlsx_column_index(letters)
+            else:
+                col_idx = self._next_col
+            self._next_col = col_idx + 1
+            if self._saw_header and col_idx in self._relevant:
+                self._cell_col = col_idx
+                self._cell_type = attrib.get("t", "n")
+                self._cell_style = int(attrib.get("s") or 0)
+                self._text = None
+                self._inline = None
+        elif self._cell_col < 0:
+            if tag == _XLSX_ROW_TAG:
+                self._next_col = 0
+                self._values = {}
+                self._nonblank = False
+        elif tag == _XLSX_VALUE_TAG:
+            self._text = self._capture = []
+        elif tag == _XLSX_INLINE_TAG:
+            self._inline = []
+        elif tag == _XLSX_PHONETIC_TAG:
+            self._phonetic = True
+        elif tag == _XLSX_TEXT_TAG and self._inline is not None and not self._phonetic:
+            self._capture = self._inline
+
+    def end(self, tag: str) -> None:
+        if tag == _XLSX_CELL_TAG:
+            col_idx = self._cell_col
+            if col_idx < 0:
+                return
+            self._cell_col = -1
+            self._capture = None
+            text = "".join(self._text) if self._text is not None else None
+            inline = "".join(self._inline) if self._inline is not None else None
+            if not self._nonblank and col_idx in self._keyed:
+                self._nonblank = not _xlsx_raw_is_blank(self._cell_type, text, inline, self._shared_strings)
+            if col_idx in self._wanted:
+                self._values[col_idx] = _xlsx_raw_value(
+                    self._cell_type, self._cell_style, text, inline, self._shared_strings, self._styles
+                )
+        elif tag == _XLSX_ROW_TAG:
+            if not self._saw_header:
+                self._saw_header = True
+            elif self._nonblank:
+                self.rows.append(tuple(self._values.get(idx) for idx in self._indexes))
+        elif tag == _XLSX_VALUE_TAG or tag == _XLSX_TEXT_TAG:
+            self._capture = None
+        elif tag == _XLSX_PHONETIC_TAG:
+            self._phonetic = False
+
+    def data(self, text: str) -> None:
+        if self._capture is not None:
+            self._capture.append(text)
+
+    def close(self) -> None:
+        return None
+
+
+_XLSX_ROW_TAG = f"{{{_XLSX_MAIN_NS}}}row"
+_XLSX_CELL_TAG = f"{{{_XLSX_MAIN_NS}}}c"
+_XLSX_VALUE_TAG = f"{{{_XLSX_MAIN_NS}}}v"
+_XLSX_INLINE_TAG = f"{{{_XLSX_MAIN_NS}}}is"
+_XLSX_TEXT_TAG = f"{{{_XLSX_MAIN_NS}}}t"
+_XLSX_PHONETIC_TAG = f"{{{_XLSX_MAIN_NS}}}rPh"
+_XLSX_READ_CHUNK_SIZE = 1 << 16
+
+
+def _xlsx_cell_value(cell: ET.Element, shared_strings: Sequence[str], styles: _XlsxNumberStyles) -> Any:
+    text: Optional[str] = None
+    inline: Optional[ET.Element] = None
+    for child in cell:
+        if child.tag == _XLSX_VALUE_TAG:
+            text = child.text
+        elif child.tag == _XLSX_INLINE_TAG:
+            inline = child
+    return _xlsx_raw_value(
+        cell.get("t", "n"),
+        int(cell.get("s") or 0),
+        text,
+        _xlsx_rich_text(inline) if inline is not None else None,
+        shared_strings,
+        styles,
+    )
+
+
+def _xlsx_raw_value(
+    cell_type: str,
+    style_id: int,
+    text: Optional[str],
+    inline: Optional[str],
+    shared_strings: Sequence[str],
+    styles: Optional[_XlsxNumberStyles],
+) -> Any:
+    if cell_type == "inlineStr":
+        return inline
+    if not text:
+        return None
+    if cell_type == "n":
+        number: float | int = float(text) if ("." in text or "E" in text or "e" in text) else int(text)
+        if styles is not None and style_id in styles.date_styles:
+            from openpyxl.utils.datetime import from_excel
+
+            try:
+                return from_excel(number, styles.epoch, timedelta=style_id in styles.timedelta_styles)
+            except (OverflowError, ValueError):
+                return "#VALUE!"
+        return number
+    if cell_type == "s":
+        index = int(text)
+        return shared_strings[index] if 0 <= index < len(shared_strings) else ""
+    if cell_type == "b":
+        return bool(int(text))
+    if cell_type == "d":
+        from openpyxl.utils.datetime import from_ISO8601
+
+        return from_ISO8601(text)
+    return text
+
+
+def _xlsx_raw_is_blank(
+    cell_type: str,
+    text: Optional[str],
+    inline: Optional[str],
+    shared_strings: Sequence[str],
+) -> bool:
+    """Return whether a cell would read as a blank value, without typing it."""
+    if cell_type == "inlineStr":
+        return not (inline and inline.strip())
+    if not text:
+        return True
+    if cell_type == "s":
+        index = int(text)
+        return not (0 <= index < len(shared_strings) and shared_strings[index].strip())
+    if cell_type in {"n", "b", "d"}:
+        return False
+    return not text.strip()
+
+
+def _xlsx_number_styles(archive: zipfile.ZipFile) -> _XlsxNumberStyles:
+    from openpyxl.styles.numbers import builtin_format_code, is_date_format, is_timedelta_format
+    from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900
+
+    epoch = CALENDAR_WINDOWS_1900
+    with archive.open("xl/workbook.xml") as handle:
+        workbook_root = ET.parse(handle).getroot()
+    properties = workbook_root.find(_xlsx_tag("workbookPr"))
+    if properties is not None and properties.attrib.get("date1904", "").lower() in {"1", "true"}:
+        epoch = CALENDAR_MAC_1904
+
+    date_styles: Set[int] = set()
+    timedelta_styles: Set[int] = set()
+    try:
+        handle = archive.open("xl/styles.xml")
+    except KeyError:
+        return _XlsxNumberStyles(date_styles=date_styles, timedelta_styles=timedelta_styles, epoch=epoch)
+    with handle:
+        styles_root = ET.parse(handle).getroot()
+
+    custom_formats: Dict[int, str] = {}
+    num_fmts = styles_root.find(_xlsx_tag("numFmts"))
+    if num_fmts is not None:
+        for num_fmt in num_fmts.findall(_xlsx_tag("numFmt")):
+            custom_formats[int(num_fmt.attrib.get("numFmtId", "0"))] = num_fmt.attrib.get("formatCode", "")
+    cell_xfs = styles_root.find(_xlsx_tag("cellXfs"))
+    if cell_xfs is not None:
+        for style_id, xf in enumerate(cell_xfs.findall(_xlsx_tag("xf"))):
+            fmt_id = int(xf.attrib.get("numFmtId", "0"))
+            fmt = custom_formats[fmt_id] if fmt_id in custom_formats else builtin_format_code(fmt_id)
+            if is_date_format(fmt):
+                date_styles.add(style_id)
+            if is_timedelta_format(fmt):
+                timedelta_styles.add(style_id)
+    return _XlsxNumberStyles(date_styles=date_styles, timedelta_styles=timedelta_styles, epoch=epoch)
+
+
 def _xlsx_select_sheet_info(archive: zipfile.ZipFile, shared_strings: Sequence[str]) -> _XlsxSheetInfo:
     best_info: Optional[_XlsxSheetInfo] = None
     best_score = (-1, -1)
@@ -455,7 +1145,7 @@ def _xlsx_shared_strings(archive: zipfile.ZipFile) -> List[str]:
     with handle:
         for _event, elem in ET.iterparse(handle, events=("end",)):
             if elem.tag == _xlsx_tag("si"):
-                strings.append(_xlsx_inline_text(elem))
+                strings.append(_xlsx_rich_text(elem).replace("x005F_", ""))
                 elem.clear()
     return strings
 
@@ -502,6 +1192,19 @@ def _xlsx_inline_text(element: Optional[ET.Element]) -> str:
     return "".join(text or "" for text in element.itertext())
 
 
+def _xlsx_rich_text(element: ET.Element) -> str:
+    """Return the text of a string item, skipping phonetic (``rPh``) runs."""
+    parts: List[str] = []
+    plain = element.find(_xlsx_tag("t"))
+    if plain is not None and plain.text:
+        parts.append(plain.text)
+    for run in element.findall(_xlsx_tag("r")):
+        run_text = run.find(_xlsx_tag("t"))
+        if run_text is not None and run_text.text:
+            parts.append(run_text.text)
+    return "".join(parts)
+
+
 def _xlsx_column_index(cell_ref: str) -> int:
     letters: List[str] = []
     for char in cell_ref:
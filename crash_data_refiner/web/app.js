@@ -12,6 +12,8 @@ const state = {
   showSecondaryReview: false,
   currentReviewIndex: 0,
   reviewMapData: null,
+  reviewContextCrashes: {},
+  reviewLoadId: 0,
   reviewMapPickMode: false,
   reviewMap: null,
   reviewMapLayers: null,
@@ -157,6 +159,9 @@ const el = {
 
 const SESSION_KEY = "crash-data-refiner-ui-state-v2";
 const LEGACY_SESSION_KEYS = ["crash-data-refiner-ui-state"];
+const REVIEW_STEP_PAGE_SIZE = 100;
+// Half-width of the box searched for nearby context crashes (~1.4 miles).
+const REVIEW_CONTEXT_RADIUS_DEGREES = 0.02;
 const UI_BUSY_CONTROLS = [
   "runRefine",
   "applyReview",
@@ -179,7 +184,11 @@ async function parseJsonSafe(response) {
 
 function clearPollingTimer() {
   if (!state.pollTimer) return;
-  window.clearInterval(state.pollTimer);
+  if (typeof state.pollTimer === "object" && typeof state.pollTimer.close === "function") {
+    state.pollTimer.close();
+  } else {
+    window.clearInterval(state.pollTimer);
+  }
   state.pollTimer = null;
 }
 
@@ -481,7 +490,7 @@ function resetTransientInputUi() {
   el.dataLabel.textContent = "Crash spreadsheet (.csv, .xlsx)";
   el.dataHint.textContent = "Drop file or click to browse";
   el.kmzLabel.textContent = "Boundary KMZ (.kmz)";
-  el.kmzHint.textContent = "One polygon only";
+  el.kmzHint.textContent = "Polygons or MultiGeometry";
   el.reviewLabel.textContent = "Reviewed coordinate workbook";
   el.reviewHint.textContent = "Upload a reviewed workbook";
   if (el.columnHint) {
@@ -733,8 +742,21 @@ function updateWorkflowGuidance() {
   el.workflowWarning.textContent = warning;
 }
 
+function isActiveRunStatus(runStatus) {
+  return runStatus === "queued" || runStatus === "running";
+}
+
+function describeActiveRun(data) {
+  if (data.status === "queued") {
+    return data.queuePosition
+      ? `Queued: position ${data.queuePosition} for the next free worker.`
+      : "Queued: waiting for a free worker.";
+  }
+  return data.message || "Run in progress.";
+}
+
 function syncConeTrackerToUiContext(runStatus) {
-  if (runStatus === "running") {
+  if (isActiveRunStatus(runStatus)) {
     updateConeTracker("running");
     return;
   }
@@ -1283,8 +1305,13 @@ function getReviewReferencePoint(step) {
 
 function getNearbyContextCrashes(step, limit = 3) {
   const referencePoint = getReviewReferencePoint(step);
-  const contextCrashes = (state.reviewMapData && state.reviewMapData.contextCrashes) || [];
-  if (!referencePoint || !contextCrashes.length) return [];
+  if (!referencePoint) return [];
+  const contextKey = `${referencePoint.latitude},${referencePoint.longitude}`;
+  const contextCrashes = state.reviewContextCrashes[contextKey];
+  if (!contextCrashes) {
+    fetchReviewContextCrashes(contextKey, referencePoint);
+    return [];
+  }
 
   return contextCrashes
     .map((crash) => ({
@@ -1300,6 +1327,34 @@ function getNearbyContextCrashes(step, limit = 3) {
     .slice(0, limit);
 }
 
+async function fetchReviewContextCrashes(contextKey, referencePoint) {
+  const runId = state.runId;
+  if (!runId || contextKey in state.reviewContextCrashes) return;
+  // Mark the box as pending so re-renders do not request it again.
+  state.reviewContextCrashes[contextKey] = null;
+  const params = new URLSearchParams({
+    south: referencePoint.latitude - REVIEW_CONTEXT_RADIUS_DEGREES,
+    west: referencePoint.longitude - REVIEW_CONTEXT_RADIUS_DEGREES,
+    north: referencePoint.latitude + REVIEW_CONTEXT_RADIUS_DEGREES,
+    east: referencePoint.longitude + REVIEW_CONTEXT_RADIUS_DEGREES,
+  });
+  try {
+    const response = await fetch(`/api/run/${runId}/review-wizard/context?${params}`);
+    const data = response.ok ? await parseJsonSafe(response) : null;
+    if (runId !== state.runId) return;
+    state.reviewContextCrashes[contextKey] = (data && data.crashes) || [];
+  } catch (_error) {
+    if (runId !== state.runId) return;
+    state.reviewContextCrashes[contextKey] = [];
+  }
+  const current = getCurrentReviewStep();
+  const currentPoint = current ? getReviewReferencePoint(current) : null;
+  if (currentPoint && `${currentPoint.latitude},${currentPoint.longitude}` === contextKey) {
+    state.reviewMapPreserveView = true;
+    renderReviewQueue();
+  }
+}
+
 function getReviewRouteContext(step) {
   if (!step) return "Route and intersection context appears here.";
   const parts = [step.title, step.detail].filter((part) => String(part || "").trim());
@@ -1421,22 +1476,32 @@ function pointInRing(point, ring) {
   return inside;
 }
 
-function pointInProjectBoundary(latitude, longitude) {
-  const polygon = state.reviewMapData && Array.isArray(state.reviewMapData.polygon)
-    ? state.reviewMapData.polygon
-    : [];
-  if (!polygon.length) return true;
-  if (!pointInRing([latitude, longitude], polygon[0])) {
+function boundaryPolygons(polygon) {
+  // Multi-polygon boundaries arrive as a list of [outer, ...holes] polygons.
+  const isMulti = polygon.length && polygon[0].length && Array.isArray(polygon[0][0][0]);
+  return isMulti ? polygon : [polygon];
+}
+
+function pointInPolygonRings(point, rings) {
+  if (!rings.length || !pointInRing(point, rings[0])) {
     return false;
   }
-  for (let index = 1; index < polygon.length; index += 1) {
-    if (pointInRing([latitude, longitude], polygon[index])) {
+  for (let index = 1; index < rings.length; index += 1) {
+    if (pointInRing(point, rings[index])) {
       return false;
     }
   }
   return true;
 }
 
+function pointInProjectBoundary(latitude, longitude) {
+  const polygon = state.reviewMapData && Array.isArray(state.reviewMapData.polygon)
+    ? state.reviewMapData.polygon
+    : [];
+  if (!polygon.length) return true;
+  return boundaryPolygons(polygon).some((rings) => pointInPolygonRings([latitude, longitude], rings));
+}
+
 function resetReviewMap() {
   if (!state.reviewMap) return;
   try {
@@ -1595,8 +1660,9 @@ function renderReviewMap() {
     const draftPlacement = getDraftPlacement(current);
     const decisionPlacement = getDecisionPlacement(current);
     const activePlacement = draftPlacement || decisionPlacement;
-    const boundaryBounds = polygon.length && polygon[0].length
-      ? window.L.latLngBounds(polygon[0])
+    const outerRings = boundaryPolygons(polygon).map((rings) => rings[0] || []).filter((ring) => ring.length);
+    const boundaryBounds = outerRings.length
+      ? window.L.latLngBounds(outerRings.flat())
       : null;
 
     if (!state.reviewMap._loaded && !state.reviewMapPreserveView) {
@@ -2062,6 +2128,16 @@ function renderReviewQueue() {
   updateBrowserReviewButton();
 }
 
+function appendReviewSteps(steps) {
+  steps.forEach((step) => {
+    if (String(step.reviewBucket || "primary") === "secondary") {
+      state.reviewSecondaryQueue.push(step);
+    } else {
+      state.reviewQueue.push(step);
+    }
+  });
+}
+
 async function fetchReviewQueue(runId) {
   if (!runId) {
     state.reviewQueue = [];
@@ -2079,7 +2155,12 @@ async function fetchReviewQueue(runId) {
     return;
   }
   try {
-    const response = await fetch(`/api/run/${runId}/review-wizard`);
+    // The first page and the map render the wizard; later pages stream in behind it.
+    const loadId = ++state.reviewLoadId;
+    const [response, mapResponse] = await Promise.all([
+      fetch(`/api/run/${runId}/review-wizard/steps?limit=${REVIEW_STEP_PAGE_SIZE}`),
+      fetch(`/api/run/${runId}/review-wizard/map`),
+    ]);
     if (!response.ok) {
       state.reviewQueue = [];
       state.reviewSecondaryQueue = [];
@@ -2096,18 +2177,12 @@ async function fetchReviewQueue(runId) {
       return;
     }
     const data = await parseJsonSafe(response);
-    state.reviewQueue = data.primarySteps || [];
-    state.reviewSecondaryQueue = data.secondarySteps || [];
-    state.reviewMapData = data.mapData || null;
-    const validKeys = new Set(
-      [...state.reviewQueue, ...state.reviewSecondaryQueue].map((step) => step.rowKey)
-    );
-    state.reviewDecisions = Object.fromEntries(
-      Object.entries(state.reviewDecisions).filter(([key]) => validKeys.has(key))
-    );
-    state.reviewDraftPlacements = Object.fromEntries(
-      Object.entries(state.reviewDraftPlacements).filter(([key]) => validKeys.has(key))
-    );
+    const mapData = mapResponse.ok ? await parseJsonSafe(mapResponse) : null;
+    state.reviewQueue = [];
+    state.reviewSecondaryQueue = [];
+    appendReviewSteps(data.steps || []);
+    state.reviewMapData = (mapData && mapData.mapData) || null;
+    state.reviewContextCrashes = {};
     state.currentReviewIndex = 0;
     state.showSecondaryReview = false;
     state.reviewMapPickMode = false;
@@ -2115,6 +2190,30 @@ async function fetchReviewQueue(runId) {
     state.reviewExcludeConfirmRow = null;
     setReviewWorkbenchTab("map");
     renderReviewQueue();
+
+    let cursor = data.nextCursor;
+    while (cursor != null) {
+      const pageResponse = await fetch(
+        `/api/run/${runId}/review-wizard/steps?limit=${REVIEW_STEP_PAGE_SIZE}&cursor=${encodeURIComponent(cursor)}`
+      );
+      if (loadId !== state.reviewLoadId || runId !== state.runId) return;
+      if (!pageResponse.ok) break;
+      const page = await parseJsonSafe(pageResponse);
+      appendReviewSteps(page.steps || []);
+      cursor = page.nextCursor;
+    }
+    if (loadId !== state.reviewLoadId || runId !== state.runId) return;
+    const validKeys = new Set(getAllReviewSteps().map((step) => step.rowKey));
+    state.reviewDecisions = Object.fromEntries(
+      Object.entries(state.reviewDecisions).filter(([key]) => validKeys.has(key))
+    );
+    state.reviewDraftPlacements = Object.fromEntries(
+      Object.entries(state.reviewDraftPlacements).filter(([key]) => validKeys.has(key))
+    );
+    if (data.nextCursor != null) {
+      state.reviewMapPreserveView = true;
+      renderReviewQueue();
+    }
   } catch (_error) {
     state.reviewQueue = [];
     state.reviewSecondaryQueue = [];
@@ -2319,7 +2418,7 @@ async function startRun() {
     saveUiSession();
     await pollLogs();
     if (!state.pollTimer && el.statusBar.dataset.state === "running") {
-      state.pollTimer = window.setInterval(pollLogs, 1200);
+      watchRunUpdates();
     }
   } catch (_error) {
     handleRunConnectionFailure(
@@ -2380,7 +2479,7 @@ async function startApplyReview() {
     saveUiSession();
     await pollLogs();
     if (!state.pollTimer && el.statusBar.dataset.state === "running") {
-      state.pollTimer = window.setInterval(pollLogs, 1200);
+      watchRunUpdates();
     }
   } catch (_error) {
     handleRunConnectionFailure(
@@ -2437,7 +2536,7 @@ async function startApplyBrowserReview() {
     saveUiSession();
     await pollLogs();
     if (!state.pollTimer && el.statusBar.dataset.state === "running") {
-      state.pollTimer = window.setInterval(pollLogs, 1200);
+      watchRunUpdates();
     }
   } catch (_error) {
     handleRunConnectionFailure(
@@ -2479,7 +2578,7 @@ async function startRelabel() {
     }
     await pollLogs();
     if (!state.pollTimer && el.statusBar.dataset.state === "running") {
-      state.pollTimer = window.setInterval(pollLogs, 1200);
+      watchRunUpdates();
     }
   } catch (_error) {
     handleRunConnectionFailure(
@@ -2715,6 +2814,46 @@ function syncConeCalcTimer(milestoneId, phase) {
   }, intervalMs);
 }
 
+function watchRunUpdates() {
+  if (state.pollTimer || !state.runId) return;
+  if (typeof window.EventSource !== "function") {
+    state.pollTimer = window.setInterval(pollLogs, 1200);
+    return;
+  }
+  const source = new EventSource(`/api/run/${state.runId}/events?since=${state.logSeq}`);
+  state.pollTimer = source;
+  source.addEventListener("log", (event) => {
+    const entry = JSON.parse(event.data);
+    if (entry.seq <= state.logSeq) return;
+    state.logSeq = entry.seq;
+    appendLog([entry]);
+  });
+  source.addEventListener("status", (event) => {
+    const data = JSON.parse(event.data);
+    if (!isActiveRunStatus(data.status)) return;
+    if (data.message || data.status === "queued") {
+      el.statusDetail.textContent = describeActiveRun(data);
+      el.snapshotStatus.textContent = describeActiveRun(data);
+    }
+    updateConeTracker("running");
+  });
+  source.addEventListener("done", async (event) => {
+    const data = JSON.parse(event.data);
+    clearPollingTimer();
+    await finalizeRun(data.status);
+  });
+  source.addEventListener("gone", () => {
+    clearPollingTimer();
+    pollLogs();
+  });
+  source.onerror = () => {
+    // EventSource reconnects on its own (resuming from the last log id) unless
+    // the server refused the stream outright; fall back to polling then.
+    if (source.readyState !== EventSource.CLOSED || state.pollTimer !== source) return;
+    state.pollTimer = window.setInterval(pollLogs, 1200);
+  };
+}
+
 async function pollLogs() {
   if (!state.runId) return;
   try {
@@ -2733,14 +2872,14 @@ async function pollLogs() {
     const data = await parseJsonSafe(response);
     state.logSeq = data.lastSeq || state.logSeq;
     appendLog(data.entries || []);
-    if (data.status === "running" && data.message) {
-      el.statusDetail.textContent = data.message;
-      el.snapshotStatus.textContent = data.message;
+    if (isActiveRunStatus(data.status) && (data.message || data.status === "queued")) {
+      el.statusDetail.textContent = describeActiveRun(data);
+      el.snapshotStatus.textContent = describeActiveRun(data);
     }
-    if (data.status === "running") {
+    if (isActiveRunStatus(data.status)) {
       updateConeTracker("running");
     }
-    if (data.status && data.status !== "running") {
+    if (data.status && !isActiveRunStatus(data.status)) {
       clearPollingTimer();
       await finalizeRun(data.status);
     }
@@ -2961,19 +3100,19 @@ async function restoreUiSession() {
     } else {
       setUiStage("inputs", { persist: false });
     }
-    if (data.status === "running") {
+    if (isActiveRunStatus(data.status)) {
       const runKind = (data.inputs && data.inputs.runKind) || "refine";
       const runningTitle = runKind === "relabel"
         ? "Regenerating labels"
         : (runKind === "review" ? "Applying review decisions" : "Refinement running");
-      setStatus("running", runningTitle, data.message || "Run in progress.");
-      el.snapshotTag.textContent = "Running";
-      el.snapshotStatus.textContent = data.message || "Run in progress.";
+      setStatus("running", runningTitle, describeActiveRun(data));
+      el.snapshotTag.textContent = data.status === "queued" ? "Queued" : "Running";
+      el.snapshotStatus.textContent = describeActiveRun(data);
       setProgressRunning(true);
       state.logSeq = 0;
       await pollLogs();
       if (!state.pollTimer) {
-        state.pollTimer = window.setInterval(pollLogs, 1200);
+        watchRunUpdates();
       }
     } else {
       const runKind = (data.inputs && data.inputs.runKind) || "refine";
@@ -3018,7 +3157,7 @@ async function restoreUiSession() {
     updateStageAvailability();
     updateRunButton();
     updateLabelOrderControls();
-    if (data.status === "running") {
+    if (isActiveRunStatus(data.status)) {
       setUiBusy(true);
     }
     renderStageChrome();
@@ -3260,7 +3399,7 @@ function bindInputs() {
     el.dataLabel.textContent = "Crash spreadsheet (.csv, .xlsx)";
     el.dataHint.textContent = "Drop file or click to browse";
     el.kmzLabel.textContent = "Boundary KMZ (.kmz)";
-    el.kmzHint.textContent = "One polygon only";
+    el.kmzHint.textContent = "Polygons or MultiGeometry";
     el.reviewLabel.textContent = "Reviewed coordinate workbook";
     el.reviewHint.textContent = "Upload a reviewed workbook";
     updateColumnOptions([]);
@@ -1,6 +1,7 @@
 """File-input helpers for the Flask web surface."""
 from __future__ import annotations
 
+import os
 import shutil
 from pathlib import Path
 from typing import Any, Tuple
@@ -28,9 +29,17 @@ def save_upload(
 
 
 def copy_input_file(source: Path, *, dest_dir: Path, label: str) -> Path:
+    """Hard-link *source* into *dest_dir*, copying only when linking fails.
+
+    Run inputs are never modified in place, so runs can share one copy.
+    """
     if not source.exists():
         raise ValueError(f"{label} was not found.")
     dest_dir.mkdir(parents=True, exist_ok=True)
     target = dest_dir / source.name
-    shutil.copy2(source, target)
+    target.unlink(missing_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
     return target
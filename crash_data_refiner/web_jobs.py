@@ -0,0 +1,210 @@
+"""Bounded job scheduler for web refinement and relabel runs.
+
+Jobs wait in one FIFO queue per user. Each free worker goes to the waiting
+user with the fewest running jobs (round-robin among ties), so a user who
+submits many runs cannot starve everyone else. At most
+``workers`` jobs run at once. With a shared (SQLite) run store the jobs run in
+worker processes and reload their ``RunState`` from the store by id; with the
+in-memory store they run on worker threads, because process-local run state
+cannot be shared with another process.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .web_state import utcnow
+from .web_store import MEMORY_STORE_SPEC, open_run_store
+
+
+@dataclass
+class _Job:
+    run_id: str
+    user: str
+    target: Callable[..., None]
+    args: Tuple[Any, ...] = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+def _execute_job(
+    store_spec: str,
+    run_id: str,
+    target: Callable[..., None],
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+) -> None:
+    """Worker entry point: load the run by id and hand it to *target*."""
+    state = open_run_store(store_spec).get(run_id)
+    if state is None:
+        return
+    target(state, *args, **kwargs)
+
+
+class JobScheduler:
+    """Queue runs per user and execute them on a bounded worker pool."""
+
+    def __init__(self, store_spec: str, *, workers: int, use_processes: Optional[bool] = None) -> None:
+        if workers < 1:
+            raise ValueError("Job scheduler needs at least one worker.")
+        if use_processes is None:
+            use_processes = store_spec.strip().lower() != MEMORY_STORE_SPEC
+        self.store_spec = store_spec
+        self.workers = workers
+        self.use_processes = use_processes
+        # Re-entrant: a future that finishes before its callback is attached
+        # runs the callback (and the next dispatch) on the submitting thread.
+        self._lock = threading.RLock()
+        self._queues: "OrderedDict[str, Deque[_Job]]" = OrderedDict()
+        self._running: Dict[str, Tuple[str, Future]] = {}
+        self._last_served: Dict[str, int] = {}
+        self._dispatched = 0
+        self._executor: Optional[Executor] = None
+
+    def submit(
+        self,
+        run_id: str,
+        target: Callable[..., None],
+        *args: Any,
+        user: str = "",
+        **kwargs: Any,
+    ) -> bool:
+        """Queue *target* for *run_id*; it is called as ``target(state, *args, **kwargs)``.
+
+        Returns ``False`` without queueing anything when *run_id* already has a
+        queued or running job, so one run never has two jobs writing its outputs.
+        """
+        job = _Job(run_id=run_id, user=user or "anonymous", target=target, args=args, kwargs=kwargs)
+        with self._lock:
+            if self._is_active_locked(run_id):
+                return False
+            self._queues.setdefault(job.user, deque()).append(job)
+            self._dispatch_locked()
+        return True
+
+    def position(self, run_id: str) -> Optional[int]:
+        """Return the 1-based dispatch position of a queued run, or ``None``."""
+        with self._lock:
+            for index, job in enumerate(self._dispatch_order_locked(), start=1):
+                if job.run_id == run_id:
+                    return index
+        return None
+
+    def is_running(self, run_id: str) -> bool:
+        with self._lock:
+            return run_id in self._running
+
+    def is_active(self, run_id: str) -> bool:
+        """Return whether *run_id* has a job that is queued or running."""
+        with self._lock:
+            return self._is_active_locked(run_id)
+
+    def cancel(self, run_id: str) -> bool:
+        """Drop a queued run. Returns ``False`` if it already started or is unknown."""
+        with self._lock:
+            for user, queue in self._queues.items():
+                for job in queue:
+                    if job.run_id == run_id:
+                        queue.remove(job)
+                        if not queue:
+                            del self._queues[user]
+                        return True
+        return False
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        with self._lock:
+            self._queues.clear()
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _is_active_locked(self, run_id: str) -> bool:
+        return run_id in self._running or any(job.run_id == run_id for queue in self._queues.values() for job in queue)
+
+    def _dispatch_order_locked(self) -> List[_Job]:
+        queues: "OrderedDict[str, Deque[_Job]]" = OrderedDict(
+            (user, deque(queue)) for user, queue in self._queues.items()
+        )
+        active = self._active_counts_locked()
+        last_served = dict(self._last_served)
+        order: List[_Job] = []
+        while queues:
+            order.append(_take_next(queues, active, last_served, self._dispatched + len(order)))
+        return order
+
+    def _dispatch_locked(self) -> None:
+        while self._queues and len(self._running) < self.workers:
+            job = _take_next(self._queues, self._active_counts_locked(), self._last_served, self._dispatched)
+            self._dispatched += 1
+            call = (_execute_job, self.store_spec, job.run_id, job.target, job.args, job.kwargs)
+            try:
+                future = self._pool_locked().submit(*call)
+            except BrokenProcessPool:
+                self._executor = None
+                future = self._pool_locked().submit(*call)
+            self._running[job.run_id] = (job.user, future)
+            future.add_done_callback(lambda done, run_id=job.run_id: self._finished(run_id, done))
+
+    def _active_counts_locked(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for user, _future in self._running.values():
+            counts[user] = counts.get(user, 0) + 1
+        return counts
+
+    def _pool_locked(self) -> Executor:
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context("spawn"))
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="cdr-job")
+        return self._executor
+
+    def _finished(self, run_id: str, future: Future) -> None:
+        error = None if future.cancelled() else future.exception()
+        if error is not None:
+            _mark_failed(self.store_spec, run_id, error)
+        with self._lock:
+            user, _future = self._running.pop(run_id, (None, None))
+            if user not in self._queues and user not in self._active_counts_locked():
+                self._last_served.pop(user, None)
+            if isinstance(error, BrokenProcessPool):
+                self._executor = None
+            self._dispatch_locked()
+
+
+def _take_next(
+    queues: "OrderedDict[str, Deque[_Job]]",
+    active: Dict[str, int],
+    last_served: Dict[str, int],
+    tick: int,
+) -> _Job:
+    """Pop the next job fairly and record it as running for its user.
+
+    The user with the fewest running jobs goes first; ties go to the user
+    served least recently, then to the user who queued first.
+    """
+    user = min(queues, key=lambda name: (active.get(name, 0), last_served.get(name, -1)))
+    queue = queues[user]
+    job = queue.popleft()
+    if not queue:
+        del queues[user]
+    active[user] = active.get(user, 0) + 1
+    last_served[user] = tick
+    return job
+
+
+def _mark_failed(store_spec: str, run_id: str, error: BaseException) -> None:
+    """Record a job that died outside its own error handling (e.g. a crashed worker)."""
+    state = open_run_store(store_spec).get(run_id)
+    if state is None or state.status not in {"queued", "running"}:
+        return
+    state.status = "error"
+    state.error = str(error) or type(error).__name__
+    state.message = "Run worker stopped unexpectedly."
+    state.finished_at = utcnow()
+    state.append_log(f"Error: {state.error}", level="error")
+    state.save()
@@ -1,9 +1,13 @@
 """Coordinate-review helpers for the Flask web surface."""
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 from zipfile import BadZipFile
 
 from .coordinate_recovery import (
@@ -11,10 +15,10 @@ from .coordinate_recovery import (
     build_coordinate_review_queue,
     build_coordinate_review_wizard_steps,
 )
-from .geo import is_usable_coordinate_pair, load_kmz_polygon, parse_coordinate
+from .geo import MultiPolygonBoundary, is_usable_coordinate_pair, load_kmz_boundary, parse_coordinate
 from .normalize import normalize_header
 from .output_paths import coordinate_review_output_path, refined_output_path
-from .spreadsheets import read_spreadsheet
+from .spreadsheets import open_spreadsheet, read_spreadsheet
 
 
 _REVIEW_ID_KEYS = ("crash_id", "master_record_number", "local_code")
@@ -28,6 +32,11 @@ _REVIEW_CROSS_KEYS = (
 )
 _REVIEW_LOCALITY_KEYS = ("city", "township", "county")
 
+REVIEW_STEP_PAGE_SIZE = 100
+REVIEW_CONTEXT_LIMIT = 500
+# Review indexes kept in memory; one per recently viewed run.
+_REVIEW_INDEX_CACHE_SIZE = 16
+
 
 def _normalize_review_row(row: Dict[str, Any]) -> Dict[str, Any]:
     return {normalize_header(key): value for key, value in row.items()}
@@ -41,6 +50,17 @@ def _first_review_text(row: Dict[str, Any], keys: tuple[str, ...]) -> str:
     return ""
 
 
+def _review_context_headers(headers: List[str]) -> List[str]:
+    """Return the refined-output headers the map context popups read."""
+    wanted = {*_REVIEW_ID_KEYS, *_REVIEW_ROUTE_KEYS, *_REVIEW_CROSS_KEYS, *_REVIEW_LOCALITY_KEYS}
+    selected: Dict[str, str] = {}
+    for header in headers:
+        key = normalize_header(header)
+        if header and key in wanted:
+            selected[key] = header
+    return list(selected.values())
+
+
 def _build_context_crash(row: Dict[str, Any], *, latitude: float, longitude: float) -> Dict[str, Any]:
     route = _first_review_text(row, _REVIEW_ROUTE_KEYS)
     cross = _first_review_text(row, _REVIEW_CROSS_KEYS)
@@ -81,7 +101,9 @@ def load_review_queue_for_state(state: Any) -> List[Dict[str, Any]]:
     return build_coordinate_review_queue(data.rows)
 
 
-def polygon_to_leaflet(polygon: Any) -> List[List[List[float]]]:
+def polygon_to_leaflet(polygon: Any) -> List[Any]:
+    if isinstance(polygon, MultiPolygonBoundary):
+        return [polygon_to_leaflet(part) for part in polygon.parts]
     outer = [[lat, lon] for lon, lat in polygon.outer]
     holes = [[[lat, lon] for lon, lat in ring] for ring in polygon.holes]
     if holes:
@@ -89,9 +111,183 @@ def polygon_to_leaflet(polygon: Any) -> List[List[List[float]]]:
     return [outer]
 
 
-def load_review_map_data_for_state(state: Any) -> Optional[Dict[str, Any]]:
+@dataclass(frozen=True)
+class ReviewIndex:
+    """Review-wizard data for one run, built once from its output files.
+
+    ``steps`` holds every primary step, then every secondary step, in wizard
+    order, and ``step_positions`` maps each filter value to the positions that
+    carry it, so pages are served without rereading the review workbook.
+    ``context_crashes`` (refined crashes for map popups) is sorted by latitude
+    so viewport queries only scan the matching latitude band.
+    """
+
+    steps: List[Dict[str, Any]]
+    primary_step_count: int
+    step_positions: Dict[Tuple[str, str], List[int]]
+    map_data: Optional[Dict[str, Any]]
+    context_crashes: List[Dict[str, Any]]
+    context_latitudes: List[float]
+
+    @property
+    def secondary_step_count(self) -> int:
+        return len(self.steps) - self.primary_step_count
+
+    def page_steps(
+        self,
+        *,
+        cursor: int = 0,
+        limit: int = REVIEW_STEP_PAGE_SIZE,
+        bucket: str = "",
+        confidence: str = "",
+        group: str = "",
+    ) -> Tuple[List[Dict[str, Any]], Optional[int], int]:
+        """Return ``(steps, next cursor or None, matching step count)``."""
+        requested = (("bucket", bucket), ("confidence", confidence), ("group", group))
+        filters = [(name, value) for name, value in requested if value]
+        if filters:
+            candidate_lists = [self.step_positions.get(key, []) for key in filters]
+            positions = min(candidate_lists, key=len)
+            for other in candidate_lists:
+                if other is not positions:
+                    allowed = set(other)
+                    positions = [position for position in positions if position in allowed]
+        else:
+            positions = range(len(self.steps))
+        page = [self.steps[position] for position in positions[cursor:cursor + limit]]
+        next_cursor = cursor + limit if cursor + limit < len(positions) else None
+        return page, next_cursor, len(positions)
+
+    def context_in(
+        self,
+        *,
+        south: float,
+        west: float,
+        north: float,
+        east: float,
+        limit: int = REVIEW_CONTEXT_LIMIT,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Return ``(up to *limit* crashes inside the box, total inside the box)``."""
+        start = bisect_left(self.context_latitudes, south)
+        end = bisect_right(self.context_latitudes, north)
+        matches = [crash for crash in self.context_crashes[start:end] if west <= crash["longitude"] <= east]
+        return matches[:limit], len(matches)
+
+
+_REVIEW_INDEX_CACHE: "OrderedDict[str, Tuple[Tuple[Any, ...], ReviewIndex]]" = OrderedDict()
+# Guards the cache and the build-lock table only; never held during a build.
+_REVIEW_INDEX_LOCK = threading.Lock()
+# run_id -> (build lock, callers holding or waiting on it). An entry lives only
+# while someone uses it, so it never leaks and is never swapped under a waiter.
+_REVIEW_INDEX_BUILD_LOCKS: Dict[str, Tuple[threading.Lock, int]] = {}
+
+
+def review_index_for_state(state: Any) -> ReviewIndex:
+    """Return the run's :class:`ReviewIndex`, rebuilding it only when its files change.
+
+    Builds hold a per-run lock, so concurrent requests for the same run share
+    one build while other runs keep being served from the cache.
+    """
+    inputs = dict(state.inputs or {})
+    signature = (
+        str(state.output_dir),
+        tuple(str(inputs.get(name) or "") for name in ("dataFile", "kmzFile", "latColumn", "lonColumn")),
+        tuple(_file_signature(path) for path in _review_source_paths(state)),
+    )
+    index = _cached_review_index(state.run_id, signature)
+    if index is not None:
+        return index
+    with _REVIEW_INDEX_LOCK:
+        build_lock, users = _REVIEW_INDEX_BUILD_LOCKS.get(state.run_id, (threading.Lock(), 0))
+        _REVIEW_INDEX_BUILD_LOCKS[state.run_id] = (build_lock, users + 1)
+    try:
+        with build_lock:
+            index = _cached_review_index(state.run_id, signature)
+            if index is not None:
+                return index
+            index = _build_review_index(state)
+            with _REVIEW_INDEX_LOCK:
+                _REVIEW_INDEX_CACHE[state.run_id] = (signature, index)
+                _REVIEW_INDEX_CACHE.move_to_end(state.run_id)
+                while len(_REVIEW_INDEX_CACHE) > _REVIEW_INDEX_CACHE_SIZE:
+                    _REVIEW_INDEX_CACHE.popitem(last=False)
+        return index
+    finally:
+        with _REVIEW_INDEX_LOCK:
+            _lock, users = _REVIEW_INDEX_BUILD_LOCKS[state.run_id]
+            if users == 1:
+                del _REVIEW_INDEX_BUILD_LOCKS[state.run_id]
+            else:
+                _REVIEW_INDEX_BUILD_LOCKS[state.run_id] = (build_lock, users - 1)
+
+
+def _cached_review_index(run_id: str, signature: Tuple[Any, ...]) -> Optional[ReviewIndex]:
+    with _REVIEW_INDEX_LOCK:
+        cached = _REVIEW_INDEX_CACHE.get(run_id)
+        if cached is None or cached[0] != signature:
+            return None
+        _REVIEW_INDEX_CACHE.move_to_end(run_id)
+        return cached[1]
+
+
+def _review_source_paths(state: Any) -> List[Optional[Path]]:
     if not state.output_dir:
+        return []
+    inputs = dict(state.inputs or {})
+    data_name = str(inputs.get("dataFile") or "").strip()
+    kmz_name = str(inputs.get("kmzFile") or "").strip()
+    refined_path = refined_output_path(state.output_dir, data_name) if data_name else None
+    return [
+        coordinate_review_output_path(refined_path) if refined_path else None,
+        refined_path,
+        state.output_dir / "inputs" / kmz_name if kmz_name else None,
+    ]
+
+
+def _file_signature(path: Optional[Path]) -> Optional[Tuple[int, int]]:
+    if path is None:
+        return None
+    try:
+        stat = path.stat()
+    except OSError:
         return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _build_review_index(state: Any) -> ReviewIndex:
+    steps: List[Dict[str, Any]] = []
+    review_path = resolve_coordinate_review_path(state)
+    if review_path is not None:
+        try:
+            steps = build_coordinate_review_wizard_steps(read_spreadsheet(str(review_path)).rows)
+        except (BadZipFile, OSError, ValueError):
+            steps = []
+    primary = [step for step in steps if str(step.get("reviewBucket") or "primary") != "secondary"]
+    secondary = [step for step in steps if str(step.get("reviewBucket") or "primary") == "secondary"]
+    ordered = primary + secondary
+
+    step_positions: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+    for position, step in enumerate(ordered):
+        step_positions[("bucket", "secondary" if position >= len(primary) else "primary")].append(position)
+        step_positions[("confidence", str(step.get("confidence") or ""))].append(position)
+        step_positions[("group", str(step.get("groupKey") or ""))].append(position)
+
+    map_data, context_crashes = (None, []) if review_path is None else _load_review_map(state)
+    context_crashes.sort(key=lambda crash: crash["latitude"])
+    return ReviewIndex(
+        steps=ordered,
+        primary_step_count=len(primary),
+        step_positions=dict(step_positions),
+        map_data=map_data,
+        context_crashes=context_crashes,
+        context_latitudes=[crash["latitude"] for crash in context_crashes],
+    )
+
+
+def _load_review_map(state: Any) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Return the boundary and refined points for the map, plus popup context crashes."""
+    if not state.output_dir:
+        return None, []
 
     inputs = dict(state.inputs or {})
     data_name = str(inputs.get("dataFile") or "").strip()
@@ -99,69 +295,52 @@ def load_review_map_data_for_state(state: Any) -> Optional[Dict[str, Any]]:
     lat_column = str(inputs.get("latColumn") or "").strip()
     lon_column = str(inputs.get("lonColumn") or "").strip()
     if not data_name or not kmz_name or not lat_column or not lon_column:
-        return None
+        return None, []
 
     input_dir = state.output_dir / "inputs"
     kmz_path = input_dir / kmz_name
     refined_path = refined_output_path(state.output_dir, data_name)
     if not kmz_path.exists() or not refined_path.exists():
-        return None
+        return None, []
 
-    boundary = load_kmz_polygon(str(kmz_path))
-    try:
-        refined_data = read_spreadsheet(str(refined_path))
-    except (BadZipFile, OSError, ValueError):
-        return None
-    lat_key = normalize_header(lat_column)
-    lon_key = normalize_header(lon_column)
+    boundary = load_kmz_boundary(str(kmz_path))
     points: List[List[float]] = []
     context_crashes: List[Dict[str, Any]] = []
-    for row in refined_data.rows:
-        normalized_row = _normalize_review_row(row)
-        lat = parse_coordinate(normalized_row.get(lat_key))
-        lon = parse_coordinate(normalized_row.get(lon_key))
-        if not is_usable_coordinate_pair(lat, lon):
-            continue
-        points.append([lat, lon])
-        context_crashes.append(_build_context_crash(normalized_row, latitude=lat, longitude=lon))
+    try:
+        refined_data = open_spreadsheet(str(refined_path))
+        names = [lat_column, lon_column, *_review_context_headers(refined_data.headers)]
+        for values in refined_data.iter_columns(names):
+            lat = parse_coordinate(values[0])
+            lon = parse_coordinate(values[1])
+            if not is_usable_coordinate_pair(lat, lon):
+                continue
+            points.append([lat, lon])
+            context_row = {normalize_header(name): value for name, value in zip(names[2:], values[2:])}
+            context_crashes.append(_build_context_crash(context_row, latitude=lat, longitude=lon))
+    except (BadZipFile, OSError, ValueError):
+        return None, []
 
-    return {
+    map_data = {
         "polygon": polygon_to_leaflet(boundary),
         "points": points,
         "pointCount": len(points),
-        "contextCrashes": context_crashes,
     }
+    return map_data, context_crashes
 
 
-def load_review_wizard_for_state(state: Any) -> Dict[str, Any]:
-    review_path = resolve_coordinate_review_path(state)
-    if review_path is None:
-        return {
-            "primarySteps": [],
-            "secondarySteps": [],
-            "mapData": None,
-        }
+def load_review_map_data_for_state(state: Any) -> Optional[Dict[str, Any]]:
+    index = review_index_for_state(state)
+    if index.map_data is None:
+        return None
+    return {**index.map_data, "contextCrashes": index.context_crashes}
 
-    try:
-        data = read_spreadsheet(str(review_path))
-    except (BadZipFile, OSError, ValueError):
-        return {
-            "primarySteps": [],
-            "secondarySteps": [],
-            "mapData": load_review_map_data_for_state(state),
-        }
-    steps = build_coordinate_review_wizard_steps(data.rows)
-    primary_steps = [
-        step for step in steps
-        if str(step.get("reviewBucket") or "primary") != "secondary"
-    ]
-    secondary_steps = [
-        step for step in steps
-        if str(step.get("reviewBucket") or "primary") == "secondary"
-    ]
+
+def load_review_wizard_for_state(state: Any) -> Dict[str, Any]:
+    """Every step plus map data in one payload; the paged endpoints read the same index."""
+    index = review_index_for_state(state)
     return {
-        "primarySteps": primary_steps,
-        "secondarySteps": secondary_steps,
+        "primarySteps": index.steps[:index.primary_step_count],
+        "secondarySteps": index.steps[index.primary_step_count:],
         "mapData": load_review_map_data_for_state(state),
     }
 
@@ -1,17 +1,58 @@
 """Run-state models and registry helpers for the Flask web surface."""
 from __future__ import annotations
 
+import shutil
 import threading
 import uuid
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from .web_store import RunStore
 
 
 MAX_LOG_ENTRIES = 1500
 
 
+class RunEvents:
+    """Process-wide change notifications for runs, keyed by run id.
+
+    Every log append or state save bumps the run's version and wakes waiting
+    event streams. Changes made in another process (worker processes writing
+    to a shared store) do not notify; waiters pick those up when their wait
+    times out.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._versions: Dict[str, int] = {}
+
+    def version(self, run_id: str) -> int:
+        with self._condition:
+            return self._versions.get(run_id, 0)
+
+    def notify(self, run_id: str) -> None:
+        with self._condition:
+            self._versions[run_id] = self._versions.get(run_id, 0) + 1
+            self._condition.notify_all()
+
+    def wait(self, run_id: str, seen_version: int, timeout: float) -> int:
+        """Block until the run changes after *seen_version* or *timeout* elapses."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._versions.get(run_id, 0) != seen_version, timeout)
+            return self._versions.get(run_id, 0)
+
+    def forget(self, run_id: str) -> None:
+        with self._condition:
+            self._versions.pop(run_id, None)
+            self._condition.notify_all()
+
+
+RUN_EVENTS = RunEvents()
+
+
 @dataclass
 class RunState:
     run_id: str
@@ -28,7 +69,14 @@ class RunState:
     log_entries: List[Dict[str, Any]] = field(default_factory=list)
     log_seq: int = 0
     last_log: str = ""
-    lock: threading.Lock = field(default_factory=threading.Lock)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    store: Optional["RunStore"] = field(default=None, repr=False, compare=False)
+
+    def save(self) -> None:
+        """Persist the current fields to the run store, if attached."""
+        if self.store is not None:
+            self.store.save(self)
+        RUN_EVENTS.notify(self.run_id)
 
     def append_log(self, text: str, *, level: str = "info") -> None:
         if not text:
@@ -38,27 +86,32 @@ class RunState:
             return
         now = utcnow().isoformat()
         with self.lock:
+            entries: List[Dict[str, Any]] = []
             for line in lines:
                 self.log_seq += 1
-                entry = {
+                entries.append({
                     "seq": self.log_seq,
                     "ts": now,
                     "level": level,
                     "text": line,
-                }
-                self.log_entries.append(entry)
+                })
                 self.last_log = line
-            if len(self.log_entries) > MAX_LOG_ENTRIES:
-                overflow = len(self.log_entries) - MAX_LOG_ENTRIES
-                del self.log_entries[:overflow]
-
-    def log_since(self, seq: int) -> List[Dict[str, Any]]:
+            if self.store is not None:
+                self.store.append_logs(self, entries)
+            else:
+                self.log_entries.extend(entries)
+                if len(self.log_entries) > MAX_LOG_ENTRIES:
+                    overflow = len(self.log_entries) - MAX_LOG_ENTRIES
+                    del self.log_entries[:overflow]
+        RUN_EVENTS.notify(self.run_id)
+
+    def log_since(self, seq: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return retained entries after *seq*, oldest first, at most *limit* of them."""
+        if self.store is not None:
+            return self.store.log_since(self.run_id, seq, limit)
         with self.lock:
-            if seq <= 0:
-                return list(self.log_entries)
-            if self.log_entries and seq < self.log_entries[0]["seq"]:
-                return list(self.log_entries)
-            return [entry for entry in self.log_entries if entry["seq"] > seq]
+            entries = [entry for entry in self.log_entries if entry["seq"] > seq]
+        return entries[:limit] if limit is not None else entries
 
     def snapshot(self) -> Dict[str, Any]:
         return {
@@ -78,10 +131,6 @@ class RunState:
         }
 
 
-RUNS: Dict[str, RunState] = {}
-RUNS_LOCK = threading.Lock()
-
-
 def new_id() -> str:
     return uuid.uuid4().hex
 
@@ -113,7 +162,7 @@ def list_outputs(output_dir: Path) -> List[Dict[str, Any]]:
         return []
     items: List[Dict[str, Any]] = []
     for path in sorted(output_dir.iterdir()):
-        if not path.is_file():
+        if not path.is_file() or path.name.startswith("."):
             continue
         items.append({
             "name": path.name,
@@ -122,14 +171,30 @@ def list_outputs(output_dir: Path) -> List[Dict[str, Any]]:
     return items
 
 
-def create_state() -> RunState:
-    run_id = new_id()
-    state = RunState(run_id=run_id, created_at=utcnow())
-    with RUNS_LOCK:
-        RUNS[run_id] = state
+def create_state(store: "RunStore") -> RunState:
+    state = RunState(run_id=new_id(), created_at=utcnow())
+    store.add(state)
     return state
 
 
-def discard_state(run_id: str) -> None:
-    with RUNS_LOCK:
-        RUNS.pop(run_id, None)
+def discard_state(store: "RunStore", run_id: str) -> None:
+    store.delete(run_id)
+    RUN_EVENTS.forget(run_id)
+
+
+def evict_expired_runs(store: "RunStore", *, ttl: timedelta, output_root: Path) -> List[str]:
+    """Drop runs idle for longer than *ttl* and delete their output folders.
+
+    Only folders inside *output_root* are removed. Returns the evicted run ids.
+    """
+    root = output_root.resolve()
+    evicted = store.evict_expired(utcnow() - ttl)
+    for run_id, output_dir in evicted:
+        RUN_EVENTS.forget(run_id)
+        for folder in {root / run_id, output_dir}:
+            if folder is None:
+                continue
+            folder = folder.resolve()
+            if root in folder.parents and folder.is_dir():
+                shutil.rmtree(folder, ignore_errors=True)
+    return [run_id for run_id, _output_dir in evicted]
@@ -0,0 +1,324 @@
+"""Pluggable run registries for the Flask web surface.
+
+``SqliteRunStore`` is the default: run metadata and logs live in one SQLite
+file, so run history survives restarts and several web worker processes can
+share it. ``InMemoryRunStore`` keeps the old process-local behavior and is
+what the tests use.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+
+from .web_state import MAX_LOG_ENTRIES, RunState, utcnow as _utcnow
+
+
+MEMORY_STORE_SPEC = "memory"
+ACTIVE_STATUSES = ("queued", "running")
+INTERRUPTED_MESSAGE = "Interrupted by a server restart."
+
+
+class RunStore(Protocol):
+    def add(self, state: RunState) -> None: ...
+
+    def save(self, state: RunState) -> None: ...
+
+    def get(self, run_id: str) -> Optional[RunState]: ...
+
+    def delete(self, run_id: str) -> None: ...
+
+    def append_logs(self, state: RunState, entries: Sequence[Dict[str, Any]]) -> None: ...
+
+    def log_since(self, run_id: str, seq: int, limit: Optional[int] = None) -> List[Dict[str, Any]]: ...
+
+    def evict_expired(self, cutoff: datetime) -> List[Tuple[str, Optional[Path]]]: ...
+
+    def active_run_ids(self) -> List[str]: ...
+
+
+def open_run_store(spec: str, *, fail_interrupted: bool = False) -> RunStore:
+    """Return the store named by *spec*: ``"memory"`` or a SQLite file path.
+
+    Stores are shared per spec within a process, so reopening (for example on
+    a module reload) keeps the runs already registered. With
+    *fail_interrupted*, the first open in this process marks runs left queued
+    or running by a previous server as failed (see :func:`fail_interrupted_runs`).
+    """
+    key = spec.strip()
+    with _OPEN_STORES_LOCK:
+        store = _OPEN_STORES.get(key)
+        if store is None:
+            if key.lower() == MEMORY_STORE_SPEC:
+                store = InMemoryRunStore()
+            else:
+                store = SqliteRunStore(Path(key).expanduser())
+                if fail_interrupted:
+                    fail_interrupted_runs(store)
+            _OPEN_STORES[key] = store
+    return store
+
+
+def fail_interrupted_runs(store: RunStore) -> List[str]:
+    """Mark queued and running runs as failed; returns their ids.
+
+    The job queue lives in the server process, so after a restart nothing will
+    ever pick these runs up again. Call this only before the server starts
+    scheduling jobs against *store*.
+    """
+    interrupted: List[str] = []
+    for run_id in store.active_run_ids():
+        state = store.get(run_id)
+        if state is None or state.status not in ACTIVE_STATUSES:
+            continue
+        state.status = "error"
+        state.error = INTERRUPTED_MESSAGE
+        state.message = INTERRUPTED_MESSAGE
+        state.finished_at = _utcnow()
+        state.append_log(f"Error: {INTERRUPTED_MESSAGE}", level="error")
+        state.save()
+        interrupted.append(run_id)
+    return interrupted
+
+
+_OPEN_STORES: Dict[str, RunStore] = {}
+_OPEN_STORES_LOCK = threading.Lock()
+
+
+class InMemoryRunStore:
+    """Process-local store; ``get`` returns the live ``RunState`` objects."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._runs: Dict[str, RunState] = {}
+        self._logs: Dict[str, List[Dict[str, Any]]] = {}
+        self._updated_at: Dict[str, datetime] = {}
+
+    def add(self, state: RunState) -> None:
+        state.store = self
+        with self._lock:
+            self._runs[state.run_id] = state
+            self._logs.setdefault(state.run_id, [])
+            self._updated_at[state.run_id] = state.created_at
+
+    def save(self, state: RunState) -> None:
+        with self._lock:
+            if state.run_id in self._runs:
+                self._updated_at[state.run_id] = _utcnow()
+
+    def get(self, run_id: str) -> Optional[RunState]:
+        with self._lock:
+            return self._runs.get(run_id)
+
+    def delete(self, run_id: str) -> None:
+        with self._lock:
+            self._runs.pop(run_id, None)
+            self._logs.pop(run_id, None)
+            self._updated_at.pop(run_id, None)
+
+    def append_logs(self, state: RunState, entries: Sequence[Dict[str, Any]]) -> None:
+        with self._lock:
+            log = self._logs.setdefault(state.run_id, [])
+            log.extend(dict(entry) for entry in entries)
+            if len(log) > MAX_LOG_ENTRIES:
+                del log[: len(log) - MAX_LOG_ENTRIES]
+            self._updated_at[state.run_id] = _utcnow()
+
+    def log_since(self, run_id: str, seq: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            entries = [dict(entry) for entry in self._logs.get(run_id, []) if entry["seq"] > seq]
+        return entries[:limit] if limit is not None else entries
+
+    def evict_expired(self, cutoff: datetime) -> List[Tuple[str, Optional[Path]]]:
+        with self._lock:
+            expired = [run_id for run_id, updated_at in self._updated_at.items() if updated_at < cutoff]
+            evicted: List[Tuple[str, Optional[Path]]] = []
+            for run_id in expired:
+                state = self._runs.pop(run_id, None)
+                self._logs.pop(run_id, None)
+                self._updated_at.pop(run_id, None)
+                evicted.append((run_id, state.output_dir if state else None))
+        return evicted
+
+    def active_run_ids(self) -> List[str]:
+        with self._lock:
+            return [run_id for run_id, state in self._runs.items() if state.status in ACTIVE_STATUSES]
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    status TEXT NOT NULL,
+    message TEXT NOT NULL,
+    error TEXT,
+    started_at TEXT,
+    finished_at TEXT,
+    output_dir TEXT,
+    inputs TEXT NOT NULL,
+    outputs TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    log_seq INTEGER NOT NULL,
+    last_log TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_updated_at ON runs (updated_at);
+CREATE TABLE IF NOT EXISTS run_logs (
+    run_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    ts TEXT NOT NULL,
+    level TEXT NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (run_id, seq)
+) WITHOUT ROWID;
+"""
+
+_RUN_COLUMNS = (
+    "run_id, created_at, updated_at, status, message, error, started_at, finished_at, "
+    "output_dir, inputs, outputs, summary, log_seq, last_log"
+)
+
+
+class SqliteRunStore:
+    """Run registry in a SQLite file shared by every web worker process.
+
+    Each call opens a short-lived connection, so the store is safe to use
+    from request threads, job threads and separate processes alike. Timestamps
+    are stored as UTC ISO strings, which sort chronologically.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+
+    def add(self, state: RunState) -> None:
+        state.store = self
+        self.save(state)
+
+    def save(self, state: RunState) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                f"INSERT OR REPLACE INTO runs ({_RUN_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    state.run_id,
+                    state.created_at.isoformat(),
+                    _utcnow().isoformat(),
+                    state.status,
+                    state.message,
+                    state.error,
+                    _format_time(state.started_at),
+                    _format_time(state.finished_at),
+                    str(state.output_dir) if state.output_dir else None,
+                    json.dumps(state.inputs),
+                    json.dumps(state.outputs),
+                    json.dumps(state.summary),
+                    state.log_seq,
+                    state.last_log,
+                ),
+            )
+
+    def get(self, run_id: str) -> Optional[RunState]:
+        with self._connect() as connection:
+            row = connection.execute(f"SELECT {_RUN_COLUMNS} FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            return None
+        return RunState(
+            run_id=row["run_id"],
+            created_at=datetime.fromisoformat(row["created_at"]),
+            status=row["status"],
+            message=row["message"],
+            error=row["error"],
+            started_at=_parse_time(row["started_at"]),
+            finished_at=_parse_time(row["finished_at"]),
+            output_dir=Path(row["output_dir"]) if row["output_dir"] else None,
+            inputs=json.loads(row["inputs"]),
+            outputs=json.loads(row["outputs"]),
+            summary=json.loads(row["summary"]),
+            log_seq=row["log_seq"],
+            last_log=row["last_log"],
+            store=self,
+        )
+
+    def delete(self, run_id: str) -> None:
+        with self._connect() as connection:
+            connection.execute("DELETE FROM run_logs WHERE run_id = ?", (run_id,))
+            connection.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+
+    def append_logs(self, state: RunState, entries: Sequence[Dict[str, Any]]) -> None:
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO run_logs (run_id, seq, ts, level, text) VALUES (?, ?, ?, ?, ?)",
+                [(state.run_id, entry["seq"], entry["ts"], entry["level"], entry["text"]) for entry in entries],
+            )
+            connection.execute(
+                "DELETE FROM run_logs WHERE run_id = ? AND seq <= ?",
+                (state.run_id, state.log_seq - MAX_LOG_ENTRIES),
+            )
+            connection.execute(
+                "UPDATE runs SET log_seq = ?, last_log = ?, updated_at = ? WHERE run_id = ?",
+                (state.log_seq, state.last_log, _utcnow().isoformat(), state.run_id),
+            )
+
+    def log_since(self, run_id: str, seq: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT seq, ts, level, text FROM run_logs WHERE run_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+                (run_id, seq, -1 if limit is None else limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def evict_expired(self, cutoff: datetime) -> List[Tuple[str, Optional[Path]]]:
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT run_id, output_dir FROM runs WHERE updated_at < ?",
+                (cutoff.isoformat(),),
+            ).fetchall()
+            run_ids = [(row["run_id"],) for row in rows]
+            connection.executemany("DELETE FROM run_logs WHERE run_id = ?", run_ids)
+            connection.executemany("DELETE FROM runs WHERE run_id = ?", run_ids)
+        return [(row["run_id"], Path(row["output_dir"]) if row["output_dir"] else None) for row in rows]
+
+    def active_run_ids(self) -> List[str]:
+        with self._connect() as connection:
+            rows = connection.execute(
+                f"SELECT run_id FROM runs WHERE status IN ({', '.join('?' for _ in ACTIVE_STATUSES)})",
+                ACTIVE_STATUSES,
+            ).fetchall()
+        return [row["run_id"] for row in rows]
+
+    def _connect(self) -> _Transaction:
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        return _Transaction(connection)
+
+
+class _Transaction:
+    """Commit-and-close wrapper; ``sqlite3.Connection`` alone never closes."""
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        return self.connection
+
+    def __exit__(self, exc_type: Any, exc: Any, traceback: Any) -> None:
+        with closing(self.connection):
+            if exc_type is None:
+                self.connection.commit()
+            else:
+                self.connection.rollback()
+
+
+def _format_time(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
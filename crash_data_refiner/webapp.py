@@ -1,16 +1,22 @@
 from __future__ import annotations
 
+import json
+import multiprocessing
 import os
 import threading
 import tempfile
+import time
+from datetime import timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from flask import Flask, abort, jsonify, request, send_from_directory
+from flask import Flask, Response, abort, jsonify, request, send_from_directory, stream_with_context
 from werkzeug.utils import secure_filename
 
 from .coordinate_recovery import CoordinateReviewDecision, CoordinateRecoveryReport
-from .geo import BoundaryFilterReport, load_kmz_polygon
+from .evidence_library import EvidenceLibrary
+from .geo import BoundaryFilterReport, load_kmz_boundary
+from .input_cache import prune_input_cache as _prune_input_cache
 from .map_report import write_map_report
 from .normalize import guess_lat_lon_columns
 from .refiner import RefinementReport
@@ -23,21 +29,27 @@ from .services import (
 )
 from .spreadsheets import read_spreadsheet_headers, read_spreadsheet_preview_points
 from .web_files import copy_input_file as _copy_input_file, save_upload as _save_upload
+from .web_jobs import JobScheduler
 from .web_review import (
+    REVIEW_CONTEXT_LIMIT,
+    REVIEW_STEP_PAGE_SIZE,
     load_review_queue_for_state as _load_review_queue_for_state,
     load_review_wizard_for_state as _load_review_wizard_for_state,
     parse_review_decisions_payload as _parse_review_decisions_payload,
+    review_index_for_state as _review_index_for_state,
 )
 from .web_state import (
-    RUNS,
-    RUNS_LOCK,
+    RUN_EVENTS,
     RunState,
-    discard_state as _discard_state,
+    create_state as _create_run_state,
+    discard_state as _discard_run_state,
+    evict_expired_runs as _evict_expired_runs,
     format_duration as _format_duration,
     list_outputs as _list_outputs,
     new_id as _new_id,
     utcnow as _utcnow,
 )
+from .web_store import RunStore, open_run_store
 from .web_summary import build_web_run_summary, refresh_web_run_summary_for_relabel
 
 BASE_DIR = Path(__file__).resolve().parents[1]
@@ -58,32 +70,102 @@ def _env_bytes(name: str, default: int) -> int:
     return int(raw_value)
 
 
+def _env_int(name: str, default: int) -> int:
+    raw_value = os.getenv(name, "").strip()
+    if not raw_value:
+        return default
+    return int(raw_value)
+
+
 OUTPUT_ROOT = _env_path("CDR_OUTPUT_ROOT", BASE_DIR / "outputs" / "web_runs")
 PREVIEW_ROOT = _env_path("CDR_PREVIEW_ROOT", OUTPUT_ROOT / "_preview")
+INPUT_CACHE_ROOT = _env_path("CDR_INPUT_CACHE_ROOT", OUTPUT_ROOT / "_input_cache")
+RUN_STORE_SPEC = os.getenv("CDR_RUN_STORE", "").strip() or str(OUTPUT_ROOT / "_runs.sqlite3")
+# Set CDR_EVIDENCE_LIBRARY=off to keep each run's recovery to its own rows.
+EVIDENCE_LIBRARY_SPEC = os.getenv("CDR_EVIDENCE_LIBRARY", "").strip() or str(OUTPUT_ROOT / "_evidence_library.sqlite3")
+RUN_TTL_HOURS = _env_int("CDR_RUN_TTL_HOURS", 7 * 24)
+RUN_EVICTION_INTERVAL_SECONDS = 300
+EVENT_HEARTBEAT_SECONDS = 15.0
+EVENT_STORE_POLL_SECONDS = 1.0
+EVENT_STREAM_MAX_SECONDS = 300.0
+REVIEW_STEP_PAGE_MAX = 500
+REVIEW_CONTEXT_MAX = 2000
+JOB_WORKERS = max(1, _env_int("CDR_JOB_WORKERS", min(4, os.cpu_count() or 1)))
 
 MAX_UPLOAD_BYTES = _env_bytes("CDR_MAX_UPLOAD_BYTES", 200 * 1024 * 1024)
 
+# Job worker processes import this module too; only the server process may
+# fail runs that a previous server left queued or running.
+RUN_STORE: RunStore = open_run_store(
+    RUN_STORE_SPEC,
+    fail_interrupted=multiprocessing.parent_process() is None,
+)
+EVIDENCE_LIBRARY: Optional[EvidenceLibrary] = (
+    None
+    if EVIDENCE_LIBRARY_SPEC.lower() in {"off", "none"}
+    else EvidenceLibrary(Path(EVIDENCE_LIBRARY_SPEC).expanduser())
+)
+JOBS = JobScheduler(RUN_STORE_SPEC, workers=JOB_WORKERS)
+
 app = Flask(__name__, static_folder=str(STATIC_DIR), static_url_path="")
 app.config["MAX_CONTENT_LENGTH"] = MAX_UPLOAD_BYTES
 
+_EVICTION_LOCK = threading.Lock()
+_QUEUE_LOCK = threading.Lock()
+_last_eviction = 0.0
+
+
+def _evict_stale_runs() -> None:
+    """Evict expired runs at most once per eviction interval."""
+    global _last_eviction
+    if RUN_TTL_HOURS <= 0:
+        return
+    now = time.monotonic()
+    with _EVICTION_LOCK:
+        if _last_eviction and now - _last_eviction < RUN_EVICTION_INTERVAL_SECONDS:
+            return
+        _last_eviction = now
+    _evict_expired_runs(RUN_STORE, ttl=timedelta(hours=RUN_TTL_HOURS), output_root=OUTPUT_ROOT)
+    _prune_input_cache(INPUT_CACHE_ROOT, max_age=timedelta(hours=RUN_TTL_HOURS))
+
 
 def _create_state() -> RunState:
-    state = RunState(run_id=_new_id(), created_at=_utcnow())
-    with RUNS_LOCK:
-        RUNS[state.run_id] = state
-    return state
+    _evict_stale_runs()
+    return _create_run_state(RUN_STORE)
+
+
+def _discard_state(run_id: str) -> None:
+    _discard_run_state(RUN_STORE, run_id)
 
 
 def _get_state(run_id: str) -> RunState:
-    with RUNS_LOCK:
-        state = RUNS.get(run_id)
+    state = RUN_STORE.get(run_id)
     if not state:
         abort(404, description="Run not found.")
     return state
 
 
+def _request_user() -> str:
+    return request.remote_user or request.remote_addr or "anonymous"
+
+
+def _queue_run(state: RunState, target: Any, *args: Any, **kwargs: Any) -> bool:
+    """Queue a job for *state*; returns ``False`` if the run already has one queued or running."""
+    # Serializes the check with the status write, so racing requests for one
+    # run cannot both mark it queued.
+    with _QUEUE_LOCK:
+        if JOBS.is_active(state.run_id):
+            return False
+        state.status = "queued"
+        state.error = None
+        state.message = "Waiting for a free worker."
+        state.save()
+        return JOBS.submit(state.run_id, target, *args, user=_request_user(), **kwargs)
+
+
 def _snapshot_state(state: RunState) -> Dict[str, Any]:
     snapshot = state.snapshot()
+    snapshot["queuePosition"] = JOBS.position(state.run_id) if state.status == "queued" else None
     summary = dict(snapshot.get("summary") or {})
     if "outputCounts" not in summary and state.output_dir:
         data_name = str((state.inputs or {}).get("dataFile") or "").strip()
@@ -177,6 +259,9 @@ def health() -> Any:
             "ok": True,
             "outputRoot": str(OUTPUT_ROOT),
             "previewRoot": str(PREVIEW_ROOT),
+            "runStore": RUN_STORE_SPEC,
+            "jobWorkers": JOB_WORKERS,
+            "evidenceLibrary": EVIDENCE_LIBRARY is not None,
             "maxUploadBytes": MAX_UPLOAD_BYTES,
         }
     )
@@ -246,7 +331,7 @@ def preview_map() -> Any:
         if data_upload and data_upload.filename and data_path is not None:
             data_upload.save(data_path)
         kmz_upload.save(kmz_path)
-        boundary = load_kmz_polygon(str(kmz_path))
+        boundary = load_kmz_boundary(str(kmz_path))
         points: List[Tuple[float, float]] = []
         included = 0
         excluded = 0
@@ -370,20 +455,16 @@ def start_run() -> Any:
         "labelOrder": label_order,
     }
 
-    thread = threading.Thread(
-        target=_run_refinement_job,
-        args=(
-            state,
-            data_path,
-            kmz_path,
-            run_dir,
-            lat_column,
-            lon_column,
-            label_order,
-        ),
-        daemon=True,
+    _queue_run(
+        state,
+        _run_refinement_job,
+        data_path,
+        kmz_path,
+        run_dir,
+        lat_column,
+        lon_column,
+        label_order,
     )
-    thread.start()
 
     return jsonify({"runId": state.run_id})
 
@@ -404,8 +485,7 @@ def apply_coordinate_review() -> Any:
     if (review_upload is None or not review_upload.filename) and not review_decisions_text:
         return jsonify({"error": "Coordinate review file or browser review decisions are required."}), 400
 
-    with RUNS_LOCK:
-        source_state = RUNS.get(source_run_id)
+    source_state = RUN_STORE.get(source_run_id)
     if not source_state or not source_state.output_dir:
         return jsonify({"error": "Previous run not found."}), 404
 
@@ -469,22 +549,18 @@ def apply_coordinate_review() -> Any:
     if review_decisions:
         state.inputs["browserReviewDecisionCount"] = len(review_decisions)
 
-    thread = threading.Thread(
-        target=_run_refinement_job,
-        args=(
-            state,
-            data_path,
-            kmz_path,
-            run_dir,
-            lat_column,
-            lon_column,
-            label_order,
-            review_path,
-            review_decisions,
-        ),
-        daemon=True,
+    _queue_run(
+        state,
+        _run_refinement_job,
+        data_path,
+        kmz_path,
+        run_dir,
+        lat_column,
+        lon_column,
+        label_order,
+        review_path,
+        review_decisions,
     )
-    thread.start()
 
     return jsonify({"runId": state.run_id})
 def _run_refinement_job(
@@ -499,8 +575,10 @@ def _run_refinement_job(
     review_decisions: Optional[Dict[str, CoordinateReviewDecision]] = None,
 ) -> None:
     state.status = "running"
+    state.message = ""
     state.started_at = _utcnow()
     state.output_dir = run_dir
+    state.save()
     if coordinate_review_path is not None:
         state.append_log(
             f"Applying reviewed coordinate decisions from {coordinate_review_path.name} to {data_path.name}"
@@ -521,6 +599,8 @@ def _run_refinement_job(
             label_order=label_order,
             coordinate_review_path=coordinate_review_path,
             review_decisions=review_decisions,
+            input_cache_dir=INPUT_CACHE_ROOT,
+            evidence_library=EVIDENCE_LIBRARY,
         )
         for msg in result.log:
             state.append_log(msg)
@@ -559,6 +639,7 @@ def _run_refinement_job(
         state.finished_at = _utcnow()
         if state.output_dir:
             state.outputs = _list_outputs(state.output_dir)
+        state.save()
 
 
 def _run_relabel_job(
@@ -575,6 +656,7 @@ def _run_relabel_job(
     state.error = None
     state.started_at = _utcnow()
     state.message = "Regenerating KMZ labels."
+    state.save()
     state.append_log(
         f"Regenerating KMZ labels using {(label_order or 'auto').replace('_', ' ')} ordering."
     )
@@ -615,6 +697,7 @@ def _run_relabel_job(
         state.finished_at = _utcnow()
         if state.output_dir:
             state.outputs = _list_outputs(state.output_dir)
+        state.save()
 @app.route("/api/run/<run_id>")
 def run_status(run_id: str) -> Any:
     state = _get_state(run_id)
@@ -656,6 +739,74 @@ def run_review_wizard(run_id: str) -> Any:
     )
 
 
+@app.route("/api/run/<run_id>/review-wizard/steps")
+def run_review_wizard_steps(run_id: str) -> Any:
+    state = _get_state(run_id)
+    try:
+        cursor = int(request.args.get("cursor") or 0)
+        limit = int(request.args.get("limit") or REVIEW_STEP_PAGE_SIZE)
+    except ValueError:
+        return jsonify({"error": "cursor and limit must be integers."}), 400
+    if cursor < 0 or not 1 <= limit <= REVIEW_STEP_PAGE_MAX:
+        return jsonify({"error": f"cursor must be >= 0 and limit between 1 and {REVIEW_STEP_PAGE_MAX}."}), 400
+    bucket = request.args.get("bucket", "").strip()
+    if bucket not in ("", "primary", "secondary"):
+        return jsonify({"error": "bucket must be primary or secondary."}), 400
+    index = _review_index_for_state(state)
+    steps, next_cursor, matched = index.page_steps(
+        cursor=cursor,
+        limit=limit,
+        bucket=bucket,
+        confidence=request.args.get("confidence", "").strip(),
+        group=request.args.get("group", "").strip(),
+    )
+    return jsonify(
+        {
+            "runId": run_id,
+            "primaryStepCount": index.primary_step_count,
+            "secondaryStepCount": index.secondary_step_count,
+            "matchedStepCount": matched,
+            "steps": steps,
+            "nextCursor": str(next_cursor) if next_cursor is not None else None,
+        }
+    )
+
+
+@app.route("/api/run/<run_id>/review-wizard/map")
+def run_review_wizard_map(run_id: str) -> Any:
+    state = _get_state(run_id)
+    return jsonify({"runId": run_id, "mapData": _review_index_for_state(state).map_data})
+
+
+@app.route("/api/run/<run_id>/review-wizard/context")
+def run_review_wizard_context(run_id: str) -> Any:
+    state = _get_state(run_id)
+    try:
+        south, west, north, east = (float(request.args[name]) for name in ("south", "west", "north", "east"))
+        limit = int(request.args.get("limit") or REVIEW_CONTEXT_LIMIT)
+    except (KeyError, ValueError):
+        return jsonify({"error": "south, west, north and east must be numbers."}), 400
+    if south > north or west > east or not 1 <= limit <= REVIEW_CONTEXT_MAX:
+        return jsonify(
+            {"error": f"Bounds must have south <= north and west <= east, and limit between 1 and {REVIEW_CONTEXT_MAX}."}
+        ), 400
+    crashes, matched = _review_index_for_state(state).context_in(
+        south=south,
+        west=west,
+        north=north,
+        east=east,
+        limit=limit,
+    )
+    return jsonify(
+        {
+            "runId": run_id,
+            "crashes": crashes,
+            "matchedCount": matched,
+            "truncated": matched > len(crashes),
+        }
+    )
+
+
 @app.route("/api/run/<run_id>/log")
 def run_log(run_id: str) -> Any:
     state = _get_state(run_id)
@@ -664,18 +815,108 @@ def run_log(run_id: str) -> Any:
         seq = int(since)
     except ValueError:
         seq = 0
+    try:
+        limit: Optional[int] = max(1, int(request.args["limit"]))
+    except (KeyError, ValueError):
+        limit = None
+    entries = state.log_since(seq, limit)
+    last_seq = state.log_seq
+    if limit is not None and len(entries) == limit:
+        last_seq = entries[-1]["seq"]
     return jsonify({
-        "entries": state.log_since(seq),
-        "lastSeq": state.log_seq,
+        "entries": entries,
+        "lastSeq": last_seq,
+        "hasMore": last_seq < state.log_seq,
         "status": state.status,
         "message": state.message,
+        "queuePosition": JOBS.position(run_id) if state.status == "queued" else None,
     })
 
 
+@app.route("/api/run/<run_id>/events")
+def run_events(run_id: str) -> Any:
+    _get_state(run_id)
+    since = request.headers.get("Last-Event-ID") or request.args.get("since", "0")
+    try:
+        seq = max(0, int(since))
+    except ValueError:
+        seq = 0
+    return Response(
+        stream_with_context(_iter_run_events(run_id, seq)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _iter_run_events(run_id: str, seq: int) -> Iterator[str]:
+    """Yield SSE frames for *run_id* until it finishes or the stream times out.
+
+    ``log`` events carry the log sequence as their id, so a reconnecting
+    ``EventSource`` resumes from ``Last-Event-ID``. ``status`` is sent on every
+    status, message or queue-position change and ``done`` (with the full run
+    snapshot) once the run is no longer queued or running.
+    """
+    yield f"retry: {int(EVENT_STORE_POLL_SECONDS * 1000)}\n\n"
+    deadline = time.monotonic() + EVENT_STREAM_MAX_SECONDS
+    last_sent = time.monotonic()
+    last_status: Optional[Dict[str, Any]] = None
+    version = RUN_EVENTS.version(run_id)
+    while True:
+        state = RUN_STORE.get(run_id)
+        if state is None:
+            yield _sse_frame("gone", {"id": run_id})
+            return
+        frames: List[str] = []
+        for entry in state.log_since(seq):
+            seq = entry["seq"]
+            frames.append(_sse_frame("log", entry, event_id=seq))
+        status = {
+            "status": state.status,
+            "message": state.message,
+            "queuePosition": JOBS.position(run_id) if state.status == "queued" else None,
+            "lastSeq": state.log_seq,
+        }
+        if status != last_status:
+            frames.append(_sse_frame("status", status))
+            last_status = status
+        if state.status not in {"queued", "running"}:
+            frames.append(_sse_frame("done", _snapshot_state(state)))
+            yield "".join(frames)
+            return
+        if frames:
+            yield "".join(frames)
+            last_sent = time.monotonic()
+        elif time.monotonic() - last_sent >= EVENT_HEARTBEAT_SECONDS:
+            yield ": heartbeat\n\n"
+            last_sent = time.monotonic()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        version = RUN_EVENTS.wait(run_id, version, min(EVENT_STORE_POLL_SECONDS, remaining))
+
+
+def _sse_frame(event: str, data: Any, *, event_id: Optional[int] = None) -> str:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.route("/api/run/<run_id>/cancel", methods=["POST"])
+def cancel_run(run_id: str) -> Any:
+    state = _get_state(run_id)
+    if state.status != "queued" or not JOBS.cancel(run_id):
+        return jsonify({"error": "Only queued runs can be cancelled."}), 409
+    state.status = "cancelled"
+    state.message = "Run cancelled before it started."
+    state.finished_at = _utcnow()
+    state.append_log(state.message)
+    state.save()
+    return jsonify(_snapshot_state(state))
+
+
 @app.route("/api/run/<run_id>/relabel", methods=["POST"])
 def relabel_run_outputs(run_id: str) -> Any:
     state = _get_state(run_id)
-    if state.status == "running":
+    if state.status in {"queued", "running"}:
         return jsonify({"error": "This run is still in progress."}), 409
     if not state.output_dir:
         return jsonify({"error": "Outputs are unavailable for this run."}), 400
@@ -696,20 +937,18 @@ def relabel_run_outputs(run_id: str) -> Any:
         return jsonify({"error": "Refined output for this run was not found."}), 404
 
     state.inputs["runKind"] = "relabel"
-    thread = threading.Thread(
-        target=_run_relabel_job,
-        kwargs={
-            "state": state,
-            "refined_path": refined_path,
-            "kmz_path": kmz_path,
-            "lat_column": lat_column,
-            "lon_column": lon_column,
-            "label_order": label_order,
-            "stale_output_paths": [],
-        },
-        daemon=True,
+    queued = _queue_run(
+        state,
+        _run_relabel_job,
+        refined_path=refined_path,
+        kmz_path=kmz_path,
+        lat_column=lat_column,
+        lon_column=lon_column,
+        label_order=label_order,
+        stale_output_paths=[],
     )
-    thread.start()
+    if not queued:
+        return jsonify({"error": "This run is still in progress."}), 409
     return jsonify({"runId": state.run_id})
 
 
@@ -743,7 +982,7 @@ def main() -> None:
     parser.add_argument("--host", default=os.getenv("CDR_HOST", "127.0.0.1"))
     parser.add_argument("--port", type=int, default=int(os.getenv("CDR_PORT", "8081")))
     parser.add_argument("--debug", action="store_true")
-    parser.add_argument("--threads", type=int, default=int(os.getenv("CDR_THREADS", "4")))
+    parser.add_argument("--threads", type=int, default=int(os.getenv("CDR_THREADS", "16")))
     args = parser.parse_args()
     if args.debug:
         app.run(host=args.host, port=args.port, debug=True)
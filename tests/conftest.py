@@ -0,0 +1,8 @@
+from __future__ import annotations
+
+import os
+
+# Keep web tests off the on-disk run registry.
+os.environ.setdefault("CDR_RUN_STORE", "memory")
+# Keep recovery in tests independent of evidence recorded by earlier runs.
+os.environ.setdefault("CDR_EVIDENCE_LIBRARY", "off")
@@ -1,12 +1,30 @@
 from __future__ import annotations
 
+import math
+import random
+from collections import Counter
+from itertools import combinations
+
+import pytest
+
 from crash_data_refiner.coordinate_recovery import (
     CoordinateReviewDecision,
+    apply_review_decisions,
     build_coordinate_review_queue,
     build_coordinate_review_wizard_steps,
+    build_recovery_state,
     load_coordinate_review_decisions,
+    prepare_recovery_inputs,
     recover_missing_coordinates,
+    recovery_results,
+    _ROUTE_SIGNAL_RULE,
+    _ClusterBuilder,
+    _build_clusters,
+    _location_signature,
+    _score_signal_table,
+    _signal_detail,
 )
+from crash_data_refiner.distances import distance_feet
 from crash_data_refiner.geo import PolygonBoundary
 
 
@@ -557,3 +575,146 @@ def test_recover_missing_coordinates_applies_row_level_reject_decision() -> None
     assert rejected_row["coordinate_recovery_status"] == "review_rejected"
     assert rejected_row["coordinate_recovery_confidence"] == "user_rejected"
     assert rejected_row["coordinate_recovery_note"] == "Outside the project after manual review."
+
+
+def test_apply_review_decisions_recomputes_only_rows_whose_decision_changed() -> None:
+    rows = [
+        {"Crash ID": "1", "Latitude": "40.0", "Longitude": "-86.0", "Roadway Number": "SR2", "Intersecting Road": "Oak"},
+        {"Crash ID": "2", "Latitude": "", "Longitude": "", "Roadway Number": "SR2", "Intersecting Road": "Oak"},
+        {"Crash ID": "3", "Latitude": "", "Longitude": "", "Roadway Number": "SR9", "Intersecting Road": "Elm"},
+        {"Crash ID": "4", "Latitude": "", "Longitude": "", "Roadway Number": "SR9", "Intersecting Road": "Elm"},
+        {"Crash ID": "5", "Latitude": "", "Longitude": "", "Roadway Number": "US31", "Intersecting Road": "Pine"},
+    ]
+    inputs = prepare_recovery_inputs(rows, latitude_column="Latitude", longitude_column="Longitude")
+    baseline = build_recovery_state(inputs)
+    group = next(
+        outcome.row["coordinate_recovery_group"]
+        for outcome in baseline.outcomes
+        if outcome is not None and outcome.row["crash_id"] == "3"
+    )
+    decisions = {
+        group: CoordinateReviewDecision(group_key=group, latitude=40.5, longitude=-86.5),
+        "5__row6": CoordinateReviewDecision(group_key="5__row6", action="reject"),
+    }
+
+    reviewed = apply_review_decisions(baseline, decisions)
+
+    assert reviewed.recomputed_rows == 3
+    assert reviewed.outcomes[1] is baseline.outcomes[1]
+    assert recovery_results(reviewed) == recover_missing_coordinates(
+        rows,
+        latitude_column="Latitude",
+        longitude_column="Longitude",
+        review_decisions=decisions,
+    )
+
+    reverted = apply_review_decisions(reviewed, {})
+    assert reverted.recomputed_rows == 3
+    assert recovery_results(reverted) == recovery_results(baseline)
+    assert apply_review_decisions(reverted, {}).recomputed_rows == 0
+
+
+def test_location_signature_holds_every_fingerprint_and_the_review_group_key() -> None:
+    signature = _location_signature(
+        {
+            "roadway_number": "sr 2",
+            "intersecting_road": "oak  st",
+            "mile_marker": "12.5",
+            "feet_from": "150",
+            "direction": "northbound",
+            "city": "Testville",
+            "county": "Example",
+            "unique_location_id": "LOC-9",
+        }
+    )
+
+    assert signature.route == "SR 2"
+    assert signature.locality == "TESTVILLE|EXAMPLE"
+    assert signature.intersection_fingerprint == "SR 2|OAK ST|TESTVILLE|EXAMPLE"
+    assert signature.mile_marker_fingerprint == "SR 2|12.5|TESTVILLE|EXAMPLE"
+    assert signature.unique_location_fingerprint == "LOC-9"
+    assert signature.fingerprint("intersection_match") == signature.intersection_fingerprint
+    assert signature.offset_fingerprint == "SR 2|OAK ST|150|N|TESTVILLE|EXAMPLE"
+    assert signature.group_key == signature.offset_fingerprint
+    assert signature.cross_signal == "OAKST"
+    assert not hasattr(signature, "__dict__")
+
+
+def test_grid_clustering_matches_first_fit_scan_and_hull_spread_matches_all_pairs() -> None:
+    generator = random.Random(7)
+    counter: Counter = Counter()
+    for center_lat, center_lon in ((40.0, -86.0), (40.003, -86.002), (39.2, -85.1)):
+        for _ in range(150):
+            coord = (
+                round(center_lat + generator.gauss(0, 0.001), 6),
+                round(center_lon + generator.gauss(0, 0.001), 6),
+            )
+            counter[coord] += generator.randint(1, 3)
+
+    expected = []
+    for coord, count in counter.most_common():
+        target = next((cluster for cluster in expected if distance_feet(coord, cluster.centroid) <= 250.0), None)
+        if target is None:
+            target = _ClusterBuilder()
+            expected.append(target)
+        target.add(coord, count)
+
+    clusters = _build_clusters(counter.most_common(), threshold_feet=250.0, boundary=None)
+
+    assert sorted((cluster.latitude, cluster.longitude, cluster.total_count) for cluster in clusters) == sorted(
+        (*cluster.centroid, cluster.total_count) for cluster in expected
+    )
+    largest = max(expected, key=lambda cluster: len(cluster.members))
+    points = [coord for coord, _count in largest.members]
+    assert len(points) > 16
+    brute_force = max(distance_feet(left, right) for left, right in combinations(points, 2))
+    assert abs(largest.spread_feet() - brute_force) < 1e-6 * brute_force
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_grid_clustering_is_the_same_with_batch_prefilter(monkeypatch: pytest.MonkeyPatch, use_numpy: bool) -> None:
+    from crash_data_refiner import coordinate_recovery, distances
+
+    if not use_numpy:
+        monkeypatch.setattr(distances, "np", None)
+    generator = random.Random(11)
+    counter: Counter = Counter()
+    for _ in range(600):
+        counter[(round(40.0 + generator.gauss(0, 0.002), 6), round(-86.0 + generator.gauss(0, 0.002), 6))] += 1
+    ranked = counter.most_common()
+
+    scanned = _build_clusters(ranked, threshold_feet=100.0, boundary=None)
+    monkeypatch.setattr(coordinate_recovery, "_BATCH_PREFILTER_MIN_CANDIDATES", 1)
+    prefiltered = _build_clusters(ranked, threshold_feet=100.0, boundary=None)
+
+    assert prefiltered == scanned
+
+
+def test_hull_spread_matches_all_pairs_on_arc_shaped_cluster() -> None:
+    # Every member of an arc lies on its hull, the worst case for comparing hull vertex pairs.
+    cluster = _ClusterBuilder()
+    for step in range(400):
+        angle = math.pi * step / 399
+        cluster.add((40.0 + 0.002 * math.sin(angle), -86.0 + 0.002 * math.cos(angle)), 1)
+
+    points = [coord for coord, _count in cluster.members]
+    brute_force = max(distance_feet(left, right) for left, right in combinations(points, 2))
+    assert abs(cluster.spread_feet() - brute_force) < 1e-6 * brute_force
+
+
+def test_signal_score_table_walks_the_ladder_once_per_key() -> None:
+    table = _score_signal_table(
+        _ROUTE_SIGNAL_RULE,
+        Counter({"SR1": 8, "SR2": 1}),
+        Counter({"SR1": 2, "SR2": 1, "SR9": 5}),
+    )
+
+    assert (table["SR1"].score, table["SR1"].reason) == (42, _ROUTE_SIGNAL_RULE.positive_label)
+    assert (table["SR9"].score, table["SR9"].reason) == (-35, _ROUTE_SIGNAL_RULE.negative_label)
+    assert (table["SR2"].score, table["SR2"].reason) == (0, "")
+    assert _signal_detail(_ROUTE_SIGNAL_RULE, "SR 1", table["SR1"]) == (
+        "Route only: SR 1 appears in 8 inside-boundary and 2 outside-boundary known-coordinate crash(es) (80% inside)."
+    )
+    assert _signal_detail(_ROUTE_SIGNAL_RULE, "SR 2", table["SR2"]).endswith(
+        "Limited sample. This signal was too mixed or too small to change the review score."
+    )
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from crash_data_refiner import distances
+from crash_data_refiner.distances import (
+    LocalProjection,
+    distance_feet,
+    distances_feet,
+    max_pairwise_distance_feet,
+    pairwise_distances_feet,
+)
+
+
+def _corridor(count: int) -> list:
+    generator = random.Random(3)
+    return [(40.0 + generator.uniform(0, 0.01), -86.0 + generator.uniform(0, 0.01)) for _ in range(count)]
+
+
+@pytest.mark.parametrize("numpy_available", [True, False])
+def test_batch_distances_match_the_scalar_kernel(monkeypatch, numpy_available: bool) -> None:
+    if not numpy_available:
+        monkeypatch.setattr(distances, "np", None)
+    elif distances.np is None:
+        pytest.skip("NumPy is not installed")
+    points = _corridor(60)
+    origin = points[0]
+
+    one_to_many = distances_feet(origin, points)
+    assert one_to_many == pytest.approx([distance_feet(origin, point) for point in points], rel=1e-9)
+    assert one_to_many[0] == 0.0
+
+    matrix = pairwise_distances_feet(points[:10])
+    assert matrix[2][7] == pytest.approx(distance_feet(points[2], points[7]), rel=1e-9)
+    assert matrix[7][2] == matrix[2][7]
+    assert max_pairwise_distance_feet(points) == pytest.approx(
+        max(distance_feet(left, right) for left in points for right in points), rel=1e-9
+    )
+    assert max_pairwise_distance_feet(points[:1]) == 0.0
+
+
+def test_local_projection_approximates_haversine_over_a_corridor() -> None:
+    points = _corridor(40)
+    projection = LocalProjection.around(points)
+
+    projected = distances_feet(points[0], points, projection=projection)
+    exact = distances_feet(points[0], points)
+    assert projected == pytest.approx(exact, rel=1e-4)
+    assert [distances.equirectangular_distance_feet(points[0], point) for point in points] == pytest.approx(
+        exact, rel=1e-4
+    )
+    x, y = projection.project((40.0, -86.0))
+    assert y == pytest.approx(40.0 * distances.FEET_PER_DEGREE)
+    assert x < 0
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from crash_data_refiner.coordinate_recovery import prepare_recovery_inputs, recover_prepared_coordinates
+from crash_data_refiner.evidence_library import EvidenceLibrary
+
+
+def _crash(crash_id: str, lat: str, lon: str, *, county: str = "Example") -> Dict[str, Any]:
+    return {
+        "Crash ID": crash_id,
+        "Latitude": lat,
+        "Longitude": lon,
+        "Roadway Number": "SR1",
+        "Intersecting Road": "Main",
+        "City": "Testville",
+        "County": county,
+    }
+
+
+def _prepare(rows):
+    return prepare_recovery_inputs(rows, latitude_column="Latitude", longitude_column="Longitude")
+
+
+def test_evidence_library_recovers_rows_from_an_earlier_run(tmp_path) -> None:
+    library = EvidenceLibrary(tmp_path / "evidence.sqlite3")
+    last_month = _prepare([_crash("1", "40.0000", "-86.0000"), _crash("2", "40.0001", "-86.0000")])
+    assert library.record(last_month) > 0
+    assert library.record(last_month) == 0
+
+    this_month = _prepare([_crash("3", "", ""), _crash("4", "", "", county="Elsewhere")])
+    _rows, _review, report_without = recover_prepared_coordinates(this_month)
+    output_rows, _review, report = recover_prepared_coordinates(library.attach(this_month))
+
+    assert report_without.recovered_rows == 0
+    assert report.recovered_rows == 1
+    recovered = next(row for row in output_rows if row["crash_id"] == "3")
+    assert recovered["coordinate_recovery_status"] == "auto_recovered"
+    assert recovered["coordinate_recovery_match_count"] == 2
+    assert "evidence library" in recovered["coordinate_recovery_note"]
+    other_county = next(row for row in output_rows if row["crash_id"] == "4")
+    assert other_county["coordinate_recovery_status"] == "no_match"
+
+
+def test_evidence_library_only_fills_fingerprints_missing_from_the_current_rows(tmp_path) -> None:
+    library = EvidenceLibrary(tmp_path / "evidence.sqlite3")
+    library.record(_prepare([_crash("1", "41.0000", "-87.0000")]))
+
+    inputs = library.attach(_prepare([_crash("5", "40.0000", "-86.0000"), _crash("6", "", "")]))
+    output_rows, _review, _report = recover_prepared_coordinates(inputs)
+
+    assert inputs.library_evidence is not None and len(inputs.library_evidence) == 0
+    recovered = next(row for row in output_rows if row["crash_id"] == "6")
+    assert float(recovered["latitude"]) == 40.0
+    ranked = library.lookup("TESTVILLE|EXAMPLE", "intersection_match", "SR1|MAIN|TESTVILLE|EXAMPLE")
+    assert ranked == [((41.0, -87.0), 1)]
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pickle
+from collections import Counter
+
+import pytest
+
+from crash_data_refiner.evidence_store import EvidenceStore
+
+
+def _observations():
+    return [
+        ("route_cross", "SR1|MAIN", 40.0, -86.0),
+        ("route", "SR1", 40.0, -86.0),
+        ("route_cross", "SR1|MAIN", 40.1, -86.1),
+        ("route_cross", "SR1|MAIN", 40.1, -86.1),
+        ("route", "SR1", 40.2, -86.2),
+        ("route_cross", "SR1|MAIN", 40.0, -86.0),
+        ("route_cross", "SR1|MAIN", 40.3, -86.3),
+        ("route", "SR1", 40.0, -86.0),
+    ]
+
+
+def test_evidence_store_ranks_coordinates_like_counter_most_common() -> None:
+    store = EvidenceStore.build(_observations())
+
+    for mode, fingerprint in (("route_cross", "SR1|MAIN"), ("route", "SR1")):
+        expected = Counter(
+            (lat, lon) for key_mode, key_fp, lat, lon in _observations() if (key_mode, key_fp) == (mode, fingerprint)
+        ).most_common()
+        assert store.ranked(mode, fingerprint) == expected
+    assert store.ranked("route", "SR9") == []
+    assert store.ranked("cross", "SR1") == []
+    assert len(store) == 2
+
+
+def test_evidence_store_round_trips_through_a_mapped_file(tmp_path) -> None:
+    built = EvidenceStore.build(_observations())
+
+    mapped = built.save(tmp_path / "inputs.evidence")
+
+    assert mapped.path == str((tmp_path / "inputs.evidence").resolve())
+    assert mapped.ranked("route_cross", "SR1|MAIN") == built.ranked("route_cross", "SR1|MAIN")
+    restored = pickle.loads(pickle.dumps(mapped))
+    assert restored.path == mapped.path
+    assert restored.ranked("route", "SR1") == built.ranked("route", "SR1")
+    copied = pickle.loads(pickle.dumps(built))
+    assert copied.path is None
+    assert copied.ranked("route", "SR1") == built.ranked("route", "SR1")
+    empty = EvidenceStore.build([]).save(tmp_path / "empty.evidence")
+    assert len(empty) == 0 and empty.ranked("route", "SR1") == []
+
+
+def test_evidence_store_rejects_files_it_did_not_write(tmp_path) -> None:
+    path = tmp_path / "other.evidence"
+    path.write_bytes(b"not an evidence store at all")
+    with pytest.raises(ValueError):
+        EvidenceStore.load(path)
@@ -1,9 +1,25 @@
 from __future__ import annotations
 
 from pathlib import Path
+import math
+import random
 import zipfile
 
-from crash_data_refiner.geo import is_usable_coordinate_pair, load_kmz_polygon
+import pytest
+
+from crash_data_refiner import geo
+from crash_data_refiner.geo import (
+    MultiPolygonBoundary,
+    PolygonBoundary,
+    assign_points_to_boundaries,
+    is_usable_coordinate_pair,
+    load_kmz_boundary,
+    load_kmz_polygon,
+    locate_points,
+    point_in_polygon,
+    points_in_polygon,
+    prepare_polygon,
+)
 from crash_data_refiner.refiner import CrashDataRefiner
 
 
@@ -62,3 +78,179 @@ def test_kmz_polygon_filtering(tmp_path: Path) -> None:
 def test_origin_coordinate_pair_is_not_usable() -> None:
     assert is_usable_coordinate_pair(41.5, -87.5) is True
     assert is_usable_coordinate_pair(0.0, 0.0) is False
+
+
+def _ray_cast(lon: float, lat: float, ring: list[tuple[float, float]]) -> bool:
+    inside = False
+    for (x1, y1), (x2, y2) in zip(ring, ring[1:]):
+        if ((y1 > lat) != (y2 > lat)) and lon < (x2 - x1) * (lat - y1) / (y2 - y1 + 1e-12) + x1:
+            inside = not inside
+    return inside
+
+
+def _star_ring(center: tuple[float, float], radius: float, points: int, seed: int) -> list[tuple[float, float]]:
+    rng = random.Random(seed)
+    ring = []
+    for idx in range(points):
+        angle = 2 * math.pi * idx / points
+        scale = radius * rng.uniform(0.6, 1.0)
+        ring.append((center[0] + scale * math.cos(angle), center[1] + scale * math.sin(angle)))
+    ring.append(ring[0])
+    return ring
+
+
+def test_prepared_polygon_matches_linear_ray_cast_on_dense_ring() -> None:
+    outer = _star_ring((-86.0, 40.0), 0.5, 5000, seed=1)
+    hole = _star_ring((-86.0, 40.0), 0.1, 400, seed=2)
+    boundary = PolygonBoundary(outer=outer, holes=[hole])
+    prepared = prepare_polygon(boundary)
+
+    assert prepare_polygon(boundary) is prepared
+    rng = random.Random(3)
+    for _ in range(2000):
+        lon = rng.uniform(-86.6, -85.4)
+        lat = rng.uniform(39.4, 40.6)
+        expected = _ray_cast(lon, lat, outer) and not _ray_cast(lon, lat, hole)
+        assert prepared.contains(lon, lat) is expected
+        assert point_in_polygon(lon, lat, boundary) is expected
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_points_in_polygon_batch_matches_scalar_test(monkeypatch: pytest.MonkeyPatch, use_numpy: bool) -> None:
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(geo, "np", None)
+    boundary = PolygonBoundary(
+        outer=_star_ring((-86.0, 40.0), 0.5, 3000, seed=4),
+        holes=[_star_ring((-86.1, 40.1), 0.1, 200, seed=5)],
+    )
+    rng = random.Random(6)
+    lons = [rng.uniform(-86.6, -85.4) for _ in range(3000)]
+    lats = [rng.uniform(39.4, 40.6) for _ in range(3000)]
+
+    inside = points_in_polygon(lons, lats, boundary)
+
+    assert inside == [point_in_polygon(lon, lat, boundary) for lon, lat in zip(lons, lats)]
+    assert any(inside) and not all(inside)
+    assert points_in_polygon([], [], boundary) == []
+
+
+def _square(lon: float, lat: float, size: float = 1.0) -> str:
+    return f"{lon},{lat} {lon + size},{lat} {lon + size},{lat + size} {lon},{lat + size} {lon},{lat}"
+
+
+def _polygon_kml(coordinates: str) -> str:
+    return (
+        "<Polygon><outerBoundaryIs><LinearRing><coordinates>"
+        f"{coordinates}"
+        "</coordinates></LinearRing></outerBoundaryIs></Polygon>"
+    )
+
+
+def test_load_kmz_boundary_reads_every_polygon_and_tags_rows(tmp_path: Path) -> None:
+    kml = f"""<?xml version="1.0" encoding="UTF-8"?>
+<kml xmlns="http://www.opengis.net/kml/2.2">
+  <Document>
+    <Placemark><name>Segment A</name>{_polygon_kml(_square(0, 0))}</Placemark>
+    <Placemark>
+      <name>Segment B</name>
+      <MultiGeometry>{_polygon_kml(_square(5, 0))}{_polygon_kml(_square(10, 0))}</MultiGeometry>
+    </Placemark>
+    <Placemark>{_polygon_kml(_square(20, 0))}</Placemark>
+  </Document>
+</kml>
+"""
+    kmz_path = tmp_path / "segments.kmz"
+    with zipfile.ZipFile(kmz_path, "w") as archive:
+        archive.writestr("doc.kml", kml)
+
+    boundary = load_kmz_boundary(str(kmz_path))
+
+    assert isinstance(boundary, MultiPolygonBoundary)
+    assert boundary.part_names == ["Segment A", "Segment B", "Segment B", "Polygon 4"]
+    rows = [
+        {"Lat": "0.5", "Lon": "0.5"},
+        {"Lat": "0.5", "Lon": "10.5"},
+        {"Lat": "0.5", "Lon": "3"},
+        {"Lat": "0.5", "Lon": "20.5"},
+    ]
+    included, excluded, invalid, report = CrashDataRefiner().filter_rows_by_boundary(
+        rows,
+        boundary=boundary,
+        latitude_column="Lat",
+        longitude_column="Lon",
+    )
+
+    assert [row["boundary_polygon"] for row in included] == ["Segment A", "Segment B", "Polygon 4"]
+    assert excluded == [{"lat": "0.5", "lon": "3"}]
+    assert report.included_rows == 3 and report.excluded_rows == 1 and not invalid
+
+
+def test_multi_polygon_index_matches_scanning_every_part() -> None:
+    rng = random.Random(7)
+    parts = [
+        PolygonBoundary(outer=_star_ring((rng.uniform(-10, 10), rng.uniform(-10, 10)), 1.0, 40, seed=index))
+        for index in range(60)
+    ]
+    boundary = MultiPolygonBoundary(parts=parts)
+    lons = [rng.uniform(-11, 11) for _ in range(2000)]
+    lats = [rng.uniform(-11, 11) for _ in range(2000)]
+
+    expected = [
+        next((index for index, part in enumerate(parts) if point_in_polygon(lon, lat, part)), None)
+        for lon, lat in zip(lons, lats)
+    ]
+
+    assert [boundary.prepared.locate(lon, lat) for lon, lat in zip(lons, lats)] == expected
+    assert locate_points(lons, lats, boundary) == expected
+    assert points_in_polygon(lons, lats, boundary) == [index is not None for index in expected]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_assign_points_to_boundaries_matches_testing_every_boundary(
+    monkeypatch: pytest.MonkeyPatch,
+    use_numpy: bool,
+) -> None:
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(geo, "np", None)
+    rng = random.Random(9)
+    boundaries = []
+    for index in range(30):
+        parts = [
+            PolygonBoundary(outer=_star_ring((rng.uniform(-10, 10), rng.uniform(-10, 10)), 1.5, 30, seed=index * 3 + part))
+            for part in range(rng.randint(1, 3))
+        ]
+        boundaries.append(parts[0] if len(parts) == 1 else MultiPolygonBoundary(parts=parts))
+    lons = [rng.uniform(-11, 11) for _ in range(1500)]
+    lats = [rng.uniform(-11, 11) for _ in range(1500)]
+
+    assignments = assign_points_to_boundaries(lons, lats, boundaries)
+
+    assert assignments == [
+        [owner for owner, boundary in enumerate(boundaries) if point_in_polygon(lon, lat, boundary)]
+        for lon, lat in zip(lons, lats)
+    ]
+    assert any(len(owners) > 1 for owners in assignments)
+
+
+def test_bbox_index_query_many_matches_point_queries() -> None:
+    np = pytest.importorskip("numpy")
+    rng = random.Random(8)
+    boxes = []
+    for _ in range(80):
+        lon, lat = rng.uniform(-10, 10), rng.uniform(-10, 10)
+        boxes.append((lon, lat, lon + rng.uniform(0.1, 3), lat + rng.uniform(0.1, 3)))
+    index = geo._BBoxIndex(boxes)
+    lons = [rng.uniform(-11, 14) for _ in range(1500)]
+    lats = [rng.uniform(-11, 14) for _ in range(1500)]
+
+    candidates = index.query_many(np.asarray(lons), np.asarray(lats))
+
+    expected: dict[int, list[int]] = {}
+    for point, (lon, lat) in enumerate(zip(lons, lats)):
+        for box_index in index.query(lon, lat):
+            expected.setdefault(box_index, []).append(point)
+    assert {box_index: sorted(points.tolist()) for box_index, points in candidates.items()} == expected
@@ -4,10 +4,15 @@ from __future__ import annotations
 from pathlib import Path
 import zipfile
 
+import pytest
+
 from crash_data_refiner.coordinate_recovery import CoordinateReviewDecision
 from crash_data_refiner.geo import load_kmz_polygon
 from crash_data_refiner.normalize import normalize_header, guess_lat_lon_columns
 from crash_data_refiner.spreadsheets import (
+    _read_xlsx_openpyxl,
+    iter_spreadsheet_rows,
+    open_spreadsheet,
     read_spreadsheet,
     read_spreadsheet_headers,
     read_spreadsheet_preview_points,
@@ -24,6 +29,7 @@ from crash_data_refiner.services import (
     build_output_headers,
     order_and_number_rows,
     resolve_label_order,
+    run_batch_refinement_pipeline,
     run_refinement_pipeline,
 )
 
@@ -148,6 +154,94 @@ def test_read_spreadsheet_prefers_data_sheet_over_blank_about_sheet(tmp_path: Pa
     assert data.rows == [{"Crash ID": "1", "Latitude": "40.0", "Longitude": "-86.0"}]
 
 
+def test_streaming_xlsx_reader_types_cells_like_openpyxl(tmp_path: Path) -> None:
+    from datetime import datetime
+
+    from openpyxl import Workbook
+
+    path = tmp_path / "typed.xlsx"
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Crash ID", "Crash Date", "Injuries", "Speed", "Hit and Run", "Notes"])
+    sheet.append([101, datetime(2024, 3, 5, 14, 30), 2, 45.5, True, "Rear end"])
+    sheet.append([102, datetime(2024, 3, 6), 0, None, False, None])
+    sheet.append([None, None, None, None, None, None])
+    sheet.append(["103", "03/07/2024", "1", "", None, "=text"])
+    sheet["A5"].number_format = "@"
+    workbook.save(path)
+
+    streamed = read_spreadsheet(str(path))
+    reference = _read_xlsx_openpyxl(str(path))
+
+    assert streamed.headers == reference.headers
+    assert streamed.rows == reference.rows
+    assert [type(value) for value in streamed.rows[0].values()] == [
+        type(value) for value in reference.rows[0].values()
+    ]
+    assert streamed.rows[0]["Crash Date"] == datetime(2024, 3, 5, 14, 30)
+    assert len(streamed.rows) == 3
+
+    rows = iter_spreadsheet_rows(str(path))
+    assert next(rows)["Crash ID"] == 101
+    assert [row["Crash ID"] for row in rows] == [102, "103"]
+
+
+def test_streaming_xlsx_writer_round_trips_and_keeps_table_style(tmp_path: Path) -> None:
+    from datetime import datetime
+
+    from openpyxl import load_workbook
+
+    path = tmp_path / "written.xlsx"
+    rows = [
+        {"Crash ID": "A & <1>", "Crash Date": datetime(2024, 3, 5, 14, 30), "Injuries": 2, "Speed": 45.5},
+        {"Crash ID": " padded ", "Crash Date": None, "Injuries": 0, "Speed": None, "Notes": "x" * 80},
+    ]
+    headers = ["Crash ID", "Crash Date", "Injuries", "Speed", "Notes"]
+    write_spreadsheet(str(path), rows, headers=headers)
+
+    expected = [{header: row.get(header) for header in headers} for row in rows]
+    assert _read_xlsx_openpyxl(str(path)).rows == expected
+    assert read_spreadsheet(str(path)).rows == expected
+
+    sheet = load_workbook(path).active
+    table = sheet.tables["Table1"]
+    assert table.ref == "A1:E3"
+    assert table.tableStyleInfo.name == "TableStyleMedium2"
+    assert sheet.column_dimensions["A"].width == 10
+    assert sheet.column_dimensions["B"].width == 21
+    assert sheet.column_dimensions["E"].width == 60
+
+
+def test_open_spreadsheet_counts_and_projects_without_row_dicts(tmp_path: Path) -> None:
+    from openpyxl import Workbook
+
+    xlsx_path = tmp_path / "lazy.xlsx"
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Crash ID", "Latitude", "Longitude", None])
+    sheet.append([1, 41.5, -88.1, None])
+    sheet.append([None, "  ", None, "ignored"])
+    sheet.append(["2", None, None, None])
+    sheet.append([3, "41.7", "-88.3", None])
+    workbook.save(xlsx_path)
+
+    csv_path = tmp_path / "lazy.csv"
+    csv_path.write_text(
+        "Crash ID,Latitude,Longitude\n1,41.5,-88.1\n,, \n\n2,,\n3,41.7,-88.3,extra\n",
+        encoding="utf-8",
+    )
+
+    for path in (xlsx_path, csv_path):
+        lazy = open_spreadsheet(str(path))
+        eager = read_spreadsheet(str(path))
+        assert lazy.headers == eager.headers
+        assert list(lazy.iter_rows()) == eager.rows
+        assert lazy.count() == len(eager.rows) == 3
+        assert list(lazy.iter_columns(["crash_id", "Longitude", "Missing"])) == [
+            (row.get("Crash ID"), row.get("Longitude"), None) for row in eager.rows
+        ]
+
+
 def test_read_spreadsheet_preview_points_filters_xlsx_rows(tmp_path: Path) -> None:
     from openpyxl import Workbook
 
@@ -329,6 +423,90 @@ def test_run_refinement_pipeline(tmp_path: Path) -> None:
     assert float(recovered_row["lat"]) == 1.0
     assert float(recovered_row["lon"]) == 0.0
     assert recovered_row["coordinate_source"] == "recovered"
+    assert any(line.startswith("KMZ report generated: crashes_Crash Data.kmz (2 placemarks, ") for line in result.log)
+    assert any(line.startswith("Output writer stage finished in ") for line in result.log)
+
+
+def test_write_outputs_runs_large_outputs_in_worker_processes(tmp_path: Path, monkeypatch) -> None:
+    from crash_data_refiner import pipeline
+
+    monkeypatch.setattr(pipeline, "_PROCESS_WRITER_MIN_ROWS", 2)
+    rows = [{"crash_id": str(index), "county": "Example"} for index in range(3)]
+    big_path = tmp_path / "big.xlsx"
+    small_path = tmp_path / "small.csv"
+    log: list[str] = []
+
+    results = pipeline._write_outputs(
+        [
+            pipeline._OutputJob(
+                "Big output saved", big_path, pipeline._write_spreadsheet_output, (str(big_path), rows, None), 3
+            ),
+            pipeline._OutputJob(
+                "Small output saved", small_path, pipeline._write_spreadsheet_output, (str(small_path), rows[:1], None), 1
+            ),
+        ],
+        log,
+    )
+
+    assert results == {big_path: None, small_path: None}
+    assert read_spreadsheet(str(big_path)).rows == rows
+    assert read_spreadsheet(str(small_path)).rows == rows[:1]
+    assert log[0].startswith("Big output saved: big.xlsx (")
+    assert log[1].startswith("Small output saved: small.csv (")
+
+
+def test_run_batch_refinement_pipeline_matches_single_project_runs(tmp_path: Path) -> None:
+    import csv
+
+    data_file = tmp_path / "statewide.csv"
+    with data_file.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["Crash ID", "Lat", "Lon", "Roadway Number", "Intersecting Road"])
+        writer.writeheader()
+        writer.writerow({"Crash ID": "1", "Lat": "1.0", "Lon": "0.0", "Roadway Number": "SR1", "Intersecting Road": "Main"})
+        writer.writerow({"Crash ID": "2", "Lat": "1.5", "Lon": "0.5"})  # in both projects
+        writer.writerow({"Crash ID": "3", "Lat": "5.0", "Lon": "0.0"})  # outside both
+        writer.writerow({"Crash ID": "4", "Lat": "1.5", "Lon": "2.0"})  # east project only
+        writer.writerow({"Crash ID": "5", "Lat": "", "Lon": "", "Roadway Number": "SR1", "Intersecting Road": "Main"})
+
+    west_kmz = tmp_path / "west.kmz"
+    _write_test_kmz(west_kmz)
+    east_kmz = tmp_path / "east.kmz"
+    with zipfile.ZipFile(east_kmz, "w") as archive:
+        archive.writestr("doc.kml", _UNIT_KML.replace("-1,0 1,0 1,2 -1,2 -1,0", "0,1.2 3,1.2 3,2 0,2 0,1.2"))
+
+    batch = run_batch_refinement_pipeline(
+        data_path=data_file,
+        kmz_paths=[west_kmz, east_kmz],
+        output_dir=tmp_path / "batch",
+        lat_column="Lat",
+        lon_column="Lon",
+    )
+
+    assert list(batch.projects) == ["west", "east"]
+    for name, kmz_path in (("west", west_kmz), ("east", east_kmz)):
+        project = batch.projects[name]
+        single = run_refinement_pipeline(
+            data_path=data_file,
+            kmz_path=kmz_path,
+            run_dir=tmp_path / f"single_{name}",
+            lat_column="Lat",
+            lon_column="Lon",
+        )
+        assert project.output_path == tmp_path / "batch" / name / "statewide_refined.csv"
+        assert project.boundary_report == single.boundary_report
+        assert project.refinement_report == single.refinement_report
+        assert project.recovery_report == single.recovery_report
+        assert project.refined_rows == single.refined_rows
+    assert sorted(row["crash_id"] for row in batch.projects["west"].refined_rows) == ["1", "2", "5"]
+    assert sorted(row["crash_id"] for row in batch.projects["east"].refined_rows) == ["2", "4"]
+
+
+def test_batch_project_names_skip_suffixes_taken_by_literal_stems() -> None:
+    from crash_data_refiner import pipeline
+
+    paths = [Path("x/a.kmz"), Path("y/a.kmz"), Path("z/a_2.kmz")]
+    assert pipeline._batch_project_names(paths) == ["a", "a_2", "a_2_2"]
+    assert pipeline._batch_project_names([Path("a_2.kmz"), Path("a.kmz"), Path("b/a.kmz")]) == ["a_2", "a", "a_3"]
 
 
 def test_relabel_refined_outputs_rewrites_refined_file(tmp_path: Path) -> None:
@@ -548,6 +726,46 @@ def test_run_refinement_pipeline_applies_browser_review_decisions(tmp_path: Path
     assert recovered_row["coordinate_source"] == "review_approved"
 
 
+def test_run_refinement_pipeline_reuses_parsed_inputs_for_review_reruns(tmp_path: Path) -> None:
+    import csv
+
+    data_file = tmp_path / "crashes.csv"
+    with data_file.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["Crash ID", "Lat", "Lon", "Roadway Number", "Intersecting Road"])
+        writer.writeheader()
+        writer.writerow({"Crash ID": "1", "Lat": "1.0", "Lon": "0.0", "Roadway Number": "SR2", "Intersecting Road": "Oak"})
+        writer.writerow({"Crash ID": "2", "Lat": "", "Lon": "", "Roadway Number": "SR9", "Intersecting Road": "Elm"})
+    kmz_file = tmp_path / "boundary.kmz"
+    _write_test_kmz(kmz_file)
+    cache_dir = tmp_path / "input_cache"
+
+    first = run_refinement_pipeline(
+        data_path=data_file,
+        kmz_path=kmz_file,
+        run_dir=tmp_path / "first",
+        lat_column="Lat",
+        lon_column="Lon",
+        input_cache_dir=cache_dir,
+    )
+    review_group = first.coordinate_review_rows[0]["coordinate_recovery_group"]
+    rerun = run_refinement_pipeline(
+        data_path=data_file,
+        kmz_path=kmz_file,
+        run_dir=tmp_path / "rerun",
+        lat_column="Lat",
+        lon_column="Lon",
+        review_decisions={review_group: CoordinateReviewDecision(group_key=review_group, latitude=1.5, longitude=0.5)},
+        input_cache_dir=cache_dir,
+    )
+
+    assert len(list(cache_dir.glob("*.parsed.pickle"))) == 1
+    assert "Loaded 2 crash rows." in first.log
+    assert "Loaded 2 crash rows from the parsed-input cache." in rerun.log
+    assert len(first.coordinate_review_rows) == 1
+    assert rerun.recovery_report.approved_rows == 1
+    assert rerun.boundary_report.included_rows == 2
+
+
 def test_run_refinement_pipeline_applies_row_level_browser_review_decisions_and_rejections(
     tmp_path: Path,
 ) -> None:
@@ -652,3 +870,25 @@ def test_run_refinement_pipeline_applies_row_level_browser_review_decisions_and_
     assert rejected.rows[0]["crash_id"] == "4"
     assert rejected.rows[0]["coordinate_recovery_status"] == "review_rejected"
     assert rejected.rows[0]["coordinate_source"] == "review_rejected"
+
+
+def test_validate_pipeline_outputs_counts_rows_in_the_file_not_the_manifest(tmp_path: Path) -> None:
+    from crash_data_refiner import pipeline
+    from crash_data_refiner.output_manifest import write_output_manifest
+
+    refined_path = tmp_path / "crashes_refined.csv"
+    write_spreadsheet(str(refined_path), [{"crash_id": "1"}, {"crash_id": "2"}])
+    write_output_manifest(refined_path, rows=3)
+
+    with pytest.raises(ValueError, match="expected 3, found 2"):
+        pipeline._validate_pipeline_outputs(
+            refined_path=refined_path,
+            invalid_path=tmp_path / "missing_invalid.csv",
+            coordinate_review_path=tmp_path / "missing_review.csv",
+            rejected_review_path=tmp_path / "missing_rejected.csv",
+            expected_refined_rows=3,
+            expected_invalid_rows=0,
+            expected_coordinate_review_rows=0,
+            expected_rejected_review_rows=0,
+            kmz_count=3,
+        )
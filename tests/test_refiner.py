@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import datetime
 from pathlib import Path
 import sys
 
@@ -161,3 +162,84 @@ def test_refine_rows_standardizes_crash_type_and_route() -> None:
     assert refined_rows[0]["roadway_name"] == "BROAD ST"
     assert refined_rows[1]["roadway_name"] == "BROAD ST"
     assert refined_rows[0]["roadway_id"] == "SR 4"
+
+
+def test_stream_rows_matches_refine_rows_with_collected_route_suffixes(tmp_path: Path) -> None:
+    from crash_data_refiner.refiner import load_route_suffixes, save_route_suffixes
+
+    config = RefinementConfig(required_columns=["Crash ID"], dedupe_on=["Crash ID"])
+    refiner = CrashDataRefiner(config)
+    input_rows = [
+        {"Crash ID": "1", "Roadway Name": "Broad St", "Intersecting Road Name": "Oak"},
+        {"Crash ID": "2", "Roadway Name": "Broad", "Intersecting Road Name": "Oak Ave"},
+        {"Crash ID": "2", "Roadway Name": "Broad Rd"},
+        {"Crash ID": "", "Roadway Name": "Oak Dr"},
+    ]
+
+    expected_rows, expected_report = refiner.refine_rows(input_rows)
+
+    suffix_path = tmp_path / "route_suffixes.json"
+    save_route_suffixes(str(suffix_path), refiner.collect_route_suffixes(input_rows))
+    stream = refiner.stream_rows(iter(input_rows), route_suffixes=load_route_suffixes(str(suffix_path)))
+    streamed_rows = list(stream)
+
+    assert streamed_rows == expected_rows
+    assert stream.report == expected_report
+    assert streamed_rows[1]["roadway_name"] == "BROAD ST"
+    assert streamed_rows[0]["intersecting_road_name"] == "OAK AVE"
+
+
+def test_compile_column_plan_orders_coercions_and_skips_absent_standardization() -> None:
+    from crash_data_refiner.refiner import compile_column_plan
+
+    config = RefinementConfig(
+        date_columns=["Crash Date"],
+        integer_columns=["Fatalities"],
+        fill_defaults={"Route": "Unknown"},
+    ).normalized()
+
+    plan = compile_column_plan(config, ["crash_date", "crash_type", "roadway_name"])
+
+    assert [column for column, _operation in plan] == [
+        "crash_date",
+        "fatalities",
+        "crash_type",
+        "roadway_name",
+        "route",
+    ]
+
+
+def test_standardization_cache_reports_hits_for_repeated_routes() -> None:
+    from crash_data_refiner.refiner import clear_standardization_caches, standardization_cache_stats
+
+    clear_standardization_caches()
+    baseline = standardization_cache_stats()
+    refiner = CrashDataRefiner()
+    refined_rows, _report = refiner.refine_rows(
+        [{"Route": "State Road 37", "Crash Type": "rear-end"} for _ in range(5)]
+    )
+
+    route_stats = standardization_cache_stats()["route"].since(baseline["route"])
+    crash_type_stats = standardization_cache_stats()["crash type"].since(baseline["crash type"])
+    assert refined_rows[-1]["route"] == "SR 37"
+    assert route_stats.misses == 1
+    assert route_stats.hits == 4
+    assert crash_type_stats.hits == 4
+    assert "4 hit(s), 1 miss(es)" in route_stats.describe()
+
+
+def test_date_columns_lock_dominant_format_and_fall_back_for_outliers() -> None:
+    rows = [{"Crash Date": f"{month}/{day}/2024"} for month in range(1, 7) for day in range(1, 6)]
+    rows.append({"Crash Date": "2024-07-04T08:30"})
+    rows.append({"Crash Date": "05-Jul-2024"})
+    rows.append({"Crash Date": datetime(2024, 7, 6)})
+    rows.append({"Crash Date": "not a date"})
+    refiner = CrashDataRefiner(RefinementConfig(date_columns=["Crash Date"]))
+
+    refined, report = refiner.refine_rows(rows)
+
+    dates = [row["crash_date"] for row in refined]
+    assert dates[0] == "2024-01-01"
+    assert dates[-4:] == ["2024-07-04 08:30", "2024-07-05", "2024-07-06", "not a date"]
+    assert report.date_formats == {"crash_date": "%m/%d/%Y"}
+    assert report.coerced_dates == len(rows) - 1
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pytest
+
 from crash_data_refiner.run_contract import (
     RunOutputCounts,
     build_run_summary_contract,
@@ -10,9 +12,11 @@ from crash_data_refiner.run_contract import (
 )
 from crash_data_refiner.coordinate_recovery import CoordinateRecoveryReport
 from crash_data_refiner.geo import BoundaryFilterReport
+from crash_data_refiner.output_manifest import file_sha256, read_output_manifest, write_output_manifest
 from crash_data_refiner.output_paths import (
     coordinate_review_output_path,
     invalid_output_path,
+    output_manifest_path,
     rejected_review_output_path,
 )
 from crash_data_refiner.refiner import RefinementReport
@@ -111,3 +115,50 @@ def test_build_run_summary_contract_includes_authoritative_output_counts() -> No
     metrics = {metric["label"]: metric for metric in contract["metrics"]}
     assert metrics["Review Needed"]["value"] == "6"
     assert metrics["Excluded Review"]["value"] == "2"
+
+
+def test_output_counts_prefer_current_manifest_and_fall_back_when_stale(tmp_path: Path) -> None:
+    refined_path = tmp_path / "crashes_refined.xlsx"
+    write_spreadsheet(
+        str(refined_path),
+        [{"crash_id": "1"}, {"crash_id": None}, {"crash_id": "2"}],
+        manifest=True,
+    )
+
+    manifest = read_output_manifest(refined_path)
+    assert manifest is not None
+    assert manifest.rows == 2
+    assert manifest.sha256 == file_sha256(refined_path)
+    assert manifest.bytes == refined_path.stat().st_size
+    assert output_manifest_path(refined_path).exists()
+    assert load_output_counts_from_refined_path(refined_path).refined_rows == 2
+
+    write_spreadsheet(str(refined_path), [{"crash_id": "1"}])
+
+    assert read_output_manifest(refined_path) is None
+    assert load_output_counts_from_refined_path(refined_path).refined_rows == 1
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".xlsx"])
+def test_manifest_hash_is_taken_while_writing(tmp_path: Path, suffix: str) -> None:
+    path = tmp_path / f"crashes_refined{suffix}"
+    rows = [{"crash_id": str(index), "narrative": f"Crash {index} \u2013 rear end"} for index in range(50)]
+
+    write_spreadsheet(str(path), rows, manifest=True)
+
+    manifest = read_output_manifest(path)
+    assert manifest is not None
+    assert manifest.sha256 == file_sha256(path)
+    if suffix == ".xlsx":
+        openpyxl = pytest.importorskip("openpyxl")
+        sheet = openpyxl.load_workbook(path, read_only=True).active
+        assert sum(1 for _row in sheet.iter_rows()) == len(rows) + 1
+
+
+def test_output_counts_trust_a_current_manifest(tmp_path: Path) -> None:
+    refined_path = tmp_path / "crashes_refined.csv"
+    write_spreadsheet(str(refined_path), [{"crash_id": "1"}, {"crash_id": "2"}])
+    write_output_manifest(refined_path, rows=3)
+
+    # Status views read the manifest; pipeline validation streams the file instead.
+    assert load_output_counts_from_refined_path(refined_path).refined_rows == 3
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from crash_data_refiner.web_jobs import JobScheduler
+from crash_data_refiner.web_state import RunState, create_state
+from crash_data_refiner.web_store import MEMORY_STORE_SPEC, open_run_store
+
+
+def _wait_for(event: threading.Event) -> None:
+    assert event.wait(5), "scheduled job did not run in time"
+
+
+def _finish_in_worker(state: RunState, *, message: str) -> None:
+    state.status = "success"
+    state.message = message
+    state.save()
+
+
+def test_scheduler_dispatches_round_robin_across_users_and_reports_positions() -> None:
+    store = open_run_store(MEMORY_STORE_SPEC)
+    release = threading.Event()
+    started: List[str] = []
+
+    def job(state: RunState, *, label: str) -> None:
+        started.append(label)
+        if label == "a1":
+            release.wait(5)
+
+    states = {label: create_state(store) for label in ("a1", "a2", "a3", "b1", "c1", "a4")}
+    scheduler = JobScheduler(MEMORY_STORE_SPEC, workers=1)
+    try:
+        for label in ("a1", "a2", "a3", "b1", "c1"):
+            scheduler.submit(states[label].run_id, job, user=label[0], label=label)
+
+        assert scheduler.is_running(states["a1"].run_id)
+        assert scheduler.position(states["a1"].run_id) is None
+        assert [scheduler.position(states[label].run_id) for label in ("b1", "c1", "a2", "a3")] == [1, 2, 3, 4]
+
+        assert scheduler.cancel(states["a3"].run_id)
+        assert not scheduler.cancel(states["a3"].run_id)
+        assert not scheduler.cancel(states["a1"].run_id)
+
+        release.set()
+        last_started = threading.Event()
+        scheduler.submit(states["a4"].run_id, lambda state: last_started.set(), user="a")
+        _wait_for(last_started)
+        assert started == ["a1", "b1", "c1", "a2"]
+    finally:
+        scheduler.shutdown()
+        for state in states.values():
+            store.delete(state.run_id)
+
+
+def test_scheduler_marks_runs_failed_when_the_job_raises_outside_its_handler() -> None:
+    store = open_run_store(MEMORY_STORE_SPEC)
+    state = create_state(store)
+    state.status = "running"
+    other = create_state(store)
+    finished = threading.Event()
+
+    def crash(_state: RunState) -> None:
+        raise RuntimeError("worker crashed")
+
+    scheduler = JobScheduler(MEMORY_STORE_SPEC, workers=2)
+    try:
+        scheduler.submit(state.run_id, crash)
+        scheduler.submit(other.run_id, lambda _state: finished.set())
+        _wait_for(finished)
+        scheduler.shutdown()
+        assert state.status == "error"
+        assert state.error == "worker crashed"
+    finally:
+        store.delete(state.run_id)
+        store.delete(other.run_id)
+
+
+def test_scheduler_rejects_an_empty_worker_pool() -> None:
+    with pytest.raises(ValueError):
+        JobScheduler(MEMORY_STORE_SPEC, workers=0)
+
+
+def test_scheduler_refuses_a_second_job_for_a_queued_or_running_run() -> None:
+    store = open_run_store(MEMORY_STORE_SPEC)
+    release = threading.Event()
+    calls: List[str] = []
+
+    def job(state: RunState, *, label: str) -> None:
+        calls.append(label)
+        if label == "first":
+            release.wait(5)
+
+    running = create_state(store)
+    queued = create_state(store)
+    scheduler = JobScheduler(MEMORY_STORE_SPEC, workers=1)
+    try:
+        assert scheduler.submit(running.run_id, job, label="first")
+        assert scheduler.submit(queued.run_id, job, label="queued")
+        assert scheduler.is_active(running.run_id) and scheduler.is_active(queued.run_id)
+
+        assert not scheduler.submit(running.run_id, job, label="duplicate")
+        assert not scheduler.submit(queued.run_id, job, label="duplicate")
+        assert scheduler.position(queued.run_id) == 1
+
+        release.set()
+        done = threading.Event()
+        while scheduler.is_active(running.run_id) or scheduler.is_active(queued.run_id):
+            time.sleep(0.01)
+        assert scheduler.submit(running.run_id, lambda state: done.set())
+        _wait_for(done)
+        assert calls == ["first", "queued"]
+    finally:
+        scheduler.shutdown()
+        store.delete(running.run_id)
+        store.delete(queued.run_id)
+
+
+def test_scheduler_runs_jobs_in_worker_processes_against_a_sqlite_store(tmp_path: Path) -> None:
+    store_spec = str(tmp_path / "runs.sqlite3")
+    store = open_run_store(store_spec)
+    state = create_state(store)
+    state.status = "queued"
+    state.save()
+
+    scheduler = JobScheduler(store_spec, workers=1, use_processes=True)
+    try:
+        assert scheduler.use_processes
+        assert scheduler.submit(state.run_id, _finish_in_worker, message="done in a worker")
+        assert not scheduler.submit(state.run_id, _finish_in_worker, message="duplicate")
+        deadline = time.monotonic() + 60
+        while scheduler.is_active(state.run_id):
+            assert time.monotonic() < deadline, "worker process did not finish the job in time"
+            time.sleep(0.05)
+    finally:
+        scheduler.shutdown()
+
+    finished = store.get(state.run_id)
+    assert finished is not None
+    assert finished.status == "success"
+    assert finished.message == "done in a worker"
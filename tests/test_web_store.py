@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from crash_data_refiner.web_state import MAX_LOG_ENTRIES, RunState, create_state, evict_expired_runs
+from crash_data_refiner import web_store
+from crash_data_refiner.web_store import INTERRUPTED_MESSAGE, InMemoryRunStore, SqliteRunStore, open_run_store
+
+
+@pytest.mark.parametrize("store_kind", ["sqlite", "memory"])
+def test_run_store_round_trips_state_and_pages_logs(tmp_path: Path, store_kind: str) -> None:
+    store = SqliteRunStore(tmp_path / "runs.sqlite3") if store_kind == "sqlite" else InMemoryRunStore()
+    state = create_state(store)
+    state.status = "running"
+    state.started_at = datetime.now(timezone.utc)
+    state.output_dir = tmp_path / state.run_id
+    state.inputs = {"dataFile": "crashes.csv", "latColumn": "Lat"}
+    state.save()
+    for index in range(MAX_LOG_ENTRIES + 5):
+        state.append_log(f"line {index}")
+
+    loaded = store.get(state.run_id)
+    assert loaded is not None
+    assert loaded.snapshot() == state.snapshot()
+    assert loaded.log_seq == MAX_LOG_ENTRIES + 5
+
+    page = loaded.log_since(0, limit=3)
+    assert [entry["seq"] for entry in page] == [6, 7, 8]
+    assert [entry["text"] for entry in loaded.log_since(MAX_LOG_ENTRIES + 3)] == [
+        f"line {MAX_LOG_ENTRIES + 3}",
+        f"line {MAX_LOG_ENTRIES + 4}",
+    ]
+    assert store.get("missing") is None
+
+
+def test_evict_expired_runs_removes_old_runs_and_their_output_folders(tmp_path: Path) -> None:
+    output_root = tmp_path / "web_runs"
+    store = SqliteRunStore(output_root / "_runs.sqlite3")
+    old_state = create_state(store)
+    old_dir = output_root / old_state.run_id / "inputs"
+    old_dir.mkdir(parents=True)
+    fresh_state = create_state(store)
+    (output_root / fresh_state.run_id).mkdir(parents=True)
+
+    assert evict_expired_runs(store, ttl=timedelta(hours=1), output_root=output_root) == []
+
+    evicted = evict_expired_runs(store, ttl=timedelta(seconds=-60), output_root=output_root)
+
+    assert sorted(evicted) == sorted([old_state.run_id, fresh_state.run_id])
+    assert store.get(old_state.run_id) is None
+    assert not (output_root / old_state.run_id).exists()
+    assert (output_root / "_runs.sqlite3").exists()
+
+
+def test_detached_run_state_keeps_logs_in_memory() -> None:
+    state = RunState(run_id="detached", created_at=datetime.now(timezone.utc))
+    state.append_log("first\nsecond")
+
+    assert [entry["text"] for entry in state.log_entries] == ["first", "second"]
+    assert [entry["seq"] for entry in state.log_since(1)] == [2]
+
+
+def test_reopening_the_sqlite_store_fails_runs_left_active_by_a_previous_server(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(web_store, "_OPEN_STORES", {})
+    path = tmp_path / "runs.sqlite3"
+    previous = SqliteRunStore(path)
+    states = {status: create_state(previous) for status in ("queued", "running", "success")}
+    for status, state in states.items():
+        state.status = status
+        state.save()
+
+    store = open_run_store(str(path), fail_interrupted=True)
+
+    for status in ("queued", "running"):
+        failed = store.get(states[status].run_id)
+        assert failed is not None
+        assert failed.status == "error"
+        assert failed.error == INTERRUPTED_MESSAGE
+        assert failed.finished_at is not None
+        assert failed.log_since(0)[-1]["text"] == f"Error: {INTERRUPTED_MESSAGE}"
+    assert store.get(states["success"].run_id).status == "success"
+
+    # Later opens in the same process share the store and leave new runs alone.
+    fresh = create_state(store)
+    fresh.status = "running"
+    fresh.save()
+    assert open_run_store(str(path), fail_interrupted=True) is store
+    assert store.get(fresh.run_id).status == "running"
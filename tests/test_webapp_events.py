@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+from crash_data_refiner.webapp import RUN_STORE, RunState, app
+
+
+def _parse_events(body: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+    events: List[Tuple[str, str, Dict[str, Any]]] = []
+    for frame in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines() if ": " in line and not line.startswith(":"))
+        if "event" in fields:
+            events.append((fields["event"], fields.get("id", ""), json.loads(fields["data"])))
+    return events
+
+
+def test_run_events_replays_logs_after_last_event_id_and_closes_when_finished() -> None:
+    state = RunState(run_id="events-finished", created_at=datetime.now(timezone.utc))
+    RUN_STORE.add(state)
+    try:
+        for text in ("first", "second", "third"):
+            state.append_log(text)
+        state.status = "success"
+        state.message = "Refinement complete."
+        state.save()
+
+        with app.test_client() as client:
+            response = client.get(f"/api/run/{state.run_id}/events", headers={"Last-Event-ID": "1"})
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/event-stream"
+        events = _parse_events(response.get_data(as_text=True))
+        assert [(name, event_id) for name, event_id, _data in events] == [
+            ("log", "2"),
+            ("log", "3"),
+            ("status", ""),
+            ("done", ""),
+        ]
+        assert events[1][2]["text"] == "third"
+        assert events[2][2]["status"] == "success"
+        assert events[3][2]["message"] == "Refinement complete."
+    finally:
+        RUN_STORE.delete(state.run_id)
+
+
+def test_run_events_pushes_updates_from_a_running_job() -> None:
+    state = RunState(run_id="events-live", created_at=datetime.now(timezone.utc), status="running")
+    RUN_STORE.add(state)
+
+    def finish_run() -> None:
+        state.append_log("working")
+        state.status = "error"
+        state.message = "Refinement failed."
+        state.save()
+
+    try:
+        timer = threading.Timer(0.2, finish_run)
+        with app.test_client() as client:
+            response = client.get(f"/api/run/{state.run_id}/events?since=0")
+            timer.start()
+            body = response.get_data(as_text=True)
+        timer.join()
+
+        events = _parse_events(body)
+        names = [name for name, _event_id, _data in events]
+        assert names[0] == "status" and events[0][2]["status"] == "running"
+        assert ("log", "1") in [(name, event_id) for name, event_id, _data in events]
+        assert names[-1] == "done"
+        assert events[-1][2]["status"] == "error"
+    finally:
+        RUN_STORE.delete(state.run_id)
+
+
+def test_run_events_returns_404_for_unknown_runs() -> None:
+    with app.test_client() as client:
+        response = client.get("/api/run/missing-run/events")
+    assert response.status_code == 404
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
-from crash_data_refiner.webapp import RUNS, RUNS_LOCK, RunState, app
+from crash_data_refiner.webapp import RUN_STORE, RunState, app
 from crash_data_refiner.services import coordinate_review_output_path, refined_output_path
 from crash_data_refiner.spreadsheets import write_spreadsheet
 
@@ -83,8 +83,7 @@ def test_run_review_queue_endpoint_groups_review_rows(tmp_path: Path) -> None:
 
     state = RunState(run_id=run_id, created_at=datetime.now(timezone.utc), output_dir=output_dir)
     state.inputs = {"dataFile": data_name}
-    with RUNS_LOCK:
-        RUNS[run_id] = state
+    RUN_STORE.add(state)
 
     try:
         with app.test_client() as client:
@@ -103,5 +102,4 @@ def test_run_review_queue_endpoint_groups_review_rows(tmp_path: Path) -> None:
         assert data["groups"][1]["reviewBucket"] == "secondary"
         assert data["groups"][1]["reviewDetails"][0] == "Decision rule: score -22 stays below the primary-review threshold of 45."
     finally:
-        with RUNS_LOCK:
-            RUNS.pop(run_id, None)
+        RUN_STORE.delete(run_id)
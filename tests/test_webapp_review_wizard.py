@@ -3,14 +3,15 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from pathlib import Path
 import json
+import threading
 import time
 import zipfile
 
 from crash_data_refiner.services import coordinate_review_output_path, refined_output_path
 from crash_data_refiner.spreadsheets import write_spreadsheet
+from crash_data_refiner import webapp as webapp_module
 from crash_data_refiner.webapp import (
-    RUNS,
-    RUNS_LOCK,
+    RUN_STORE,
     RunState,
     _parse_review_decisions_payload,
     app,
@@ -155,8 +156,7 @@ def test_run_review_wizard_endpoint_returns_steps_and_map_data(tmp_path: Path) -
         "latColumn": "Lat",
         "lonColumn": "Lon",
     }
-    with RUNS_LOCK:
-        RUNS[run_id] = state
+    RUN_STORE.add(state)
 
     try:
         with app.test_client() as client:
@@ -174,8 +174,180 @@ def test_run_review_wizard_endpoint_returns_steps_and_map_data(tmp_path: Path) -
         assert data["mapData"]["points"] == [[1.0, 0.0]]
         assert len(data["mapData"]["polygon"]) == 1
     finally:
-        with RUNS_LOCK:
-            RUNS.pop(run_id, None)
+        RUN_STORE.delete(run_id)
+
+
+def _add_paged_review_run(tmp_path: Path, run_id: str) -> RunState:
+    output_dir = tmp_path / run_id
+    input_dir = output_dir / "inputs"
+    input_dir.mkdir(parents=True)
+    data_name = "crashes.csv"
+    kmz_name = "boundary.kmz"
+    _write_test_kmz(input_dir / kmz_name)
+
+    refined_path = refined_output_path(output_dir, data_name)
+    write_spreadsheet(
+        str(refined_path),
+        [
+            {"crash_id": str(index), "lat": 0.1 * index, "lon": 0.5, "roadway_number": f"SR{index}"}
+            for index in range(1, 11)
+        ],
+    )
+    review_rows = []
+    for index in range(7):
+        bucket = "secondary" if index >= 5 else "primary"
+        review_rows.append(
+            {
+                "coordinate_recovery_group": f"SR{index % 2}|OAK|TESTVILLE|EXAMPLE",
+                "coordinate_recovery_row_key": f"{index}__row{index + 2}",
+                "coordinate_recovery_source_row": index + 2,
+                "coordinate_recovery_status": "review_required",
+                "coordinate_recovery_confidence": "high" if index % 3 == 0 else "medium",
+                "project_relevance_bucket": bucket,
+                "roadway_number": f"SR{index % 2}",
+                "crash_id": str(100 + index),
+            }
+        )
+    write_spreadsheet(str(coordinate_review_output_path(refined_path)), review_rows)
+
+    state = RunState(run_id=run_id, created_at=datetime.now(timezone.utc), output_dir=output_dir)
+    state.inputs = {
+        "dataFile": data_name,
+        "kmzFile": kmz_name,
+        "latColumn": "Lat",
+        "lonColumn": "Lon",
+    }
+    RUN_STORE.add(state)
+    return state
+
+
+def test_review_wizard_steps_endpoint_pages_and_filters(tmp_path: Path) -> None:
+    run_id = "wizardpages123"
+    _add_paged_review_run(tmp_path, run_id)
+
+    try:
+        with app.test_client() as client:
+            row_keys = []
+            cursor = None
+            while True:
+                query = "limit=3" + (f"&cursor={cursor}" if cursor is not None else "")
+                response = client.get(f"/api/run/{run_id}/review-wizard/steps?{query}")
+                assert response.status_code == 200
+                data = response.get_json()
+                assert data["primaryStepCount"] == 5
+                assert data["secondaryStepCount"] == 2
+                assert data["matchedStepCount"] == 7
+                row_keys.extend(step["rowKey"] for step in data["steps"])
+                cursor = data["nextCursor"]
+                if cursor is None:
+                    break
+            legacy = client.get(f"/api/run/{run_id}/review-wizard").get_json()
+
+            filtered = client.get(
+                f"/api/run/{run_id}/review-wizard/steps?bucket=primary&confidence=high&group=SR1|OAK|TESTVILLE|EXAMPLE"
+            ).get_json()
+            bad_cursor = client.get(f"/api/run/{run_id}/review-wizard/steps?cursor=abc")
+            bad_bucket = client.get(f"/api/run/{run_id}/review-wizard/steps?bucket=other")
+
+        assert row_keys == [step["rowKey"] for step in legacy["primarySteps"] + legacy["secondarySteps"]]
+        assert len(row_keys) == 7
+        assert [step["rowKey"] for step in filtered["steps"]] == ["3__row5"]
+        assert filtered["matchedStepCount"] == 1
+        assert filtered["nextCursor"] is None
+        assert bad_cursor.status_code == 400
+        assert bad_bucket.status_code == 400
+    finally:
+        RUN_STORE.delete(run_id)
+
+
+def test_review_wizard_context_endpoint_returns_crashes_in_bounds(tmp_path: Path) -> None:
+    run_id = "wizardcontext123"
+    _add_paged_review_run(tmp_path, run_id)
+
+    try:
+        with app.test_client() as client:
+            response = client.get(f"/api/run/{run_id}/review-wizard/context?south=0.25&west=0&north=0.55&east=1")
+            limited = client.get(
+                f"/api/run/{run_id}/review-wizard/context?south=0.25&west=0&north=0.55&east=1&limit=2"
+            ).get_json()
+            outside = client.get(f"/api/run/{run_id}/review-wizard/context?south=0&west=0.6&north=1&east=1").get_json()
+            missing = client.get(f"/api/run/{run_id}/review-wizard/context?south=0&west=0&north=1")
+            map_data = client.get(f"/api/run/{run_id}/review-wizard/map").get_json()["mapData"]
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert [crash["crashId"] for crash in data["crashes"]] == ["3", "4", "5"]
+        assert data["matchedCount"] == 3
+        assert data["truncated"] is False
+        assert len(limited["crashes"]) == 2
+        assert limited["truncated"] is True
+        assert outside["crashes"] == []
+        assert missing.status_code == 400
+        assert map_data["pointCount"] == 10
+        assert "contextCrashes" not in map_data
+    finally:
+        RUN_STORE.delete(run_id)
+
+
+def test_review_index_build_blocks_only_callers_for_the_same_run(monkeypatch) -> None:
+    from types import SimpleNamespace
+
+    from crash_data_refiner import web_review
+
+    release = threading.Event()
+    started = threading.Event()
+    builds: list[str] = []
+    real_build = web_review._build_review_index
+
+    def build(state):
+        builds.append(state.run_id)
+        if state.run_id == "slowindex":
+            started.set()
+            release.wait(5)
+        return real_build(state)
+
+    monkeypatch.setattr(web_review, "_build_review_index", build)
+    slow = SimpleNamespace(run_id="slowindex", inputs={}, output_dir=None)
+    fast = SimpleNamespace(run_id="fastindex", inputs={}, output_dir=None)
+    results: list = []
+    waiters = [
+        threading.Thread(target=lambda: results.append(web_review.review_index_for_state(slow)))
+        for _ in range(2)
+    ]
+    try:
+        for waiter in waiters:
+            waiter.start()
+        assert started.wait(5)
+
+        # Another run is built and served while the slow build is still running.
+        assert web_review.review_index_for_state(fast).steps == []
+        assert not release.is_set() and not results
+    finally:
+        release.set()
+        for waiter in waiters:
+            waiter.join(5)
+
+    assert len(results) == 2 and results[0] is results[1]
+    assert builds.count("slowindex") == 1
+    assert "slowindex" not in web_review._REVIEW_INDEX_BUILD_LOCKS
+
+
+def test_review_index_build_lock_is_released_when_the_build_fails(monkeypatch) -> None:
+    from types import SimpleNamespace
+
+    import pytest
+
+    from crash_data_refiner import web_review
+
+    def build(state):
+        raise ValueError("unreadable review file")
+
+    monkeypatch.setattr(web_review, "_build_review_index", build)
+    state = SimpleNamespace(run_id="brokenindex", inputs={}, output_dir=None)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            web_review.review_index_for_state(state)
+        assert "brokenindex" not in web_review._REVIEW_INDEX_BUILD_LOCKS
 
 
 def test_relabel_endpoint_rewrites_outputs(tmp_path: Path) -> None:
@@ -207,8 +379,7 @@ def test_relabel_endpoint_rewrites_outputs(tmp_path: Path) -> None:
         "lonColumn": "Lon",
         "labelOrder": "auto",
     }
-    with RUNS_LOCK:
-        RUNS[run_id] = state
+    RUN_STORE.add(state)
 
     try:
         with app.test_client() as client:
@@ -230,8 +401,38 @@ def test_relabel_endpoint_rewrites_outputs(tmp_path: Path) -> None:
         assert "labelOrdering" in state.summary
         assert state.summary["labelOrdering"]["resolved"] == "south_to_north"
     finally:
-        with RUNS_LOCK:
-            RUNS.pop(run_id, None)
+        RUN_STORE.delete(run_id)
+
+
+def test_relabel_endpoint_returns_409_when_the_run_already_has_a_job(tmp_path: Path) -> None:
+    run_id = "relabelbusy123"
+    output_dir = tmp_path / run_id
+    output_dir.mkdir(parents=True)
+    refined_path = refined_output_path(output_dir, "crashes.csv")
+    write_spreadsheet(str(refined_path), [{"crash_id": "1", "lat": 30.0, "lon": -86.0}])
+
+    # The stored status lags behind a job that was just queued by another request.
+    state = RunState(run_id=run_id, created_at=datetime.now(timezone.utc), output_dir=output_dir)
+    state.status = "success"
+    state.inputs = {"runKind": "refine", "dataFile": "crashes.csv", "latColumn": "lat", "lonColumn": "lon"}
+    RUN_STORE.add(state)
+    release = threading.Event()
+    # Looked up on the module: test_webapp_config reloads it, replacing the scheduler.
+    jobs = webapp_module.JOBS
+
+    try:
+        assert jobs.submit(run_id, lambda _state: release.wait(5))
+        with app.test_client() as client:
+            response = client.post(f"/api/run/{run_id}/relabel", data={"label_order": "south_to_north"})
+        assert response.status_code == 409
+        assert response.get_json()["error"] == "This run is still in progress."
+        assert state.status == "success"
+    finally:
+        release.set()
+        deadline = time.time() + 5
+        while jobs.is_active(run_id) and time.time() < deadline:
+            time.sleep(0.05)
+        RUN_STORE.delete(run_id)
 
 
 def test_relabel_endpoint_returns_404_when_refined_output_is_missing(tmp_path: Path) -> None:
@@ -249,8 +450,7 @@ def test_relabel_endpoint_returns_404_when_refined_output_is_missing(tmp_path: P
         "lonColumn": "Lon",
         "labelOrder": "auto",
     }
-    with RUNS_LOCK:
-        RUNS[run_id] = state
+    RUN_STORE.add(state)
 
     try:
         with app.test_client() as client:
@@ -261,5 +461,4 @@ def test_relabel_endpoint_returns_404_when_refined_output_is_missing(tmp_path: P
         assert response.status_code == 404
         assert "Refined output for this run was not found." in response.get_json()["error"]
     finally:
-        with RUNS_LOCK:
-            RUNS.pop(run_id, None)
+        RUN_STORE.delete(run_id)
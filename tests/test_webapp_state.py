@@ -7,7 +7,8 @@ from crash_data_refiner.coordinate_recovery import CoordinateRecoveryReport
 from crash_data_refiner.geo import BoundaryFilterReport
 from crash_data_refiner.refiner import RefinementReport
 from crash_data_refiner.spreadsheets import write_spreadsheet
-from crash_data_refiner.webapp import RUNS, RUNS_LOCK, RunState, _build_summary, _create_state, _snapshot_state
+from crash_data_refiner.web_files import copy_input_file
+from crash_data_refiner.webapp import RUN_STORE, RunState, _build_summary, _create_state, _snapshot_state
 
 
 def test_create_state_uses_timezone_aware_utc_created_at() -> None:
@@ -16,8 +17,7 @@ def test_create_state_uses_timezone_aware_utc_created_at() -> None:
         assert state.created_at.tzinfo is not None
         assert state.created_at.utcoffset() == timedelta(0)
     finally:
-        with RUNS_LOCK:
-            RUNS.pop(state.run_id, None)
+        RUN_STORE.delete(state.run_id)
 
 
 def test_run_state_log_and_snapshot_use_timezone_aware_iso_strings() -> None:
@@ -118,3 +118,14 @@ def test_snapshot_state_backfills_output_counts_from_written_outputs(tmp_path: P
     assert snapshot["summary"]["outputCounts"]["invalidRows"] == 1
     assert snapshot["summary"]["outputCounts"]["coordinateReviewRows"] == 2
     assert snapshot["summary"]["outputCounts"]["rejectedReviewRows"] == 1
+
+
+def test_copy_input_file_links_the_source_run_input(tmp_path: Path) -> None:
+    source = tmp_path / "source" / "crashes.csv"
+    source.parent.mkdir()
+    source.write_text("Crash ID\n1\n", encoding="utf-8")
+
+    target = copy_input_file(source, dest_dir=tmp_path / "review" / "inputs", label="Crash data file")
+
+    assert target.read_text(encoding="utf-8") == "Crash ID\n1\n"
+    assert target.stat().st_ino == source.stat().st_ino